@@ -1,132 +1,184 @@
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-import pandas as pd
-from io import StringIO
-import re
 from datetime import datetime
 import os
+from table_scrapper.table_parser import parse_table
+from table_scrapper.fetcher import get_fetcher, find_links
+from table_scrapper.crawl_manifest import CrawlManifest, content_hash, DONE, FAILED, MISSING
+from table_scrapper.browser_pool import BrowserPool
+from table_scrapper.page_index import PageIndex
+from table_scrapper.shot_chart import parse_shot_chart
+from table_scrapper.game_bundle import bundle_path, write_bundle
+from table_scrapper.table_store import WRITE_CSV, get_store, nba_partition
 
 # Create folder
 SAVE_FOLDER = "./nba_data"
 os.makedirs(SAVE_FOLDER, exist_ok=True)
 
-# Set up driver
-def get_driver():
-    service = Service(executable_path="chromedriver.exe")
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    return webdriver.Chrome(service=service, options=options)
+PBP_URL = "https://www.basketball-reference.com/boxscores/pbp/{game_id}.html"
+SHOTS_URL = "https://www.basketball-reference.com/boxscores/shot-chart/{game_id}.html"
 
-driver = get_driver()
+# Set BROWSER_WORKERS > 0 to load game pages in a pool of headless Chrome processes
+BROWSER_WORKERS = int(os.environ.get("BROWSER_WORKERS", "0"))
+BROWSER_RECYCLE_PAGES = int(os.environ.get("BROWSER_RECYCLE_PAGES", "50"))
 
-# Extract HTML table even if it's commented out
-def get_table_by_id(table_id):
-    source = driver.page_source
+# Plain HTTP fetcher; Chrome is only started if a page can't be served over HTTP
+fetcher = get_fetcher()
 
-    # Try normal
-    try:
-        el = driver.find_element(By.ID, table_id)
-        return el.get_attribute("outerHTML")
-    except:
-        pass
+# Parquet dataset writer when OUTPUT_FORMAT is parquet/both, else None
+store = get_store()
 
-    # Try commented HTML
-    comment_pattern = rf"<!--([\s\S]*?<table[^>]*id=\"{table_id}\"[\s\S]*?</table>)-->"
-    m = re.search(comment_pattern, source)
-    return m.group(1) if m else None
+# Extract HTML table even if it's commented out
+def get_table_by_id(table_id):
+    return fetcher.get_table(fetcher.url, table_id)
 
 def save_df(df, game_id, name):
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    path = os.path.join(SAVE_FOLDER, f"{game_id}_{name}_{current_date}.csv")
-    df.to_csv(path, index=False)
-    print(f"📁 Saved: {path}")
+    if WRITE_CSV:
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        path = os.path.join(SAVE_FOLDER, f"{game_id}_{name}_{current_date}.csv")
+        df.to_csv(path, index=False)
+        print(f"📁 Saved: {path}")
 
-def scrape_box_score(game_id, url):
-    driver.get(url)
-    time.sleep(3)
+    if store is not None:
+        store.write(df, **nba_partition(game_id, name))
 
-    tables = re.findall(r"(<table[^>]*id=\"([^\"]+)\".*?</table>)", driver.page_source)
+def save_box_score(game_id, index):
     dfs = {}
 
-    for html, tid in tables:
+    for tid, html in index.items():
         if "box" in tid and "game" not in tid:  # exclude team summary table
-            df = pd.read_html(StringIO(html))[0]
+            df = parse_table(html)
             dfs[tid] = df
             save_df(df, game_id, tid)
 
     return dfs
 
-def scrape_pbp(game_id):
-    pbp_url = f"https://www.basketball-reference.com/boxscores/pbp/{game_id}.html"
-    driver.get(pbp_url)
-    time.sleep(3)
-
-    html = get_table_by_id("pbp")
+def save_table(game_id, html, name):
     if html:
-        df = pd.read_html(StringIO(html))[0]
-        save_df(df, game_id, "pbp")
+        df = parse_table(html)
+        save_df(df, game_id, name)
         return df
     return None
 
-def scrape_shots(game_id):
-    shot_url = f"https://www.basketball-reference.com/boxscores/shot-chart/{game_id}.html"
-    driver.get(shot_url)
-    time.sleep(3)
+def scrape_box_score(game_id, url):
+    fetcher.fetch(url)
+    return save_box_score(game_id, fetcher.index)
 
-    html = get_table_by_id("shots")
-    if html:
-        df = pd.read_html(StringIO(html))[0]
-        save_df(df, game_id, "shots")
-        return df
-    return None
+def scrape_pbp(game_id):
+    fetcher.fetch(PBP_URL.format(game_id=game_id))
+    return save_table(game_id, get_table_by_id("pbp"), "pbp")
 
-# Merge all tables to one dataset
-def combine_stats(game_id, dfs, pbp, shots):
-    combined = []
+# Shot charts are positioned markers rather than a table
+def save_shots(game_id, page_source):
+    df = parse_shot_chart(page_source)
+    if df is not None:
+        save_df(df, game_id, "shots")
+    return df
 
-    for k, df in dfs.items():
-        df["table"] = k
-        combined.append(df)
+def scrape_shots(game_id):
+    return save_shots(game_id, fetcher.fetch(SHOTS_URL.format(game_id=game_id)))
 
+# All of a game's tables in one file, each a separately readable typed member
+def save_bundle(game_id, dfs, pbp, shots):
+    tables = dict(dfs)
     if pbp is not None:
-        pbp["table"] = "pbp"
-        combined.append(pbp)
-
+        tables["pbp"] = pbp
     if shots is not None:
-        shots["table"] = "shots"
-        combined.append(shots)
-
-    if combined:
-        merged = pd.concat(combined, ignore_index=True)
-        save_df(merged, game_id, "combined")
+        tables["shots"] = shots
+
+    if tables:
+        path = write_bundle(bundle_path(SAVE_FOLDER, game_id), tables, game_id)
+        print(f"📦 Saved: {path}")
+
+# Scrape the given kinds of table for one game, recording each in the manifest
+def scrape_game(manifest, game_id, link, kinds):
+    results = {}
+    for kind in kinds:
+        try:
+            if kind == "box":
+                result = scrape_box_score(game_id, link) or None
+            elif kind == "pbp":
+                result = scrape_pbp(game_id)
+            else:
+                result = scrape_shots(game_id)
+        except Exception as e:
+            print(f"❌ {kind} failed for {game_id}: {e}")
+            manifest.record(game_id, kind, FAILED, error=str(e))
+            continue
+
+        status = DONE if result is not None else MISSING
+        manifest.record(game_id, kind, status, content_hash(fetcher.page_source))
+        results[kind] = result
+    return results
+
+# Load every pending page in the browser pool; tables are parsed here as pages arrive
+def scrape_games_in_pool(manifest, todo, game_links):
+    urls = {"box": lambda g: game_links[g], "pbp": lambda g: PBP_URL.format(game_id=g),
+            "shots": lambda g: SHOTS_URL.format(game_id=g)}
+    tasks = [(game_id, kind, urls[kind](game_id)) for game_id, kinds in todo.items() for kind in kinds]
+
+    results = {}
+    finished = {}
+    pool = BrowserPool(workers=BROWSER_WORKERS, max_pages=BROWSER_RECYCLE_PAGES)
+
+    for (game_id, kind, url), page_source, error in pool.map_pages(tasks):
+        finished.setdefault(game_id, set()).add(kind)
+        if error:
+            print(f"❌ {kind} failed for {game_id}: {error}")
+            manifest.record(game_id, kind, FAILED, error=error)
+        else:
+            index = PageIndex(page_source)
+            if kind == "box":
+                result = save_box_score(game_id, index) or None
+            elif kind == "shots":
+                result = save_shots(game_id, page_source)
+            else:
+                result = save_table(game_id, index.get(kind), kind)
+            manifest.record(game_id, kind, DONE if result is not None else MISSING, content_hash(page_source))
+            results.setdefault(game_id, {})[kind] = result
+
+        # All of this game's pages are in - the bundle needs the box score from this run
+        game = results.get(game_id, {})
+        if finished[game_id] == set(todo[game_id]) and game.get("box"):
+            save_bundle(game_id, game["box"], game.get("pbp"), game.get("shots"))
 
 # ---- MAIN -----
 
-schedule_urls = [
-    "https://www.basketball-reference.com/leagues/NBA_2026_games.html",
-    "https://www.basketball-reference.com/leagues/NBA_2026_games-november.html",
-]
-
-box_links = []
-for url in schedule_urls:
-    driver.get(url)
-    time.sleep(3)
-    links = driver.find_elements(By.PARTIAL_LINK_TEXT, "Box Score")
-    box_links.extend(l.get_attribute("href") for l in links)
-
-print(f"🔗 Found {len(box_links)} games")
-
-for link in box_links[:5]:  # TEST on first 5 games
-    print("📌 Scraping:", link)
-    game_id = link.split("/")[-1].replace(".html", "")
-
-    box = scrape_box_score(game_id, link)
-    pbp = scrape_pbp(game_id)
-    shots = scrape_shots(game_id)
-
-    combine_stats(game_id, box, pbp, shots)
-
-driver.quit()
-print("🎯 DONE — All data collected!")
+def main():
+    schedule_urls = [
+        "https://www.basketball-reference.com/leagues/NBA_2026_games.html",
+        "https://www.basketball-reference.com/leagues/NBA_2026_games-november.html",
+    ]
+
+    box_links = []
+    for url in schedule_urls:
+        page_source = fetcher.fetch(url)
+        box_links.extend(find_links(page_source, url, "Box Score"))
+
+    # Only games (and table kinds) not already completed by a previous run
+    manifest = CrawlManifest(os.path.join(SAVE_FOLDER, "crawl_manifest.sqlite"))
+    game_links = {link.split("/")[-1].replace(".html", ""): link for link in box_links}
+    todo = manifest.pending(game_links, ["box", "pbp", "shots"])
+
+    print(f"🔗 Found {len(box_links)} games, {len(todo)} with tables still to scrape")
+
+    if BROWSER_WORKERS > 0:
+        scrape_games_in_pool(manifest, todo, game_links)
+    else:
+        for game_id, kinds in todo.items():
+            link = game_links[game_id]
+            print("📌 Scraping:", link, kinds)
+
+            results = scrape_game(manifest, game_id, link, kinds)
+
+            # The bundle needs the box score from this run
+            if results.get("box"):
+                save_bundle(game_id, results["box"], results.get("pbp"), results.get("shots"))
+
+    print(f"📋 Manifest: {manifest.summary()}")
+    manifest.close()
+    if store is not None:
+        store.close()
+    fetcher.close()
+    print("🎯 DONE — All data collected!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmark_bulk_load.py
+# Parity check and rows/second benchmark: per-row ORM path vs bulk (column-wise + COPY) path.
+#
+#   python benchmark_bulk_load.py [max_files]         build rows only, no database needed
+#   python benchmark_bulk_load.py [max_files] --db    also time inserts, including the parallel
+#                                                     loader on every core (uses DATABASE_URL)
+import sys
+import os
+import time
+import pandas as pd
+from nba_database import NBAGameBasic, NBAGameAdvanced, create_tables, engine
+from nba_data_loader import NBADataLoader
+
+# Columns both paths must agree on (id / created_at are generated per run)
+IGNORED = {'id', 'created_at'}
+
+
+class RecordingSession:
+    """Stands in for the SQLAlchemy session so the row path can run without a database"""
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def execute(self, statement):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def orm_rows(objects):
+    rows = []
+    for obj in objects:
+        rows.append({c.name: getattr(obj, c.name) for c in obj.__table__.columns if c.name not in IGNORED})
+    return pd.DataFrame(rows)
+
+
+def box_score_files(loader, max_files):
+    files = []
+    for file_path in loader.box_score_files():
+        file_info = loader.parse_filename(os.path.basename(file_path))
+        if file_info and file_info['stat_type'] in ('basic', 'advanced'):
+            files.append((file_path, file_info))
+    return files[:max_files]
+
+
+def check_parity(loader, files):
+    """Row path and bulk path must produce identical records for every file"""
+    mismatches = 0
+    for file_path, file_info in files:
+        loader.session = RecordingSession()
+        if file_info['stat_type'] == 'basic':
+            loader.process_basic_data(file_path, file_info)
+        else:
+            loader.process_advanced_data(file_path, file_info)
+        expected = orm_rows(loader.session.added)
+
+        df = loader.read_box_score(file_path, file_info['stat_type'])
+        actual = loader.build_frame([(df, file_info)], file_info['stat_type'])
+        actual = actual[[c for c in actual.columns if c not in IGNORED]]
+
+        if expected.empty and actual.empty:
+            continue
+        if len(expected) != len(actual):
+            mismatches += 1
+            print(f"❌ Row count mismatch: {os.path.basename(file_path)}")
+            continue
+        expected = expected[actual.columns].astype(object).where(expected[actual.columns].notna(), None)
+        actual = actual.astype(object).where(actual.notna(), None)
+        if expected.values.tolist() != actual.values.tolist():
+            mismatches += 1
+            print(f"❌ Mismatch: {os.path.basename(file_path)}")
+
+    print(f"Parity: {len(files) - mismatches}/{len(files)} files identical")
+    return mismatches == 0
+
+
+def time_build(loader, files):
+    start = time.perf_counter()
+    rows = 0
+    loader.session = RecordingSession()
+    for file_path, file_info in files:
+        if file_info['stat_type'] == 'basic':
+            rows += loader.process_basic_data(file_path, file_info)
+        else:
+            rows += loader.process_advanced_data(file_path, file_info)
+    row_path = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = {'basic': [], 'advanced': []}
+    for file_path, file_info in files:
+        df = loader.read_box_score(file_path, file_info['stat_type'])
+        batches[file_info['stat_type']].append((df, file_info))
+    for stat_type, batch in batches.items():
+        loader.build_frame(batch, stat_type)
+    bulk_path = time.perf_counter() - start
+
+    print(f"Build rows  - row path: {rows / row_path:9.0f} rows/s   bulk path: {rows / bulk_path:9.0f} rows/s")
+
+
+def time_database(files, workers):
+    from nba_database import SessionLocal
+
+    create_tables()
+    data_path = os.path.dirname(files[0][0])
+    csv_files = [file_path for file_path, _ in files]
+
+    for mode in ('row ORM', 'bulk COPY', f'parallel x{workers}'):
+        with engine.begin() as connection:
+            connection.exec_driver_sql("TRUNCATE nba_game_basic, nba_game_advanced, nba_load_ledger")
+        loader = NBADataLoader(data_path)
+        loader.session = SessionLocal()
+        start = time.perf_counter()
+        if mode == 'bulk COPY':
+            loader.load_all_data_bulk(csv_files=csv_files)
+        elif mode.startswith('parallel'):
+            loader.load_all_data_parallel(workers=workers, csv_files=csv_files)
+        else:
+            loader.ensure_partitions(csv_files)
+            for file_path, file_info in files:
+                if file_info['stat_type'] == 'basic':
+                    loader.process_basic_data(file_path, file_info)
+                else:
+                    loader.process_advanced_data(file_path, file_info)
+        elapsed = time.perf_counter() - start
+        with engine.connect() as connection:
+            rows = sum(connection.exec_driver_sql(f"SELECT COUNT(*) FROM {t}").scalar()
+                       for t in (NBAGameBasic.__tablename__, NBAGameAdvanced.__tablename__))
+        loader.close()
+        print(f"Insert - {mode}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    max_files = int(args[0]) if args else None
+
+    loader = NBADataLoader("./nba_data")
+    files = box_score_files(loader, max_files)
+    print(f"Using {len(files)} box score files")
+
+    check_parity(loader, files)
+    time_build(loader, files)
+    if '--db' in sys.argv:
+        time_database(files, workers=os.cpu_count() or 1)
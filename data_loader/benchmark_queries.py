@@ -0,0 +1,151 @@
+# benchmark_queries.py
+# Time the analyzer's typical queries against the box score tables. Run it before and
+# after create_tables() migrates a database to the current (indexed, partitioned) schema
+# to compare the two.
+#
+#   python benchmark_queries.py [repeats]        (uses DATABASE_URL)
+import re
+import sys
+import time
+from datetime import timedelta
+from sqlalchemy import select, text
+from nba_database import engine, NBAGameBasic
+
+QUERIES = {
+    "player game log": (
+        "SELECT * FROM nba_game_basic WHERE player = :player AND period = 'game' ORDER BY game_date"
+    ),
+    "player last 10": (
+        "SELECT pts, trb, ast FROM nba_game_basic WHERE player = :player AND period = 'game' "
+        "ORDER BY game_date DESC LIMIT 10"
+    ),
+    "player quarters": (
+        "SELECT period, AVG(pts) FROM nba_game_basic WHERE player = :player "
+        "AND period IN ('q1', 'q2', 'q3', 'q4') GROUP BY period"
+    ),
+    "team date range": (
+        "SELECT * FROM nba_game_basic WHERE team = :team AND game_date BETWEEN :start AND :end"
+    ),
+    "date window averages": (
+        "SELECT player, AVG(pts) FROM nba_game_basic WHERE game_date BETWEEN :start AND :end "
+        "AND period = 'game' GROUP BY player"
+    ),
+    "daily slate": (
+        "SELECT player, team, pts FROM nba_game_basic WHERE game_date = :day AND period = 'game'"
+    ),
+    "team advanced": (
+        "SELECT off_rtg, def_rtg FROM nba_game_advanced WHERE team = :team ORDER BY game_date"
+    ),
+    "player basic + advanced": (
+        "SELECT b.pts, a.usg_pct FROM nba_game_basic b JOIN nba_game_advanced a "
+        "ON a.player = b.player AND a.game_date = b.game_date AND a.team = b.team "
+        "WHERE b.player = :player AND b.period = 'game'"
+    ),
+    # The same answers from the aggregate tables the loader maintains
+    "player averages (agg)": (
+        "SELECT SUM(pts_sum) / SUM(pts_n), SUM(trb_sum) / SUM(trb_n), SUM(ast_sum) / SUM(ast_n) "
+        "FROM nba_player_aggregate WHERE player = :player AND period = 'game'"
+    ),
+    "player quarters (agg)": (
+        "SELECT period, SUM(pts_sum) / SUM(pts_n) FROM nba_player_aggregate WHERE player = :player "
+        "AND period IN ('q1', 'q2', 'q3', 'q4') GROUP BY period"
+    ),
+    "team ratings (agg)": (
+        "SELECT team, SUM(off_rtg_sum) / SUM(off_rtg_n), SUM(def_rtg_sum) / SUM(def_rtg_n) "
+        "FROM nba_team_aggregate GROUP BY team"
+    ),
+    # Play-by-play names players by initial ("S. Gilgeous-Alexander"), so these go by team
+    "team clutch plays": (
+        "SELECT event_type, COUNT(*), SUM(points) FROM nba_pbp_event WHERE team = :team "
+        "AND period IN ('q4', 'ot1', 'ot2', 'ot3', 'ot4', 'ot5', 'ot6') AND clock_tenths <= 3000 "
+        "AND ABS(home_score - away_score) <= 5 GROUP BY event_type"
+    ),
+    "team substitutions": (
+        "SELECT game_id, period, clock_tenths, player, other_player FROM nba_pbp_event "
+        "WHERE team = :team AND event_type = 'substitution' ORDER BY game_id, event_no"
+    ),
+}
+
+
+def sample_parameters(connection, count=25):
+    players = [r[0] for r in connection.execute(text(
+        "SELECT player FROM nba_game_basic GROUP BY player ORDER BY COUNT(*) DESC LIMIT :n"), {"n": count})]
+    teams = [r[0] for r in connection.execute(text("SELECT DISTINCT team FROM nba_game_basic"))]
+    # Through the table, so SQLite's text dates come back as dates
+    game_date = NBAGameBasic.__table__.c.game_date
+    days = connection.execute(select(game_date).distinct().order_by(game_date)).scalars().all()
+    # The last two weeks - the window recent-form queries look at
+    end = days[-1]
+    start = end - timedelta(days=14)
+
+    parameters = []
+    for i in range(count):
+        parameters.append({
+            "player": players[i % len(players)],
+            "team": teams[i % len(teams)],
+            "day": days[i % len(days)],
+            "start": start,
+            "end": end,
+        })
+    return parameters
+
+
+def table_sizes(connection):
+    if engine.dialect.name != 'postgresql':
+        return
+    for table in ("nba_game_basic", "nba_game_advanced", "nba_pbp_event", "nba_player_aggregate"):
+        # Summed over the partitions; a plain table has no partition tree
+        heap, indexes = connection.execute(text(
+            f"SELECT COALESCE(SUM(pg_relation_size(relid)), pg_relation_size('{table}')), "
+            f"COALESCE(SUM(pg_indexes_size(relid)), pg_indexes_size('{table}')) "
+            f"FROM pg_partition_tree('{table}') WHERE isleaf")).one()
+        print(f"{table:<20} heap {heap / 1024:8.0f} kB   indexes {indexes / 1024:8.0f} kB")
+
+
+def partitions_scanned(connection, parameters):
+    """How many partitions the date window query reads, out of how many (Postgres only)"""
+    if engine.dialect.name != 'postgresql':
+        return
+    plan = connection.execute(text("EXPLAIN " + QUERIES["date window averages"]),
+                              {"start": parameters[0]["start"], "end": parameters[0]["end"]}).scalars().all()
+    scanned = {match for line in plan for match in re.findall(r"nba_game_basic_\d{4}_\d{2}", line)}
+    total = connection.execute(text(
+        "SELECT COUNT(*) FROM pg_partition_tree('nba_game_basic') WHERE isleaf")).scalar()
+    print(f"date window reads {len(scanned) or 1} of {total or 1} nba_game_basic partitions")
+
+
+def team_indexes(connection, parameters):
+    """Indexes the team queries are planned on - (team, game_date) ones (Postgres only)"""
+    if engine.dialect.name != 'postgresql':
+        return
+    for name in ("team date range", "team advanced"):
+        sql = QUERIES[name]
+        plan = connection.execute(text("EXPLAIN " + sql),
+                                  {k: v for k, v in parameters[0].items() if f":{k}" in sql}).scalars().all()
+        # Each partition has its own copy of an index: name them by the parent's
+        used = {re.sub(r"_\d{4}_\d{2}_", "_", match) for line in plan
+                for match in re.findall(r"Index (?:Only )?Scan (?:Backward )?(?:using|on) (\w+)", line)}
+        print(f"{name} reads {', '.join(sorted(used)) or 'no index'}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with engine.connect() as connection:
+        parameters = sample_parameters(connection)
+        table_sizes(connection)
+        partitions_scanned(connection, parameters)
+        team_indexes(connection, parameters)
+        for name, sql in QUERIES.items():
+            statement = text(sql)
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                for params in parameters:
+                    connection.execute(statement, {k: v for k, v in params.items() if f":{k}" in sql}).fetchall()
+                elapsed = (time.perf_counter() - start) / len(parameters)
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{name:<24} {best * 1000:8.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ def test_filename_parsing():
         if result:
             print(f"✅ {filename}")
             print(f"   Date: {result['game_date']}")
-            print(f"   Home: {result['home_team']}, Away: {result['away_team']}")
+            print(f"   Team: {result['team']} ({result['home_away']}), Opponent: {result['opponent']}")
             print(f"   Period: {result['period']}, Type: {result['stat_type']}")
         else:
             print(f"❌ {filename} - Failed to parse")
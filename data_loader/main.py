@@ -1,4 +1,5 @@
 # main.py (Use Original Schema)
+import os
 from database_setup import create_database
 from nba_database import create_tables  # Use original nba_database
 from nba_data_loader import NBADataLoader  # Use original data loader
@@ -17,7 +18,10 @@ def main():
     loader = NBADataLoader("./nba_data")
     
     try:
-        loader.load_all_data()
+        # LOADER_WORKERS=N parses files in N processes (0 = single process)
+        loader.load_all_data(bulk=True, workers=int(os.environ.get("LOADER_WORKERS", 0)))
+        print("\nLoading play-by-play...")
+        loader.load_pbp_data()
     except Exception as e:
         print(f"❌ Error loading data: {e}")
     finally:
@@ -0,0 +1,194 @@
+# nba_aggregates.py
+# Per-player and per-team aggregate tables kept current by the loader. A row holds
+# mergeable running sums of each stat - rows with a value (<stat>_n), sum and sum of
+# squares - next to the number of box score rows (games), so write_frames applies each
+# batch as a delta (the rows it adds minus the rows it replaces) in the same transaction,
+# and readers get averages and spreads from a few rows however many games are stored:
+#
+#   mean = <stat>_sum / <stat>_n
+#   variance = (<stat>_sq - <stat>_sum * <stat>_sum / <stat>_n) / (<stat>_n - 1)
+from datetime import date
+from io import StringIO
+import pandas as pd
+from sqlalchemy import Date, and_, bindparam, select, text
+from nba_database import engine, NBAGameBasic, NBAGameAdvanced, NBAPlayerAggregate, NBATeamAggregate
+
+# Seasons start mid-October (the 2020 bubble finals ran to October 11) and are named by
+# the year they end in
+SEASON_START = (10, 15)  # month, day
+
+# Box score table -> aggregate model; its natural key less season is what rows are grouped by
+AGGREGATES = {
+    NBAGameBasic.__tablename__: NBAPlayerAggregate,
+    NBAGameAdvanced.__tablename__: NBATeamAggregate,
+}
+
+
+def season_start(season):
+    return date(season - 1, *SEASON_START)
+
+
+def season_of(days):
+    """Season of each date in a Series of dates"""
+    days = pd.to_datetime(days)
+    month, day = SEASON_START
+    started = (days.dt.month > month) | ((days.dt.month == month) & (days.dt.day >= day))
+    return (days.dt.year + started).astype('int64')
+
+
+def season_sql(connection):
+    """SQL expression for the season of game_date"""
+    start = '%02d-%02d' % SEASON_START
+    if connection.dialect.name == 'postgresql':
+        return f"(EXTRACT(YEAR FROM game_date)::int + CASE WHEN to_char(game_date, 'MM-DD') >= '{start}' THEN 1 ELSE 0 END)"
+    return f"(CAST(strftime('%Y', game_date) AS INTEGER) + (strftime('%m-%d', game_date) >= '{start}'))"
+
+
+def group_columns(aggregate):
+    return [column for column in aggregate.natural_key if column != 'season']
+
+
+def sum_columns(aggregate):
+    """Columns the deltas are added to, in table order"""
+    return [column.name for column in aggregate.__table__.columns if column.name not in aggregate.natural_key]
+
+
+def stat_sums(frame, aggregate):
+    """Rows of the aggregate table summing up a box score frame, indexed by its natural key"""
+    group = group_columns(aggregate)
+    values = frame[list(aggregate.stats)].apply(pd.to_numeric, errors='coerce').astype('float64')
+    keys = [frame[column].to_numpy() for column in group] + \
+        [season_of(frame['game_date']).to_numpy()]
+    grouped = values.groupby(keys)
+    sums = pd.concat([grouped.size().rename('games'), grouped.count().add_suffix('_n'),
+                      grouped.sum().add_suffix('_sum'), (values ** 2).groupby(keys).sum().add_suffix('_sq')],
+                     axis=1)
+    sums.index.names = group + ['season']
+    return sums.reorder_levels(list(aggregate.natural_key))[sum_columns(aggregate)]
+
+
+def replaced_rows(connection, model, frame):
+    """
+    Rows of the model's table that writing `frame` will delete or overwrite: those of its
+    source files and those sharing its natural keys. Read before the write, to take them off.
+    """
+    aggregate = AGGREGATES[model.__tablename__]
+    table = model.__table__
+    key = list(model.natural_key)
+    columns = list(dict.fromkeys(key + group_columns(aggregate) + ['source_file'] + list(aggregate.stats)))
+    # Every replaced row is from one of the frame's games, so look only at those
+    rows = pd.read_sql(
+        select(*[table.c[column] for column in columns]).where(
+            table.c.game_date.in_(frame['game_date'].unique().tolist()),
+            table.c.team.in_(frame['team'].unique().tolist()),
+        ),
+        connection,
+    )
+    same_key = pd.MultiIndex.from_frame(rows[key]).isin(pd.MultiIndex.from_frame(frame[key]))
+    return rows[rows['source_file'].isin(frame['source_file'].unique()) | same_key]
+
+
+def add_sums_copy(connection, table, key, delta):
+    """Postgres: COPY the deltas into a temp table and add them on in one statement"""
+    staging = f"{table.name}_staging"
+    columns = ', '.join(delta.columns)
+    connection.exec_driver_sql(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table.name} WITH NO DATA"
+    )
+    buffer = StringIO()
+    delta.to_csv(buffer, index=False, header=False)
+    copy_sql = f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.cursor()
+    if hasattr(cursor, 'copy_expert'):
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)  # psycopg2
+    else:
+        with cursor.copy(copy_sql) as copy:  # psycopg 3
+            copy.write(buffer.getvalue())
+    cursor.close()
+    sums = [column for column in delta.columns if column not in key]
+    connection.exec_driver_sql(
+        # Parallel writers touch the same rows; taking their locks in key order can't deadlock
+        f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {staging} ORDER BY {', '.join(key)} "
+        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET "
+        + ', '.join(f"{column} = {table.name}.{column} + EXCLUDED.{column}" for column in sums)
+    )
+    connection.exec_driver_sql(f"DROP TABLE {staging}")
+
+
+def update_aggregates(connection, model, added, removed):
+    """Add the sums of `added` rows of the model's table and take off those of `removed` rows"""
+    aggregate = AGGREGATES[model.__tablename__]
+    delta = stat_sums(added, aggregate).sub(stat_sums(removed, aggregate), fill_value=0)
+    # An unchanged file reloaded adds what it takes off
+    delta = delta[(delta != 0).any(axis=1)]
+    if delta.empty:
+        return
+
+    table = aggregate.__table__
+    key = list(aggregate.natural_key)
+    counts = ['games'] + [f"{stat}_n" for stat in aggregate.stats]
+    delta[counts] = delta[counts].astype('int64')
+    delta = delta.reset_index()
+    if connection.dialect.name == 'postgresql':
+        add_sums_copy(connection, table, key, delta)
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=key,
+            set_={column: table.c[column] + statement.excluded[column] for column in sum_columns(aggregate)}
+        )
+        connection.execute(statement, delta.to_dict('records'))
+
+    # Groups that lost rows may have none left
+    emptied = delta.loc[delta['games'] < 0, key].rename(columns=lambda column: f"key_{column}")
+    if not emptied.empty:
+        connection.execute(
+            table.delete().where(and_(*[table.c[column] == bindparam(f"key_{column}") for column in key]),
+                                 table.c.games <= 0),
+            emptied.to_dict('records'),
+        )
+
+
+def rebuild_aggregates(connection, seasons=None, aggregates=None):
+    """
+    Recompute the aggregate tables (`aggregates` models only if given) from the box score
+    tables, for `seasons` only if given. Seasons whose partitions were archived keep their
+    aggregates unless rebuilt.
+    """
+    season = season_sql(connection)
+    for table_name, aggregate in AGGREGATES.items():
+        if aggregates is not None and aggregate not in aggregates:
+            continue
+        table = aggregate.__table__
+        groups = ', '.join(group_columns(aggregate))
+        sums = ['COUNT(*)']
+        for stat in aggregate.stats:
+            sums += [f"COUNT({stat})", f"COALESCE(SUM({stat}), 0)", f"COALESCE(SUM(CAST({stat} AS FLOAT) * {stat}), 0)"]
+        insert = (
+            f"INSERT INTO {table.name} ({groups}, season, {', '.join(sum_columns(aggregate))}) "
+            f"SELECT {groups}, season, {', '.join(sums)} "
+            f"FROM (SELECT {groups}, {', '.join(aggregate.stats)}, {season} AS season FROM {table_name} {{where}}) AS box "
+            f"GROUP BY {groups}, season"
+        )
+        if seasons is None:
+            connection.execute(table.delete())
+            connection.execute(text(insert.replace("{where}", "")))
+        else:
+            connection.execute(table.delete().where(table.c.season.in_(list(seasons))))
+            in_season = text(insert.replace("{where}", "WHERE game_date >= :start AND game_date < :end"))
+            for season_no in seasons:
+                connection.execute(in_season.bindparams(bindparam('start', season_start(season_no), type_=Date),
+                                                        bindparam('end', season_start(season_no + 1), type_=Date)))
+        print(f"📈 Rebuilt {table.name}")
+
+
+def ensure_aggregates():
+    """Fill the aggregate tables that are empty while their box score table is not (new tables)"""
+    with engine.begin() as connection:
+        empty = [aggregate for table_name, aggregate in AGGREGATES.items()
+                 if connection.execute(select(aggregate.__table__.c.season).limit(1)).first() is None and
+                 connection.execute(text(f"SELECT 1 FROM {table_name} LIMIT 1")).first() is not None]
+        if empty:
+            rebuild_aggregates(connection, aggregates=empty)
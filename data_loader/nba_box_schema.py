@@ -0,0 +1,166 @@
+# nba_box_schema.py
+# Column layouts of the basic / advanced box score tables and the coercion engine that
+# converts a whole frame of them at once (instead of one cell at a time).
+import numpy as np
+import pandas as pd
+
+INT = 'int'
+FLOAT = 'float'
+MINUTES = 'minutes'  # "34:44" or plain seconds -> <column>_seconds, texts -> dnp_reason
+
+# Source column -> (kind, value for missing or unreadable cells); masked rows get none
+BASIC_LAYOUT = {
+    'mp': (MINUTES, None),
+    'fg': (INT, 0),
+    'fga': (INT, 0),
+    'fg_pct': (FLOAT, 0.0),
+    'fg3': (INT, 0),
+    'fg3a': (INT, 0),
+    'fg3_pct': (FLOAT, 0.0),
+    'ft': (INT, 0),
+    'fta': (INT, 0),
+    'ft_pct': (FLOAT, 0.0),
+    'orb': (INT, 0),
+    'drb': (INT, 0),
+    'trb': (INT, 0),
+    'ast': (INT, 0),
+    'stl': (INT, 0),
+    'blk': (INT, 0),
+    'tov': (INT, 0),
+    'pf': (INT, 0),
+    'pts': (INT, 0),
+    'gm_sc': (FLOAT, 0.0),
+    'plus_minus': (INT, 0),
+}
+
+ADVANCED_LAYOUT = {
+    'mp': (MINUTES, None),
+    'ts_pct': (FLOAT, 0.0),
+    'efg_pct': (FLOAT, 0.0),
+    'fg3a_per_fga_pct': (FLOAT, 0.0),
+    'fta_per_fga_pct': (FLOAT, 0.0),
+    'orb_pct': (FLOAT, 0.0),
+    'drb_pct': (FLOAT, 0.0),
+    'trb_pct': (FLOAT, 0.0),
+    'ast_pct': (FLOAT, 0.0),
+    'stl_pct': (FLOAT, 0.0),
+    'blk_pct': (FLOAT, 0.0),
+    'tov_pct': (FLOAT, 0.0),
+    'usg_pct': (FLOAT, 0.0),
+    'off_rtg': (FLOAT, 0.0),
+    'def_rtg': (FLOAT, 0.0),
+    'bpm': (FLOAT, 0.0),
+}
+
+LAYOUTS = {'basic': BASIC_LAYOUT, 'advanced': ADVANCED_LAYOUT}
+
+
+def output_columns(layout):
+    """Columns coerce_frame returns for `layout`"""
+    columns = []
+    for column, (kind, _) in layout.items():
+        columns += [f"{column}_seconds", 'dnp_reason'] if kind == MINUTES else [column]
+    return columns
+
+
+def numbers(text):
+    return np.asarray(pd.to_numeric(text, errors='coerce'), dtype='float64')
+
+
+def minutes_column(values):
+    """
+    (seconds, reason, unreadable mask) of an MP column. "34:44" and plain numbers (the
+    table_parser files already hold seconds) become seconds; texts such as "Did Not Play"
+    or "Not With Team" are the reason the player has no minutes.
+    """
+    cells = values.to_numpy(dtype=object)
+    missing = pd.isna(cells)
+    text = np.char.strip(cells.astype(str))
+    if not len(text):  # np.char.partition can't size an empty result
+        return pd.array([], dtype='Int64'), np.array([], dtype=object), np.zeros(0, dtype=bool)
+    minutes, colon, rest = np.char.partition(text, ':').T
+    clock = colon == ':'
+    seconds = np.where(clock, numbers(minutes) * 60 + numbers(rest), numbers(np.where(clock, '', text)))
+    seconds[missing] = np.nan
+    has_letters = np.char.upper(text) != np.char.lower(text)
+    is_reason = ~missing & np.isnan(seconds) & has_letters
+    unreadable = ~missing & np.isnan(seconds) & ~has_letters & (text != '')
+    reason = np.where(is_reason, text.astype(object), None)
+    return pd.array(np.round(seconds), dtype='Int64'), reason, unreadable
+
+
+def typed(values, kind):
+    """Float column values as `kind`: ints truncate like int(float(...)) and are nullable if any are missing"""
+    if kind != INT:
+        return values
+    values = np.trunc(values)
+    return pd.array(values, dtype='Int64') if np.isnan(values).any() else values.astype('int64')
+
+
+def number_block(df, layout, columns, masked):
+    """
+    Parse all numeric `columns` of df in one to_numeric call over their cells. Returns
+    ({column: values}, {column: unreadable mask}); ".500" and "+20" parse, empty cells or
+    "," (empty percentages) take the default and masked rows are left missing.
+    """
+    cells = df[columns].to_numpy(dtype=object)
+    parsed = np.asarray(pd.to_numeric(cells.ravel(), errors='coerce'), dtype='float64').reshape(cells.shape)
+    blank = pd.isna(cells) | (cells == '') | (cells == ',')
+    unreadable = np.isnan(parsed) & ~blank & ~masked[:, None]
+
+    values = {}
+    for i, column in enumerate(columns):
+        kind, default = layout[column]
+        column_values = parsed[:, i]
+        if default is not None:
+            column_values = np.where(np.isnan(column_values) & ~masked, default, column_values)
+        values[column] = typed(column_values, kind)
+    return values, {column: unreadable[:, i] for i, column in enumerate(columns)}
+
+
+def coerce_frame(df, layout):
+    """
+    Coerce every column of `layout` in `df` at once. Returns (frame, problems): the frame
+    has the columns of output_columns(layout) on df's index, and problems maps each column
+    with unreadable cells to a Series of those cells (same index). Rows whose minutes hold
+    a "did not play" reason are masked - their other cells are expected to repeat it, and
+    they have no stats rather than zeros.
+    """
+    coerced = {}
+    problems = {}
+    masked = np.zeros(len(df), dtype=bool)
+
+    def report(column, unreadable):
+        if unreadable.any():
+            problems[column] = df[column][unreadable]
+
+    for column, (kind, default) in layout.items():
+        if kind != MINUTES:
+            continue
+        if column in df.columns:
+            seconds, reason, unreadable = minutes_column(df[column])
+            report(column, unreadable)
+            masked = masked | pd.notna(reason)
+        else:
+            seconds = pd.array([pd.NA] * len(df), dtype='Int64')
+            reason = np.full(len(df), None, dtype=object)
+        coerced[f"{column}_seconds"] = seconds
+        coerced['dnp_reason'] = reason
+
+    numeric = [column for column, (kind, _) in layout.items() if kind != MINUTES]
+    present = [column for column in numeric if column in df.columns]
+    values, unreadable = number_block(df, layout, present, masked)
+    for column in numeric:
+        if column in values:
+            coerced[column] = values[column]
+            report(column, unreadable[column])
+        else:
+            kind, default = layout[column]
+            coerced[column] = typed(np.where(masked | (default is None), np.nan, default), kind)
+
+    return pd.DataFrame(coerced, index=df.index)[output_columns(layout)], problems
+
+
+def describe_problems(problems):
+    """One line per column: count and a few of the unreadable values"""
+    return '; '.join(f"{column}: {len(values)} cells (e.g. {values.tolist()[:3]})" for column, values in problems.items())
@@ -1,73 +1,80 @@
 # nba_data_loader.py (Complete Fixed Version)
 import pandas as pd
 import os
-import glob
-from datetime import datetime
+from datetime import date, datetime
 import re
+import hashlib
+import numpy as np
+from io import StringIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from nba_database import SessionLocal, NBAGameBasic, NBAGameAdvanced
+import nba_file_catalog
+from nba_box_schema import LAYOUTS, coerce_frame, describe_problems
+from nba_file_catalog import FileCatalog
+from nba_aggregates import AGGREGATES, rebuild_aggregates, replaced_rows, season_of, update_aggregates
+from nba_database import SessionLocal, NBAGameBasic, NBAGameAdvanced, NBAPbpEvent, NBALoadLedger, ensure_partitions
+from nba_pbp import events_frame, parse_pbp
 
 class NBADataLoader:
+    BULK_TABLES = {'basic': NBAGameBasic.__tablename__, 'advanced': NBAGameAdvanced.__tablename__}
+    MODELS = {NBAGameBasic.__tablename__: NBAGameBasic, NBAGameAdvanced.__tablename__: NBAGameAdvanced,
+              NBAPbpEvent.__tablename__: NBAPbpEvent}
+
     def __init__(self, data_path="./nba_data"):
         self.data_path = data_path
         self.session = SessionLocal()
+        self._away_teams = None
     
     def parse_filename(self, filename):
-        """Extract metadata from filename - fixed version"""
-        # Remove the .csv extension first
-        base_name = filename.replace('.csv', '')
-        
-        # Split by underscores to get the main parts
-        parts = base_name.split('_')
-        
-        if len(parts) < 3:
-            return None
-        
-        # First part: YYYYMMDDTEAM (e.g., 202511200MEM)
-        game_info = parts[0]
-        
-        # Extract date (first 8 characters) and team (rest)
-        if len(game_info) < 11:
-            return None
-            
-        game_date_str = game_info[:8]
-        away_team = game_info[8:] 
-        
-        # Remove the leading '0' from team codes if present
-        if away_team.startswith('0'):
-            away_team = away_team[1:]
-        
-        # Second part: box-HOMETEAM-period-stattype (e.g., box-SAC-game-advanced)
-        box_info = parts[1]
-        box_parts = box_info.split('-')
-        
-        if len(box_parts) < 4:
+        """
+        Loader metadata for a box score file name (None for other files). Rows are loaded
+        with the box score's team as `team`; the game id only names the home team, so a home
+        box score's opponent comes from the catalog and is None until the away box score is there.
+        """
+        info = nba_file_catalog.parse_filename(filename)
+        if info is None or info['kind'] != 'box':
             return None
-            
-        # Extract home team, period, and stat type
-        home_team = box_parts[1]
-        period = box_parts[2]
-        stat_type = box_parts[3]
-        
-        # Third part: scrape date (e.g., 2025-11-28)
-        scrape_date_str = parts[2]
         
+        is_home = info['box_team'] == info['home_team']
+        return {
+            'game_date': info['game_date'],
+            'team': info['box_team'],
+            'opponent': self.away_team(info['game_id']) if is_home else info['home_team'],
+            'home_away': 'HOME' if is_home else 'AWAY',
+            'period': info['period'],
+            'stat_type': info['stat_type'],
+            'scrape_date': info['scrape_date'],
+            'filename': filename
+        }
+
+    def away_team(self, game_id):
+        """Away team of a game from the file catalog, read once per loader"""
+        if self._away_teams is None:
+            catalog = FileCatalog(self.data_path)
+            try:
+                self._away_teams = catalog.away_teams()
+            finally:
+                catalog.close()
+        return self._away_teams.get(game_id)
+
+    def box_score_files(self):
+        """Box score CSVs in data_path, from the file catalog (refreshed first)"""
+        catalog = FileCatalog(self.data_path)
         try:
-            game_date = datetime.strptime(game_date_str, '%Y%m%d').date()
-            scrape_date = datetime.strptime(scrape_date_str, '%Y-%m-%d').date()
-            
-            return {
-                'game_date': game_date,
-                'home_team': home_team,
-                'away_team': away_team,
-                'period': period,
-                'stat_type': stat_type,
-                'scrape_date': scrape_date,
-                'filename': filename
-            }
-            
-        except ValueError:
-            return None
+            catalog.refresh()
+            return catalog.paths(kind='box')
+        finally:
+            catalog.close()
+
+    def pbp_files(self):
+        """Catalog rows of the play-by-play CSVs in data_path (away_team is known once a box score of the game is there)"""
+        catalog = FileCatalog(self.data_path)
+        try:
+            catalog.refresh()
+            return catalog.find(kind='pbp')
+        finally:
+            catalog.close()
 
     def clean_dataframe(self, df, stat_type):
         """Clean the multi-level header dataframe"""
@@ -98,53 +105,6 @@ class NBADataLoader:
             print(f"Error cleaning dataframe: {e}")
             return df
 
-    def safe_convert(self, value, convert_type=float, default=None):
-        """Safely convert values"""
-        if pd.isna(value) or value == '' or value is None:
-            return default
-        
-        if isinstance(value, str) and 'Did Not Play' in value:
-            return default
-            
-        # Handle empty percentage cells
-        if isinstance(value, str) and value == ',':
-            return default
-            
-        try:
-            if convert_type == int:
-                # Handle float strings for int conversion
-                if isinstance(value, str) and '.' in value:
-                    return int(float(value))
-                return int(value)
-            elif convert_type == float:
-                return float(value)
-            else:
-                return convert_type(value)
-        except (ValueError, TypeError):
-            return default
-
-    def safe_convert_mp(self, mp_value):
-        """Safely convert minutes played field - handle 'Did Not Play' and time formats"""
-        if pd.isna(mp_value) or mp_value == '' or mp_value is None:
-            return None
-        
-        if isinstance(mp_value, str) and 'Did Not Play' in mp_value:
-            return 'DNP'
-        
-        # Handle time format (e.g., "8:50")
-        if isinstance(mp_value, str) and ':' in mp_value:
-            try:
-                minutes, seconds = mp_value.split(':')
-                return f"{int(minutes):02d}:{int(seconds):02d}"
-            except (ValueError, IndexError):
-                return mp_value[:10]  # Truncate to 10 characters if invalid format
-        
-        # Truncate any other string to 10 characters
-        if isinstance(mp_value, str):
-            return mp_value[:10]
-        
-        return str(mp_value)[:10]
-
     def map_column_names(self, columns, stat_type):
         """Map CSV column names to database column names"""
         column_mapping = {}
@@ -200,25 +160,40 @@ class NBADataLoader:
                 
         return column_mapping
 
+    def read_box_score(self, file_path, stat_type):
+        """Read a box score CSV in either layout and return it with database column names"""
+        with open(file_path, encoding='utf-8') as f:
+            first_line = f.readline()
+        
+        # Old read_html files: two header rows ("Unnamed: 0_level_0,Basic Box Score Stats,...")
+        if first_line.startswith('Unnamed'):
+            df = pd.read_csv(file_path, header=[0, 1])
+            df = self.clean_dataframe(df, stat_type)
+            return df.rename(columns=self.map_column_names(df.columns, stat_type))
+        
+        # table_parser files: one header row of data-stat names, which already match ours
+        df = pd.read_csv(file_path)
+        df = df.rename(columns={'game_score': 'gm_sc'})
+        if 'reason' in df.columns:
+            # "Did Not Play" etc. lives in its own column instead of the MP cell
+            df['mp'] = df['mp'].astype(object).where(df['reason'].isna(), df['reason'])
+        # The "Reserves" header row is not kept, and the starters are always the first five
+        df['is_starter'] = df.index < 5
+        return df
+
     def process_basic_data(self, file_path, file_info):
         """Process basic box score data and insert into database"""
         try:
-            # Read the file
-            df = pd.read_csv(file_path, header=[0, 1])
-            df = self.clean_dataframe(df, 'basic')
-            
-            # Map column names
-            column_mapping = self.map_column_names(df.columns, 'basic')
-            df = df.rename(columns=column_mapping)
-            
-            # Determine which team this data belongs to
-            team_code = file_info['away_team']
-            opponent_code = file_info['home_team']
+            # Read the file (either layout) with database column names
+            df = self.read_box_score(file_path, 'basic')
+            # Stat columns are converted for all player rows at once; the loop picks them up by index
+            stats = self.coerce_stats(df[self.player_rows(df)], 'basic', file_info['filename'])
             
             is_starter_section = True
             records_processed = 0
+            players = []
             
-            for _, row in df.iterrows():
+            for index, row in df.iterrows():
                 player_name = row.get('player', '')
                 
                 # Skip empty rows and section headers
@@ -236,52 +211,27 @@ class NBADataLoader:
                 if not player_name or player_name.strip() == '':
                     continue
                 
-                # Determine home/away
-                home_away = 'AWAY' if team_code != file_info['home_team'] else 'HOME'
-                
-                # Safely handle minutes played field
-                mp_value = row.get('mp', '')
-                safe_mp = self.safe_convert_mp(mp_value)
-                
                 # Create basic stats record
                 basic_data = NBAGameBasic(
                     player=player_name.strip(),
                     pos=row.get('pos', ''),
-                    mp=safe_mp,  # Use the safely converted MP value
-                    fg=self.safe_convert(row.get('fg'), int, 0),
-                    fga=self.safe_convert(row.get('fga'), int, 0),
-                    fg_pct=self.safe_convert(row.get('fg_pct'), float, 0.0),
-                    fg3=self.safe_convert(row.get('fg3'), int, 0),
-                    fg3a=self.safe_convert(row.get('fg3a'), int, 0),
-                    fg3_pct=self.safe_convert(row.get('fg3_pct'), float, 0.0),
-                    ft=self.safe_convert(row.get('ft'), int, 0),
-                    fta=self.safe_convert(row.get('fta'), int, 0),
-                    ft_pct=self.safe_convert(row.get('ft_pct'), float, 0.0),
-                    orb=self.safe_convert(row.get('orb'), int, 0),
-                    drb=self.safe_convert(row.get('drb'), int, 0),
-                    trb=self.safe_convert(row.get('trb'), int, 0),
-                    ast=self.safe_convert(row.get('ast'), int, 0),
-                    stl=self.safe_convert(row.get('stl'), int, 0),
-                    blk=self.safe_convert(row.get('blk'), int, 0),
-                    tov=self.safe_convert(row.get('tov'), int, 0),
-                    pf=self.safe_convert(row.get('pf'), int, 0),
-                    pts=self.safe_convert(row.get('pts'), int, 0),
-                    gm_sc=self.safe_convert(row.get('gm_sc'), float, 0.0),
-                    plus_minus=self.safe_convert(row.get('plus_minus'), int, 0),
+                    **stats[index],
                     
                     # Metadata
                     game_date=file_info['game_date'],
-                    team=team_code,
-                    opponent=opponent_code,
-                    home_away=home_away,
+                    team=file_info['team'],
+                    opponent=file_info['opponent'],
+                    home_away=file_info['home_away'],
                     period=file_info['period'],
-                    is_starter=is_starter_section,
+                    is_starter=bool(row.get('is_starter', is_starter_section)),
                     source_file=file_info['filename']
                 )
                 
                 self.session.add(basic_data)
+                players.append(player_name.strip())
                 records_processed += 1
             
+            self.replace_existing(NBAGameBasic, file_info, players)
             self.session.commit()
             return records_processed
             
@@ -293,22 +243,16 @@ class NBADataLoader:
     def process_advanced_data(self, file_path, file_info):
         """Process advanced box score data and insert into database"""
         try:
-            # Read the file
-            df = pd.read_csv(file_path, header=[0, 1])
-            df = self.clean_dataframe(df, 'advanced')
-            
-            # Map column names
-            column_mapping = self.map_column_names(df.columns, 'advanced')
-            df = df.rename(columns=column_mapping)
-            
-            # Determine which team this data belongs to
-            team_code = file_info['away_team']
-            opponent_code = file_info['home_team']
+            # Read the file (either layout) with database column names
+            df = self.read_box_score(file_path, 'advanced')
+            # Stat columns are converted for all player rows at once; the loop picks them up by index
+            stats = self.coerce_stats(df[self.player_rows(df)], 'advanced', file_info['filename'])
             
             is_starter_section = True
             records_processed = 0
+            players = []
             
-            for _, row in df.iterrows():
+            for index, row in df.iterrows():
                 player_name = row.get('player', '')
                 
                 # Skip empty rows and section headers
@@ -326,46 +270,26 @@ class NBADataLoader:
                 if not player_name or player_name.strip() == '':
                     continue
                 
-                # Determine home/away
-                home_away = 'AWAY' if team_code != file_info['home_team'] else 'HOME'
-                
-                # Safely handle minutes played field
-                mp_value = row.get('mp', '')
-                safe_mp = self.safe_convert_mp(mp_value)
-                
                 # Create advanced stats record
                 advanced_data = NBAGameAdvanced(
                     player=player_name.strip(),
                     pos=row.get('pos', ''),
-                    mp=safe_mp,  # Use the safely converted MP value
-                    ts_pct=self.safe_convert(row.get('ts_pct'), float, 0.0),
-                    efg_pct=self.safe_convert(row.get('efg_pct'), float, 0.0),
-                    fg3a_per_fga_pct=self.safe_convert(row.get('fg3a_per_fga_pct'), float, 0.0),
-                    fta_per_fga_pct=self.safe_convert(row.get('fta_per_fga_pct'), float, 0.0),
-                    orb_pct=self.safe_convert(row.get('orb_pct'), float, 0.0),
-                    drb_pct=self.safe_convert(row.get('drb_pct'), float, 0.0),
-                    trb_pct=self.safe_convert(row.get('trb_pct'), float, 0.0),
-                    ast_pct=self.safe_convert(row.get('ast_pct'), float, 0.0),
-                    stl_pct=self.safe_convert(row.get('stl_pct'), float, 0.0),
-                    blk_pct=self.safe_convert(row.get('blk_pct'), float, 0.0),
-                    tov_pct=self.safe_convert(row.get('tov_pct'), float, 0.0),
-                    usg_pct=self.safe_convert(row.get('usg_pct'), float, 0.0),
-                    off_rtg=self.safe_convert(row.get('off_rtg'), float, 0.0),
-                    def_rtg=self.safe_convert(row.get('def_rtg'), float, 0.0),
-                    bpm=self.safe_convert(row.get('bpm'), float, 0.0),
+                    **stats[index],
                     
                     # Metadata
                     game_date=file_info['game_date'],
-                    team=team_code,
-                    opponent=opponent_code,
-                    home_away=home_away,
-                    is_starter=is_starter_section,
+                    team=file_info['team'],
+                    opponent=file_info['opponent'],
+                    home_away=file_info['home_away'],
+                    is_starter=bool(row.get('is_starter', is_starter_section)),
                     source_file=file_info['filename']
                 )
                 
                 self.session.add(advanced_data)
+                players.append(player_name.strip())
                 records_processed += 1
             
+            self.replace_existing(NBAGameAdvanced, file_info, players)
             self.session.commit()
             return records_processed
             
@@ -374,10 +298,459 @@ class NBADataLoader:
             print(f"  ❌ Error processing advanced data: {e}")
             return 0
 
-    def load_all_data(self):
-        """Load all CSV files into the database"""
-        csv_files = glob.glob(os.path.join(self.data_path, "*.csv"))
+    def replace_existing(self, model, file_info, players):
+        """Row path upsert: drop this file's earlier rows and rows of the same players in the same game"""
+        table = model.__table__
+        same_game = and_(table.c.game_date == file_info['game_date'],
+                         table.c.team == file_info['team'],
+                         table.c.player.in_(players))
+        if 'period' in model.natural_key:
+            same_game = and_(same_game, table.c.period == file_info['period'])
+        self.session.execute(table.delete().where(or_(table.c.source_file == file_info['filename'], same_game)))
+
+    def player_rows(self, df):
+        """Mask of the rows the loaders keep: not section headers, totals, blanks or "Did Not Play" names"""
+        players = df['player'] if 'player' in df.columns else pd.Series('', index=df.index)
+        names = players.astype(str)
+        return (players.notna() & ~players.isin(['', 'Team Totals', 'Starters', 'Reserves'])
+                & ~names.str.contains('Did Not Play', regex=False)
+                & (names.str.strip() != '')).to_numpy()
+
+    def coerce_frame(self, df, stat_type, source_files):
+        """nba_box_schema.coerce_frame for the stat_type layout, printing unreadable cells and their files"""
+        coerced, problems = coerce_frame(df, LAYOUTS[stat_type])
+        if problems:
+            files = sorted({source_files[index] for cells in problems.values() for index in cells.index})
+            print(f"  ⚠ Unreadable cells in {', '.join(files)}: {describe_problems(problems)}")
+        return coerced
+
+    def coerce_stats(self, df, stat_type, filename):
+        """Per-row path: coerced stat columns as {index: {column: value}}, None for missing values"""
+        coerced = self.coerce_frame(df, stat_type, pd.Series(filename, index=df.index))
+        values = [coerced[column].to_numpy(dtype=object, na_value=None) for column in coerced.columns]
+        return {index: dict(zip(coerced.columns, row)) for index, row in zip(coerced.index, zip(*values))}
+
+    def build_frame(self, files, stat_type):
+        """
+        Vectorized process_basic_data / process_advanced_data for a batch of
+        [(df, file_info), ...]: the files are concatenated and converted in one go,
+        one row per database record.
+        """
+        files = [(df, file_info) for df, file_info in files if not df.empty]
+        if not files:
+            return pd.DataFrame()
+        lengths = [len(df) for df, _ in files]
+        df = pd.concat([df for df, _ in files], ignore_index=True)
+        file_no = np.repeat(np.arange(len(files)), lengths)
+        
+        def per_file(values):
+            return np.repeat(np.array(values, dtype=object), lengths)
+        
+        players = df['player'] if 'player' in df.columns else pd.Series('', index=df.index)
+        names = players.astype(str)
+        
+        # Rows after the "Reserves" header row are bench players
+        is_starter = (players == 'Reserves').groupby(file_no).cumsum() == 0
+        if 'is_starter' in df.columns:
+            is_starter = df['is_starter'].where(df['is_starter'].notna(), is_starter).astype(bool)
+        
+        # Same rows the per-row loop keeps
+        keep = self.player_rows(df)
+        
+        columns = {
+            'player': names[keep].str.strip(),
+            'pos': df['pos'][keep].where(df['pos'][keep].notna(), None) if 'pos' in df.columns else '',
+        }
+        infos = [file_info for _, file_info in files]
+        source_files = pd.Series(per_file([info['filename'] for info in infos]), index=df.index)
+        coerced = self.coerce_frame(df[keep], stat_type, source_files)
+        for column in coerced.columns:
+            columns[column] = coerced[column]
+        
+        columns['game_date'] = per_file([info['game_date'] for info in infos])[keep]
+        columns['team'] = per_file([info['team'] for info in infos])[keep]
+        columns['opponent'] = per_file([info['opponent'] for info in infos])[keep]
+        columns['home_away'] = per_file([info['home_away'] for info in infos])[keep]
+        if stat_type == 'basic':
+            columns['period'] = per_file([info['period'] for info in infos])[keep]
+        columns['is_starter'] = is_starter[keep]
+        columns['source_file'] = source_files[keep]
+        
+        # Column default the ORM would otherwise fill in (ids come from the identity column)
+        columns['created_at'] = datetime.now()
+        
+        frame = pd.DataFrame({name: (values.array if isinstance(values, pd.Series) else values)
+                              for name, values in columns.items()},
+                             index=pd.RangeIndex(int(keep.sum())))
+        return frame
+
+    def write_frames(self, frames, ledger=None):
+        """
+        Upsert {table_name: DataFrame} on each table's natural key and record the files in
+        the load ledger, all in one transaction. Rows of files being reloaded are replaced,
+        and the aggregate tables take the difference (nba_aggregates).
+        Postgres COPYs into a temp table first; other engines insert with ON CONFLICT.
+        """
+        engine = self.session.get_bind()
+        for table_name, frame in frames.items():
+            if not frame.empty:
+                ensure_partitions(table_name, frame['game_date'].unique())
+        
+        with engine.begin() as connection:
+            for table_name, frame in frames.items():
+                if frame.empty:
+                    continue
+                model = self.MODELS[table_name]
+                table = model.__table__
+                key = list(model.natural_key)
+                # A re-scraped game can be in one batch under two file names; the latest scrape wins
+                frame = frame.sort_values('source_file', kind='stable').drop_duplicates(key, keep='last')
+                sources = frame['source_file'].unique().tolist()
+                replaced = replaced_rows(connection, model, frame) if table_name in AGGREGATES else None
+                connection.execute(table.delete().where(table.c.source_file.in_(sources)))
+                updates = [column for column in frame.columns if column not in key]
+                
+                if engine.dialect.name == 'postgresql':
+                    staging = f"{table_name}_staging"
+                    columns = ', '.join(frame.columns)
+                    # Same column types (enums included) but no constraints - ids come from the real table
+                    connection.exec_driver_sql(
+                        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                        f"SELECT {columns} FROM {table_name} WITH NO DATA"
+                    )
+                    buffer = StringIO()
+                    frame.to_csv(buffer, index=False, header=False, na_rep='\\N')
+                    buffer.seek(0)
+                    copy_sql = f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+                    cursor = connection.connection.cursor()
+                    if hasattr(cursor, 'copy_expert'):
+                        cursor.copy_expert(copy_sql, buffer)  # psycopg2
+                    else:
+                        with cursor.copy(copy_sql) as copy:  # psycopg 3
+                            copy.write(buffer.getvalue())
+                    cursor.close()
+                    connection.exec_driver_sql(
+                        f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging} "
+                        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET "
+                        + ', '.join(f"{column} = EXCLUDED.{column}" for column in updates)
+                    )
+                else:
+                    records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+                    if engine.dialect.name == 'sqlite':
+                        from sqlalchemy.dialects.sqlite import insert
+                        statement = insert(table)
+                        statement = statement.on_conflict_do_update(
+                            index_elements=key, set_={column: statement.excluded[column] for column in updates}
+                        )
+                    else:
+                        statement = table.insert()
+                    connection.execute(statement, records)
+                
+                if replaced is not None:
+                    update_aggregates(connection, model, frame, replaced)
+            
+            if ledger:
+                self.record_loaded(connection, ledger)
+
+    def ledger_entry(self, file_path, row_count):
+        """nba_load_ledger row for a file as it is on disk now"""
+        stat = os.stat(file_path)
+        return {
+            'source_file': os.path.basename(file_path),
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime,
+            'content_hash': self.file_hash(file_path),
+            'row_count': row_count,
+            'loaded_at': datetime.now(),
+        }
+
+    def file_hash(self, file_path):
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def record_file(self, file_path, row_count):
+        """Ledger a file loaded by the per-row path"""
+        with self.session.get_bind().begin() as connection:
+            self.record_loaded(connection, [self.ledger_entry(file_path, row_count)])
+
+    def record_loaded(self, connection, entries):
+        ledger = NBALoadLedger.__table__
+        connection.execute(ledger.delete().where(ledger.c.source_file.in_([e['source_file'] for e in entries])))
+        connection.execute(ledger.insert(), entries)
+
+    def files_to_load(self, csv_files):
+        """
+        Drop files the ledger says are already loaded: same size and mtime, or touched but with
+        the same content hash (their ledger entry is refreshed). New and changed files remain.
+        """
+        engine = self.session.get_bind()
+        ledger = NBALoadLedger.__table__
+        with engine.connect() as connection:
+            loaded = {row.source_file: row for row in connection.execute(ledger.select())}
+        
+        to_load = []
+        touched = []
+        for file_path in csv_files:
+            entry = loaded.get(os.path.basename(file_path))
+            if entry is None:
+                to_load.append(file_path)
+                continue
+            stat = os.stat(file_path)
+            if stat.st_size == entry.file_size and stat.st_mtime == entry.file_mtime:
+                continue
+            if stat.st_size == entry.file_size and self.file_hash(file_path) == entry.content_hash:
+                touched.append(self.ledger_entry(file_path, entry.row_count))
+                continue
+            to_load.append(file_path)
+        
+        if touched:
+            with engine.begin() as connection:
+                self.record_loaded(connection, touched)
+        print(f"⏭ Skipping {len(csv_files) - len(to_load)} files already loaded unchanged")
+        return to_load
+
+    def ensure_partitions(self, csv_files):
+        """Per-row path: create the monthly partitions for every game in csv_files up front"""
+        file_infos = [self.parse_filename(os.path.basename(file_path)) for file_path in csv_files]
+        days = {file_info['game_date'] for file_info in file_infos if file_info}
+        for table_name in self.MODELS:
+            ensure_partitions(table_name, days)
+
+    def build_ledger(self, file_paths, frames):
+        """Ledger entries for the files of a built batch that produced rows (the rest count as failed)"""
+        counts = {}
+        for frame in frames.values():
+            if not frame.empty:
+                counts.update(frame['source_file'].value_counts().to_dict())
+        return [self.ledger_entry(file_path, counts[os.path.basename(file_path)])
+                for file_path in file_paths if os.path.basename(file_path) in counts]
+
+    def read_file(self, file_path):
+        """Parse one box score file for the bulk paths; returns (stat_type, df, file_info) or None"""
+        filename = os.path.basename(file_path)
+        file_info = self.parse_filename(filename)
+        
+        if not file_info:
+            print(f"✗ Could not parse filename: {filename}")
+            return None
+        if file_info['opponent'] is None:
+            print(f"⚠ No away box score of the game yet, skipping: {filename}")
+            return None
+        
+        stat_type = file_info['stat_type']
+        if stat_type not in self.BULK_TABLES:
+            print(f"⚠ Unknown stat type: {stat_type} in {filename}")
+            return None
+        
+        try:
+            return stat_type, self.read_box_score(file_path, stat_type), file_info
+        except Exception as e:
+            print(f"✗ Processing failed for {filename}: {e}")
+            return None
+
+    def build_tables(self, pending):
+        """{stat_type: [(df, file_info), ...]} -> {table_name: DataFrame} ready for write_frames"""
+        return {table_name: self.build_frame(pending[stat_type], stat_type)
+                for stat_type, table_name in self.BULK_TABLES.items()}
+
+    def loaded_counts(self, frames):
+        """(files, records) in built frames - files with no player rows count as failed, like the per-row loader"""
+        files = sum(frame['source_file'].nunique() for frame in frames.values() if not frame.empty)
+        records = sum(len(frame) for frame in frames.values())
+        return files, records
+
+    def load_all_data_bulk(self, batch_rows=50000, csv_files=None):
+        """Bulk mode: read files into large multi-file batches, build each batch column-wise and COPY it"""
+        if csv_files is None:
+            csv_files = self.box_score_files()
+        print(f"Found {len(csv_files)} CSV files to bulk load...")
+        
+        successful = 0
+        failed = 0
+        total_records = 0
+        pending = {stat_type: [] for stat_type in self.BULK_TABLES}
+        pending_paths = []
+        pending_rows = 0
+        
+        def flush():
+            nonlocal successful, failed, total_records, pending, pending_paths, pending_rows
+            pending_files = len(pending_paths)
+            try:
+                frames = self.build_tables(pending)
+                self.write_frames(frames, self.build_ledger(pending_paths, frames))
+                loaded, records = self.loaded_counts(frames)
+                successful += loaded
+                failed += pending_files - loaded
+                total_records += records
+                print(f"✓ Committed batch: {loaded} files ({records} records)")
+            except Exception as e:
+                print(f"  ❌ Batch of {pending_files} files failed: {e}")
+                failed += pending_files
+            pending = {stat_type: [] for stat_type in self.BULK_TABLES}
+            pending_paths = []
+            pending_rows = 0
+        
+        for i, file_path in enumerate(csv_files):
+            if i % 100 == 0:  # Progress update every 100 files
+                print(f"Processed {i}/{len(csv_files)} files...")
+            
+            item = self.read_file(file_path)
+            if item is None:
+                failed += 1
+                continue
+            
+            stat_type, df, file_info = item
+            pending[stat_type].append((df, file_info))
+            pending_paths.append(file_path)
+            pending_rows += len(df)
+            if pending_rows >= batch_rows:
+                flush()
+        
+        if pending_paths:
+            flush()
+        
+        self.print_summary(successful, failed, total_records)
+
+    def load_all_data_parallel(self, workers=None, writers=2, files_per_task=200, csv_files=None):
+        """
+        Parallel mode: a process pool parses and builds chunks of files (prepare_files),
+        and a small pool of writer threads COPYs the results, each on its own connection.
+        Both stages are bounded, so a slow database holds back parsing instead of memory.
+        """
+        if csv_files is None:
+            csv_files = self.box_score_files()
+        workers = workers or os.cpu_count() or 1
+        chunks = [csv_files[i:i + files_per_task] for i in range(0, len(csv_files), files_per_task)]
+        print(f"Found {len(csv_files)} CSV files to load with {workers} workers and {writers} writers...")
+        
+        successful = 0
+        failed = 0
+        total_records = 0
+        next_chunk = 0
+        parsing = {}  # future -> chunk
+        writing = {}  # future -> (frames, files read)
+        
+        with ProcessPoolExecutor(max_workers=workers) as parse_pool, \
+                ThreadPoolExecutor(max_workers=writers) as write_pool:
+            while True:
+                while next_chunk < len(chunks) and len(parsing) < workers * 2 and len(writing) < writers * 2:
+                    chunk = chunks[next_chunk]
+                    parsing[parse_pool.submit(prepare_files, self.data_path, chunk)] = chunk
+                    next_chunk += 1
+                if not parsing and not writing:
+                    break
+                
+                done, _ = wait(list(parsing) + list(writing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in parsing:
+                        chunk = parsing.pop(future)
+                        try:
+                            frames, ledger, files_read, chunk_failed = future.result()
+                        except Exception as e:
+                            print(f"  ❌ Worker failed on {len(chunk)} files: {e}")
+                            failed += len(chunk)
+                            continue
+                        failed += chunk_failed
+                        writing[write_pool.submit(self.write_frames, frames, ledger)] = (frames, files_read)
+                    else:
+                        frames, files_read = writing.pop(future)
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print(f"  ❌ Batch of {files_read} files failed: {e}")
+                            failed += files_read
+                            continue
+                        loaded, records = self.loaded_counts(frames)
+                        successful += loaded
+                        failed += files_read - loaded
+                        total_records += records
+                        print(f"✓ Committed batch: {loaded} files ({records} records)")
+        
+        self.print_summary(successful, failed, total_records)
+
+    def load_pbp_data(self, batch_rows=50000, incremental=True):
+        """
+        Stream the play-by-play files into nba_pbp_event. Events are parsed a line at a time
+        and written in batches of about batch_rows, so memory stays bounded by one batch
+        however many games there are.
+        """
+        rows = {os.path.join(self.data_path, row['filename']): row for row in self.pbp_files()}
+        csv_files = list(rows)
+        if incremental:
+            csv_files = self.files_to_load(csv_files)
+        print(f"Found {len(csv_files)} play-by-play files to load...")
+        
+        successful = 0
+        failed = 0
+        total_records = 0
+        pending = []
+        pending_paths = []
+        table_name = NBAPbpEvent.__tablename__
+        
+        def flush():
+            nonlocal successful, failed, total_records, pending, pending_paths
+            try:
+                frame = events_frame(pending)
+                counts = frame['source_file'].value_counts()
+                self.write_frames({table_name: frame},
+                                  [self.ledger_entry(path, int(counts[os.path.basename(path)])) for path in pending_paths])
+                successful += len(pending_paths)
+                total_records += len(frame)
+                print(f"✓ Committed batch: {len(pending_paths)} files ({len(frame)} events)")
+            except Exception as e:
+                print(f"  ❌ Batch of {len(pending_paths)} files failed: {e}")
+                failed += len(pending_paths)
+            pending = []
+            pending_paths = []
+        
+        for file_path in csv_files:
+            row = rows[file_path]
+            filename = row['filename']
+            try:
+                events = list(parse_pbp(file_path, row['game_id'], date.fromisoformat(row['game_date']),
+                                        row['home_team'], row['away_team']))
+            except Exception as e:
+                print(f"✗ Processing failed for {filename}: {e}")
+                failed += 1
+                continue
+            if not events:
+                print(f"✗ No plays in {filename}")
+                failed += 1
+                continue
+            for event in events:
+                event['source_file'] = filename
+            pending += events
+            pending_paths.append(file_path)
+            if len(pending) >= batch_rows:
+                flush()
+        
+        if pending_paths:
+            flush()
+        
+        self.print_summary(successful, failed, total_records)
+
+    def print_summary(self, successful, failed, total_records):
+        print(f"\nData loading completed!")
+        print(f"✅ Successful files: {successful}")
+        print(f"❌ Failed files: {failed}")
+        print(f"📊 Total records loaded: {total_records}")
+        print(f"🎯 Success rate: {successful/(successful+failed)*100:.1f}%" if (successful+failed) > 0 else "N/A")
+
+    def load_all_data(self, bulk=False, batch_rows=50000, workers=0, writers=2, incremental=True):
+        """
+        Load all CSV files into the database (workers > 0 loads them in parallel processes).
+        With incremental=True files the load ledger has already seen unchanged are skipped.
+        """
+        csv_files = self.box_score_files()
+        if incremental:
+            csv_files = self.files_to_load(csv_files)
+        if workers:
+            return self.load_all_data_parallel(workers, writers, csv_files=csv_files)
+        if bulk:
+            return self.load_all_data_bulk(batch_rows, csv_files=csv_files)
+        
         print(f"Found {len(csv_files)} CSV files to process...")
+        self.ensure_partitions(csv_files)
         
         successful = 0
         failed = 0
@@ -391,6 +764,10 @@ class NBADataLoader:
                 print(f"✗ Could not parse filename: {filename}")
                 failed += 1
                 continue
+            if file_info['opponent'] is None:
+                print(f"⚠ No away box score of the game yet, skipping: {filename}")
+                failed += 1
+                continue
             
             if i % 100 == 0:  # Progress update every 100 files
                 print(f"Processed {i}/{len(csv_files)} files...")
@@ -399,6 +776,7 @@ class NBADataLoader:
                 if file_info['stat_type'] == 'basic':
                     records = self.process_basic_data(file_path, file_info)
                     if records > 0:
+                        self.record_file(file_path, records)
                         successful += 1
                         total_records += records
                         print(f"✓ Loaded {file_info['period']} basic: {filename} ({records} records)")
@@ -407,6 +785,7 @@ class NBADataLoader:
                 elif file_info['stat_type'] == 'advanced':
                     records = self.process_advanced_data(file_path, file_info)
                     if records > 0:
+                        self.record_file(file_path, records)
                         successful += 1
                         total_records += records
                         print(f"✓ Loaded advanced: {filename} ({records} records)")
@@ -420,12 +799,42 @@ class NBADataLoader:
                 print(f"✗ Processing failed for {filename}: {e}")
                 failed += 1
         
-        print(f"\nData loading completed!")
-        print(f"✅ Successful files: {successful}")
-        print(f"❌ Failed files: {failed}")
-        print(f"📊 Total records loaded: {total_records}")
-        print(f"🎯 Success rate: {successful/(successful+failed)*100:.1f}%" if (successful+failed) > 0 else "N/A")
+        self.rebuild_aggregates(csv_files)
+        self.print_summary(successful, failed, total_records)
+    
+    def rebuild_aggregates(self, csv_files):
+        """Per-row path: it writes through the session, so recompute the aggregates of the seasons it loaded"""
+        file_infos = [self.parse_filename(os.path.basename(file_path)) for file_path in csv_files]
+        days = pd.Series([file_info['game_date'] for file_info in file_infos if file_info])
+        if days.empty:
+            return
+        with self.session.get_bind().begin() as connection:
+            rebuild_aggregates(connection, sorted(set(season_of(days).tolist())))
     
     def close(self):
         """Close database session"""
-        self.session.close()
\ No newline at end of file
+        self.session.close()
+
+
+def prepare_files(data_path, csv_files):
+    """
+    Process pool task for load_all_data_parallel: read and build one chunk of files.
+    Returns (frames, ledger entries, files read, files failed); only the writers touch the database.
+    """
+    loader = NBADataLoader(data_path)
+    try:
+        pending = {stat_type: [] for stat_type in loader.BULK_TABLES}
+        file_paths = []
+        failed = 0
+        for file_path in csv_files:
+            item = loader.read_file(file_path)
+            if item is None:
+                failed += 1
+                continue
+            stat_type, df, file_info = item
+            pending[stat_type].append((df, file_info))
+            file_paths.append(file_path)
+        frames = loader.build_tables(pending)
+        return frames, loader.build_ledger(file_paths, frames), len(file_paths), failed
+    finally:
+        loader.close()
\ No newline at end of file
@@ -0,0 +1,237 @@
+# nba_file_catalog.py
+# Indexed catalog of the raw scraped files, so loaders and scripts can ask for e.g. all q4
+# basic box scores of BOS in November without listing and parsing the whole folder.
+#
+#   python nba_file_catalog.py team=BOS period=q4 stat_type=basic month=2025-11
+import os
+import re
+import sys
+import sqlite3
+import threading
+from datetime import date, datetime
+
+# <game_id>_<table>_<scrape date>.csv, where a basketball-reference game id is the game
+# date, a 0 and the home team: 202510210LAL_box-GSW-q1-basic_2025-11-28.csv
+FILENAME = re.compile(
+    r"^(?P<game_id>(?P<game_date>\d{8})0(?P<home_team>[A-Z]+))_(?P<table_name>.+)_(?P<scrape_date>\d{4}-\d{2}-\d{2})\.csv$"
+)
+# box-<team whose players are in the table>-<period>-<basic|advanced>
+BOX_TABLE = re.compile(r"^box-(?P<box_team>[A-Z]+)-(?P<period>[a-z0-9]+)-(?P<stat_type>[a-z]+)$")
+
+FILTER_COLUMNS = ("game_id", "home_team", "away_team", "box_team", "period", "stat_type", "kind", "table_name")
+
+
+def parse_filename(filename):
+    """
+    Metadata of a scraped file name, or None if it doesn't follow the naming scheme.
+    kind is "box" for box scores (with box_team / period / stat_type) and the table
+    name otherwise ("pbp", "combined", ...).
+    """
+    match = FILENAME.match(filename)
+    if not match:
+        return None
+    try:
+        game_date = datetime.strptime(match["game_date"], "%Y%m%d").date()
+        scrape_date = datetime.strptime(match["scrape_date"], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+    box = BOX_TABLE.match(match["table_name"])
+    return {
+        "filename": filename,
+        "game_id": match["game_id"],
+        "game_date": game_date,
+        "home_team": match["home_team"],
+        "table_name": match["table_name"],
+        "kind": "box" if box else match["table_name"],
+        "box_team": box["box_team"] if box else None,
+        "period": box["period"] if box else None,
+        "stat_type": box["stat_type"] if box else None,
+        "scrape_date": scrape_date,
+    }
+
+
+def default_catalog_path(data_path):
+    # Next to the folder rather than in it, so the catalog's own writes don't change the
+    # folder's mtime that refresh() uses to tell whether anything was added or removed
+    data_path = os.path.abspath(data_path)
+    return f"{data_path}_catalog.sqlite"
+
+
+class FileCatalog:
+    """
+    SQLite catalog of the CSV files in a data folder, one row per file with its parsed
+    metadata, size and mtime. refresh() brings it up to date incrementally: nothing is
+    listed while the folder's mtime is unchanged, and only new names are parsed.
+    Away teams come from the game's other box scores (the game id only names the home team).
+    """
+
+    def __init__(self, data_path="./nba_data", path=None):
+        self.data_path = data_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path or default_catalog_path(data_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                filename TEXT PRIMARY KEY,
+                game_id TEXT,
+                game_date TEXT,
+                home_team TEXT,
+                away_team TEXT,
+                table_name TEXT,
+                kind TEXT NOT NULL,
+                box_team TEXT,
+                period TEXT,
+                stat_type TEXT,
+                scrape_date TEXT,
+                file_size INTEGER NOT NULL,
+                file_mtime REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_files_box ON files (box_team, stat_type, period, game_date);
+            CREATE INDEX IF NOT EXISTS ix_files_date ON files (game_date);
+            CREATE INDEX IF NOT EXISTS ix_files_game ON files (game_id);
+            CREATE TABLE IF NOT EXISTS catalog_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        self.conn.commit()
+
+    def folder_mtime(self):
+        return str(os.stat(self.data_path).st_mtime_ns)
+
+    def refresh(self, full=False):
+        """
+        Sync the catalog with the folder; returns (added, changed, removed) file counts.
+        Files rewritten in place don't change the folder's mtime - full=True re-stats every file.
+        """
+        with self.lock:
+            folder_mtime = self.folder_mtime()
+            state = self.conn.execute("SELECT value FROM catalog_state WHERE key = 'folder_mtime'").fetchone()
+            if not full and state is not None and state["value"] == folder_mtime:
+                return 0, 0, 0
+
+            known = {row["filename"]: (row["file_size"], row["file_mtime"])
+                     for row in self.conn.execute("SELECT filename, file_size, file_mtime FROM files")}
+            added = []
+            changed = []
+            seen = set()
+            with os.scandir(self.data_path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".csv") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    stat = entry.stat()
+                    if entry.name not in known:
+                        added.append(self.catalog_row(entry.name, stat))
+                    elif known[entry.name] != (stat.st_size, stat.st_mtime):
+                        changed.append((stat.st_size, stat.st_mtime, entry.name))
+            removed = [(filename,) for filename in known if filename not in seen]
+
+            self.conn.executemany(
+                "INSERT INTO files VALUES (:filename, :game_id, :game_date, :home_team, NULL, :table_name, "
+                ":kind, :box_team, :period, :stat_type, :scrape_date, :file_size, :file_mtime)",
+                added,
+            )
+            self.conn.executemany("UPDATE files SET file_size = ?, file_mtime = ? WHERE filename = ?", changed)
+            games = {row["game_id"] for row in added if row["game_id"]}
+            if removed:
+                games.update(row["game_id"] for row in self.conn.execute(
+                    f"SELECT DISTINCT game_id FROM files WHERE filename IN ({', '.join('?' * len(removed))})",
+                    [filename for filename, in removed],
+                ) if row["game_id"])
+                self.conn.executemany("DELETE FROM files WHERE filename = ?", removed)
+            self.conn.executemany(
+                """
+                UPDATE files SET away_team = (
+                    SELECT MIN(other.box_team) FROM files other
+                    WHERE other.game_id = files.game_id AND other.box_team != other.home_team
+                ) WHERE game_id = ?
+                """,
+                [(game_id,) for game_id in games],
+            )
+            self.conn.execute(
+                "INSERT INTO catalog_state VALUES ('folder_mtime', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (folder_mtime,),
+            )
+            self.conn.commit()
+            return len(added), len(changed), len(removed)
+
+    def catalog_row(self, filename, stat):
+        info = parse_filename(filename)
+        if info is None:
+            print(f"✗ Could not parse filename: {filename}")
+            info = dict.fromkeys(("game_id", "game_date", "home_team", "table_name",
+                                  "box_team", "period", "stat_type", "scrape_date"))
+            info.update(filename=filename, kind="unknown")
+        else:
+            info.update(game_date=info["game_date"].isoformat(), scrape_date=info["scrape_date"].isoformat())
+        info.update(file_size=stat.st_size, file_mtime=stat.st_mtime)
+        return info
+
+    def find(self, team=None, start=None, end=None, month=None, latest=False, **filters):
+        """
+        Catalog rows (as dicts) matching the filters, by game date. team is the box score's
+        team; start / end are inclusive game dates and month is "YYYY-MM". Any column in
+        FILTER_COLUMNS can be given as well, e.g. find(team="BOS", period="q4",
+        stat_type="basic", month="2025-11"). latest=True keeps only the most recent scrape
+        of each game's table.
+        """
+        if team is not None:
+            filters["box_team"] = team
+        unknown = set(filters) - set(FILTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown catalog filters: {', '.join(sorted(unknown))}")
+
+        where = [f"{column} = ?" for column in filters]
+        params = list(filters.values())
+        if month is not None:
+            first = datetime.strptime(month, "%Y-%m").date()
+            where.append("game_date >= ? AND game_date < ?")
+            params += [first.isoformat(), date(first.year + first.month // 12, first.month % 12 + 1, 1).isoformat()]
+        if start is not None:
+            where.append("game_date >= ?")
+            params.append(str(start))
+        if end is not None:
+            where.append("game_date <= ?")
+            params.append(str(end))
+        if latest:
+            where.append("scrape_date = (SELECT MAX(newer.scrape_date) FROM files newer "
+                         "WHERE newer.game_id = files.game_id AND newer.table_name = files.table_name)")
+
+        query = "SELECT * FROM files"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query + " ORDER BY game_date, filename", params)]
+
+    def away_teams(self):
+        """{game_id: away team} of the games with a box score of the away team"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT DISTINCT game_id, away_team FROM files WHERE away_team IS NOT NULL"))
+
+    def paths(self, **filters):
+        """Full paths of the files find(**filters) returns"""
+        return [os.path.join(self.data_path, row["filename"]) for row in self.find(**filters)]
+
+    def summary(self):
+        return dict(self.conn.execute("SELECT kind, COUNT(*) FROM files GROUP BY kind").fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    catalog = FileCatalog(os.environ.get("NBA_DATA_PATH", "./nba_data"))
+    try:
+        added, changed, removed = catalog.refresh()
+        print(f"📇 Catalog: {added} added, {changed} changed, {removed} removed - {catalog.summary()}")
+        filters = dict(arg.split("=", 1) for arg in sys.argv[1:])
+        latest = filters.pop("latest", "") in ("1", "true", "yes")
+        for row in catalog.find(latest=latest, **filters):
+            print(row["filename"])
+    finally:
+        catalog.close()
@@ -0,0 +1,135 @@
+# nba_pbp.py
+# Streaming parser for basketball-reference play-by-play CSVs (<game_id>_pbp_<date>.csv).
+# Rows are Time, <away team>, away points, Score ("away-home"), home points, <home team>;
+# quarter banners and the team header repeat through the file, and rows such as jump balls
+# or "Start of 2nd quarter" copy their description into every cell.
+import csv
+import re
+import pandas as pd
+
+PERIOD_BANNER = re.compile(r"^(\d)(?:st|nd|rd|th) (Q|OT)\b")
+CLOCK = re.compile(r"^(\d+):(\d\d)(?:\.(\d))?$")
+SCORE = re.compile(r"^(\d+)-(\d+)$")
+
+# (event type, pattern) in match order; named groups fill the event's columns
+EVENT_PATTERNS = [
+    ('shot', re.compile(
+        r"^(?P<player>.+?) (?P<result>makes|misses) (?P<value>[23])-pt (?P<detail>.+?) "
+        r"(?:from (?P<distance>\d+) ft|at (?P<rim>rim))(?: \((?:assist|block) by (?P<other>.+)\))?$")),
+    ('shot', re.compile(r"^(?P<player>.+?) (?P<result>makes|misses) (?P<detail>heave) shot$")),
+    ('free_throw', re.compile(
+        r"^(?P<player>.+?) (?P<result>makes|misses) (?:(?P<detail>[a-z ]+?) )?free throw(?: \d of \d)?$")),
+    ('rebound', re.compile(r"^(?P<detail>Offensive|Defensive) rebound by (?P<player>.+)$")),
+    ('turnover', re.compile(r"^Turnover by (?:(?P<player>.+?) )?\((?P<detail>[^;]+?)(?:; steal by (?P<other>.+))?\)$")),
+    ('foul', re.compile(r"^(?P<detail>.+? foul(?: type \d)?) by (?P<player>.+?)(?: \(drawn by (?P<other>.+)\))?$")),
+    ('substitution', re.compile(r"^(?P<player>.+?) enters the game for (?P<other>.+)$")),
+    ('jump_ball', re.compile(r"^Jump ball: (?P<player>.+?) vs\. (?P<other>.+?)(?: \((?P<detail>.+?) gains possession\))?$")),
+    ('violation', re.compile(r"^Violation by (?P<player>.+?)(?: \((?P<detail>.+)\))?$")),
+    ('replay', re.compile(r"^Instant Replay(?: \((?P<detail>.+)\))?$")),
+    ('timeout', re.compile(r"^(?P<detail>.+?) timeout$")),
+    ('period_start', re.compile(r"^Start of (?P<detail>.+)$")),
+    ('period_end', re.compile(r"^End of (?P<detail>.+)$")),
+]
+
+# Nullable columns that would otherwise turn into floats / objects in a frame
+EVENT_DTYPES = {'made': 'boolean', 'shot_value': 'Int64', 'shot_distance': 'Int64'}
+
+
+def period_name(number, kind):
+    return f"q{number}" if kind == 'Q' else f"ot{number}"
+
+
+def clock_tenths(clock):
+    """Time left in the period in tenths of a second ("11:39.0" -> 6990), None if unreadable"""
+    match = CLOCK.match(clock)
+    if not match:
+        return None
+    minutes, seconds, tenths = match.groups()
+    return (int(minutes) * 60 + int(seconds)) * 10 + int(tenths or 0)
+
+
+def classify(description):
+    """Event type and structured fields of one play description"""
+    for event_type, pattern in EVENT_PATTERNS:
+        match = pattern.match(description)
+        if match:
+            break
+    else:
+        return {'event_type': 'other', 'player': None, 'other_player': None, 'detail': None,
+                'made': None, 'shot_value': None, 'shot_distance': None}
+
+    fields = match.groupdict()
+    player = fields.get('player')
+    event = {
+        'event_type': event_type,
+        # "Team" rebounds, turnovers and violations have no player
+        'player': None if player == 'Team' else player,
+        'other_player': fields.get('other'),
+        'detail': fields.get('detail'),
+        'made': fields['result'] == 'makes' if fields.get('result') else None,
+        'shot_value': int(fields['value']) if fields.get('value') else (1 if event_type == 'free_throw' else None),
+        'shot_distance': int(fields['distance']) if fields.get('distance') else (0 if fields.get('rim') else None),
+    }
+    return event
+
+
+def parse_pbp(file_path, game_id, game_date, home_team, away_team=None):
+    """
+    Yield one typed event dict per play, in file order, reading the file a line at a time.
+    Events carry the period, clock in tenths, side/team, player(s), event type, points
+    scored and the running score after the play.
+    """
+    period = None
+    away_score = home_score = 0
+    event_no = 0
+    with open(file_path, encoding='utf-8', errors='replace', newline='') as f:
+        for cells in csv.reader(f):
+            if len(cells) < 6:
+                continue
+            clock, away_text, away_points, score, home_points, home_text = (cell.strip() for cell in cells[:6])
+
+            banner = PERIOD_BANNER.match(clock)
+            if banner:
+                period = period_name(int(banner.group(1)), banner.group(2))
+                continue
+            tenths = clock_tenths(clock)
+            if tenths is None or period is None:
+                continue  # "Time,<away>,,Score,,<home>" header rows
+
+            if away_text and away_text == home_text:
+                side, team, description = None, None, away_text
+            elif away_text:
+                side, team, description = 'AWAY', away_team, away_text
+            elif home_text:
+                side, team, description = 'HOME', home_team, home_text
+            else:
+                continue
+
+            running = SCORE.match(score)
+            if running:
+                away_score, home_score = int(running.group(1)), int(running.group(2))
+            points = away_points if side == 'AWAY' else home_points if side == 'HOME' else ''
+
+            event_no += 1
+            event = {
+                'game_id': game_id,
+                'game_date': game_date,
+                'event_no': event_no,
+                'period': period,
+                'clock_tenths': tenths,
+                'side': side,
+                'team': team,
+            }
+            event.update(classify(description))
+            event.update(
+                points=int(points) if points.lstrip('+').isdigit() else 0,
+                away_score=away_score,
+                home_score=home_score,
+                description=description,
+            )
+            yield event
+
+
+def events_frame(events):
+    """DataFrame of parsed events with the nba_pbp_event column types"""
+    return pd.DataFrame.from_records(events).astype(EVENT_DTYPES)
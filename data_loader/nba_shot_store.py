@@ -0,0 +1,228 @@
+# nba_shot_store.py
+# Column store of the scraped shot charts (<game_id>_shots_<date>.csv): one .npy file per
+# column, loaded memory-mapped, with each shot's court zone and grid cell worked out at
+# build time. Zone and heatmap queries are then bincounts over array slices.
+#
+#   python nba_shot_store.py [player id or name] [last N games]
+import os
+import sys
+import numpy as np
+import pandas as pd
+from nba_file_catalog import FileCatalog
+
+# basketball-reference draws the half court at 10 px per foot, baseline at the top and the
+# basket 5.25 ft below it; markers are positioned by their top-left corner
+PIXELS_PER_FOOT = 10
+HOOP_X = 250
+HOOP_Y = 52
+COURT_FEET = (50, 47)  # width, length of a half court
+GRID_FEET = 2
+GRID_SHAPE = (COURT_FEET[1] // GRID_FEET + 1, COURT_FEET[0] // GRID_FEET)  # rows, columns
+
+ZONES = ('restricted_area', 'paint', 'mid_range', 'corner_3', 'above_break_3', 'backcourt')
+PERIOD_NUMBERS = {**{f"q{n}": n for n in range(1, 5)}, **{f"ot{n}": 4 + n for n in range(1, 7)}}
+
+# Per-shot columns and their dtypes; shots are sorted by player, then game (= date) order
+COLUMNS = {
+    'player': 'int32',        # index into players.npy
+    'game': 'int32',          # index into games.npy, which is in date order
+    'team': 'int16',          # index into teams.npy
+    'period': 'int8',         # 1-4, overtimes 5+
+    'clock_tenths': 'int16',  # time left in the period
+    'x': 'int16',
+    'y': 'int16',
+    'distance': 'int16',      # feet, as reported
+    'shot_value': 'int8',
+    'made': 'bool',
+    'zone': 'int8',           # index into ZONES
+    'cell': 'int16',          # row * GRID_SHAPE[1] + column of the GRID_FEET grid
+}
+
+
+def default_store_path(data_path):
+    # Next to the data folder, like the file catalog
+    return f"{os.path.abspath(data_path)}_shots"
+
+
+def clock_tenths(clock):
+    """"11:39.0" strings -> tenths of a second left (parsed once per distinct clock)"""
+    codes, clocks = pd.factorize(clock.astype(str))
+    if not len(clocks):  # .str.partition of nothing has no columns
+        return np.zeros(0, dtype='int16')
+    parts = pd.Series(clocks).str.partition(':')
+    tenths = pd.to_numeric(parts[0]) * 600 + (pd.to_numeric(parts[2]) * 10).round()
+    return tenths.to_numpy(dtype='int16')[codes]
+
+
+def court_zones(x, y, distance, shot_value):
+    """Zone (index into ZONES) and grid cell of each shot from its chart position"""
+    feet_x = (x - HOOP_X) / PIXELS_PER_FOOT
+    from_baseline = y / PIXELS_PER_FOOT
+
+    zone = np.full(len(x), ZONES.index('mid_range'), dtype='int8')
+    zone[(np.abs(feet_x) <= 8) & (from_baseline <= 19)] = ZONES.index('paint')
+    zone[distance <= 4] = ZONES.index('restricted_area')
+    three = shot_value == 3
+    zone[three] = ZONES.index('above_break_3')
+    zone[three & (from_baseline <= 14)] = ZONES.index('corner_3')
+    zone[distance > COURT_FEET[1] - 5] = ZONES.index('backcourt')
+
+    row = np.clip(y // (PIXELS_PER_FOOT * GRID_FEET), 0, GRID_SHAPE[0] - 1)
+    column = np.clip(x // (PIXELS_PER_FOOT * GRID_FEET), 0, GRID_SHAPE[1] - 1)
+    return zone, (row * GRID_SHAPE[1] + column).astype('int16')
+
+
+def read_shot_files(rows, data_path):
+    """One frame of every shot in the catalog rows' files, with their game id / date"""
+    frames = []
+    for row in rows:
+        try:
+            df = pd.read_csv(os.path.join(data_path, row['filename']))
+        except Exception as e:
+            print(f"✗ Could not read {row['filename']}: {e}")
+            continue
+        df['game_id'] = row['game_id']
+        df['game_date'] = row['game_date']
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def build_store(data_path="./nba_data", path=None):
+    """
+    (Re)build the shot store from the latest scrape of every game's shot chart and return
+    it opened. A season is one file per game, so a full rebuild stays cheap.
+    """
+    path = path or default_store_path(data_path)
+    catalog = FileCatalog(data_path)
+    try:
+        catalog.refresh()
+        rows = catalog.find(kind='shots', latest=True)
+    finally:
+        catalog.close()
+
+    shots = read_shot_files(rows, data_path)
+    if shots is None:
+        print("⚠ No shot charts to store")
+        shots = pd.DataFrame(columns=['player_id', 'player', 'team', 'game_id', 'game_date', 'period',
+                                      'clock', 'x', 'y', 'distance', 'shot_value', 'made'])
+    shots = shots.dropna(subset=['player_id', 'x', 'y'])
+    # Players are keyed by their basketball-reference id; names can repeat
+    shots['player_id'] = shots['player_id'].astype(str)
+    shots['game_id'] = shots['game_id'].astype(str)
+
+    # Game ids start with the date, so sorted ids are in date order
+    game, games = pd.factorize(shots['game_id'], sort=True)
+    player, players = pd.factorize(shots['player_id'], sort=True)
+    team, teams = pd.factorize(shots['team'].astype(str), sort=True)
+    game_dates = shots.groupby('game_id')['game_date'].first().reindex(games)
+    games, players, teams = (np.asarray(values, dtype=str) for values in (games, players, teams))
+    x = shots['x'].to_numpy(dtype='int16')
+    y = shots['y'].to_numpy(dtype='int16')
+    distance = shots['distance'].to_numpy(dtype='int16')
+    shot_value = shots['shot_value'].to_numpy(dtype='int8')
+    zone, cell = court_zones(x, y, distance, shot_value)
+    columns = {
+        'player': player.astype('int32'),
+        'game': game.astype('int32'),
+        'team': team.astype('int16'),
+        'period': shots['period'].map(PERIOD_NUMBERS).to_numpy(dtype='int8'),
+        'clock_tenths': clock_tenths(shots['clock']),
+        'x': x,
+        'y': y,
+        'distance': distance,
+        'shot_value': shot_value,
+        'made': shots['made'].astype(str).str.lower().eq('true').to_numpy(),
+        'zone': zone,
+        'cell': cell,
+    }
+    order = np.lexsort((-columns['clock_tenths'], columns['period'], columns['game'], columns['player']))
+
+    names = shots.groupby('player_id')['player'].last()
+    os.makedirs(path, exist_ok=True)
+    for name, dtype in COLUMNS.items():
+        np.save(os.path.join(path, f"{name}.npy"), columns[name][order].astype(dtype))
+    np.save(os.path.join(path, "players.npy"), players)
+    np.save(os.path.join(path, "player_names.npy"), names.reindex(players).to_numpy(dtype=str))
+    np.save(os.path.join(path, "games.npy"), games)
+    np.save(os.path.join(path, "game_dates.npy"), game_dates.to_numpy(dtype='datetime64[D]'))
+    np.save(os.path.join(path, "teams.npy"), teams)
+    # CSR index: player i's shots are rows player_offsets[i]:player_offsets[i + 1]
+    np.save(os.path.join(path, "player_offsets.npy"),
+            np.searchsorted(columns['player'][order], np.arange(len(players) + 1)).astype('int64'))
+    print(f"🏀 Stored {len(order)} shots of {len(players)} players in {len(games)} games")
+    return ShotStore(path)
+
+
+class ShotStore:
+    """Memory-mapped shot columns (see COLUMNS) with per-player offsets and lookup tables"""
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in COLUMNS}
+        for name in ('players', 'player_names', 'games', 'game_dates', 'teams', 'player_offsets'):
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy")))
+
+    def __len__(self):
+        return len(self.columns['made'])
+
+    def player_index(self, player):
+        """Position of a player given by basketball-reference id or full name"""
+        for names in (self.players, self.player_names):
+            found = np.flatnonzero(names == player)
+            if len(found):
+                return int(found[0])
+        raise KeyError(f"No shots stored for {player}")
+
+    def player_rows(self, player, last_games=None):
+        """Row slice of a player's shots, limited to their last `last_games` games"""
+        i = self.player_index(player)
+        start, end = self.player_offsets[i], self.player_offsets[i + 1]
+        if last_games:
+            games = self.columns['game'][start:end]
+            # Sorted by game within the player, so the last N games are a suffix
+            first_game = np.unique(games)[-last_games:][0]
+            start += int(np.searchsorted(games, first_game))
+        return slice(start, end)
+
+    def selection(self, start=None, end=None, team=None, period=None):
+        """Boolean mask over all shots for a game date range / team / period"""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None or end is not None:
+            dates = self.game_dates[self.columns['game']]
+            if start is not None:
+                mask &= dates >= np.datetime64(start, 'D')
+            if end is not None:
+                mask &= dates <= np.datetime64(end, 'D')
+        if team is not None:
+            codes = np.flatnonzero(self.teams == team)
+            mask &= (self.columns['team'] == codes[0]) if len(codes) else False
+        if period is not None:
+            mask &= self.columns['period'] == PERIOD_NUMBERS[period]
+        return mask
+
+    def zone_make_rate(self, player, last_games=None):
+        """Attempts, makes and make rate by zone for one player (optionally their last N games)"""
+        rows = self.player_rows(player, last_games)
+        zone = self.columns['zone'][rows]
+        attempts = np.bincount(zone, minlength=len(ZONES))
+        makes = np.bincount(zone, weights=self.columns['made'][rows], minlength=len(ZONES)).astype('int64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = np.where(attempts > 0, makes / attempts, np.nan)
+        return pd.DataFrame({'zone': ZONES, 'attempts': attempts, 'makes': makes, 'make_rate': rate})
+
+    def heatmap(self, mask=None, made=None):
+        """GRID_SHAPE array of shot counts (made=True / False for makes / misses only)"""
+        cell = self.columns['cell']
+        if made is not None:
+            only = self.columns['made'] == made
+            mask = only if mask is None else mask & only
+        if mask is not None:
+            cell = cell[mask]
+        return np.bincount(cell, minlength=GRID_SHAPE[0] * GRID_SHAPE[1]).reshape(GRID_SHAPE)
+
+
+if __name__ == "__main__":
+    store = build_store(os.environ.get("NBA_DATA_PATH", "./nba_data"))
+    if len(sys.argv) > 1:
+        last_games = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        print(store.zone_make_rate(sys.argv[1], last_games).to_string(index=False))
@@ -0,0 +1,216 @@
+# nba_arrow.py
+# Read query results as Arrow record batches instead of through pd.read_sql, which builds
+# a Python object per value before pandas turns rows into columns. On Postgres the result
+# is streamed with COPY (...) TO STDOUT and decoded by Arrow's multithreaded CSV reader,
+# with column types taken from the query's result description; other engines fall back
+# to chunked pd.read_sql, cast to one schema so every batch (and an empty result) has
+# the same column types.
+#
+#   table = read_arrow(engine, "SELECT * FROM nba_game_basic WHERE period = :period", period="game")
+#   for frame in iter_frames(engine, "SELECT * FROM nba_pbp_event", batch_rows=200_000):
+#       ...
+import io
+import tempfile
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from sqlalchemy import bindparam, text
+
+# Postgres type OIDs -> Arrow types; anything else (text, varchar, enums, ...) is read as string
+PG_TYPES = {
+    16: pa.bool_(),
+    20: pa.int64(),
+    21: pa.int16(),
+    23: pa.int32(),
+    700: pa.float32(),
+    701: pa.float64(),
+    1700: pa.float64(),  # numeric
+    1082: pa.date32(),
+    1114: pa.timestamp('us'),
+    1184: pa.timestamp('us', tz='UTC'),
+}
+
+# Computed columns have no declared type on SQLite; they are typed from the first chunk's
+# values, or as this when it has none
+UNTYPED = pa.float64()
+
+# Rough width of one CSV value, to turn batch_rows into the reader's block size in bytes
+BYTES_PER_VALUE = 8
+
+
+def bound_statement(sql, params):
+    """text() of a :name-style query with its values bound; list values expand to IN lists"""
+    return text(sql).bindparams(*[bindparam(name, value, expanding=isinstance(value, (list, tuple)))
+                                  for name, value in params.items()])
+
+
+def compile_query(connection, sql, params):
+    """SQL text with the parameters rendered as literals (COPY takes no bind parameters)"""
+    compiled = bound_statement(sql, params).compile(dialect=connection.dialect,
+                                                    compile_kwargs={"literal_binds": True})
+    return str(compiled)
+
+
+def result_schema(dbapi_connection, query):
+    """Arrow schema of a query's result, from running it with LIMIT 0"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM ({query}) AS result LIMIT 0")
+        return pa.schema([(column[0], PG_TYPES.get(column[1], pa.string())) for column in cursor.description])
+    finally:
+        cursor.close()
+
+
+class CopyReader(io.RawIOBase):
+    """File-like view of psycopg 3 COPY output chunks, for Arrow's CSV reader to pull from"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        # COPY sends about a row per chunk, so fill the whole buffer rather than return each one
+        size = 0
+        while size < len(buffer):
+            if not len(self.pending):
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    break
+                self.pending = memoryview(chunk)
+            taken = min(len(buffer) - size, len(self.pending))
+            buffer[size:size + taken] = self.pending[:taken]
+            self.pending = self.pending[taken:]
+            size += taken
+        return size
+
+
+def csv_batches(source, schema, batch_rows):
+    """Decode COPY ... (FORMAT csv) output into record batches of `schema`"""
+    try:
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(column_names=schema.names,
+                                            block_size=max(1 << 16, batch_rows * BYTES_PER_VALUE * len(schema))),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            # COPY writes NULL unquoted and empty strings as "", which keeps them apart
+            convert_options=pa_csv.ConvertOptions(column_types=schema, strings_can_be_null=True,
+                                                  quoted_strings_can_be_null=False,
+                                                  true_values=['t'], false_values=['f']),
+        )
+    except pa.ArrowInvalid as e:
+        if "Empty CSV" not in str(e):
+            raise
+        # No rows: still hand back the columns
+        yield pa.RecordBatch.from_pylist([], schema=schema)
+        return
+    for batch in reader:
+        yield batch
+
+
+def postgres_batches(connection, sql, params, batch_rows):
+    dbapi_connection = connection.connection.dbapi_connection
+    query = compile_query(connection, sql, params)
+    schema = result_schema(dbapi_connection, query)
+    copy_sql = f"COPY ({query}) TO STDOUT WITH (FORMAT csv)"
+
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2 only pushes COPY output into a file, so it is spooled (to disk past 64 MB)
+            with tempfile.SpooledTemporaryFile(max_size=64 << 20) as spool:
+                cursor.copy_expert(copy_sql, spool)
+                spool.seek(0)
+                yield from csv_batches(spool, schema, batch_rows)
+        else:
+            with cursor.copy(copy_sql) as copy:
+                yield from csv_batches(CopyReader(copy), schema, batch_rows)
+    finally:
+        cursor.close()
+
+
+def sqlite_type(declared):
+    """Arrow type of a SQLite declared column type (by its affinity rules), None if untyped"""
+    declared = declared.upper()
+    if not declared:
+        return None
+    if 'INT' in declared:
+        return pa.int64()
+    if 'BOOL' in declared:
+        return pa.bool_()
+    if 'DATETIME' in declared or 'TIMESTAMP' in declared:
+        return pa.timestamp('us')
+    if 'DATE' in declared:
+        return pa.date32()
+    if any(name in declared for name in ('CHAR', 'CLOB', 'TEXT')):
+        return pa.string()
+    return pa.float64()
+
+
+def declared_types(connection, sql, params):
+    """{column: Arrow type or None} of a query's result, from its declared column types on SQLite"""
+    if connection.dialect.name != 'sqlite':
+        return None
+    connection.exec_driver_sql(f"CREATE TEMP VIEW arrow_result AS {compile_query(connection, sql, params)}")
+    try:
+        columns = connection.exec_driver_sql("PRAGMA temp.table_info(arrow_result)").fetchall()
+    finally:
+        connection.exec_driver_sql("DROP VIEW temp.arrow_result")
+    return {column[1]: sqlite_type(column[2]) for column in columns}
+
+
+def fallback_batches(connection, sql, params, batch_rows):
+    """Chunks of pd.read_sql as record batches of one schema"""
+    types = declared_types(connection, sql, params)
+    schema = None
+    for chunk in pd.read_sql(bound_statement(sql, params), connection, chunksize=batch_rows):
+        batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+        if schema is None:
+            fields = []
+            for field in batch.schema:
+                declared = (types or {}).get(field.name)
+                inferred = UNTYPED if pa.types.is_null(field.type) else field.type
+                fields.append(pa.field(field.name, declared or inferred))
+            schema = pa.schema(fields)
+        yield batch.cast(schema)
+    if schema is None:
+        # No rows: still hand back the columns, typed
+        names = list(types) if types is not None else list(pd.read_sql(bound_statement(sql, params), connection).columns)
+        yield pa.RecordBatch.from_pylist([], schema=pa.schema([(name, (types or {}).get(name) or UNTYPED)
+                                                               for name in names]))
+
+
+def arrow_batches(engine, sql, batch_rows=100_000, **params):
+    """
+    Generator of pyarrow RecordBatches of a :name-style SQL query (list parameters expand
+    to IN lists). Batches hold about batch_rows rows, all of one schema; only one is
+    decoded at a time, and an empty result is one empty batch.
+    """
+    with engine.connect() as connection:
+        if connection.dialect.name == 'postgresql':
+            yield from postgres_batches(connection, sql, params, batch_rows)
+            return
+        yield from fallback_batches(connection, sql, params, batch_rows)
+
+
+def read_arrow(engine, sql, **params):
+    """Whole result of a query as a pyarrow Table"""
+    return pa.Table.from_batches(list(arrow_batches(engine, sql, **params)))
+
+
+def to_frame(table):
+    # Arrow-backed columns, so pandas shares the Arrow buffers instead of converting them
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def read_frame(engine, sql, **params):
+    """Whole result of a query as a DataFrame with Arrow-backed columns"""
+    return to_frame(read_arrow(engine, sql, **params))
+
+
+def iter_frames(engine, sql, batch_rows=100_000, **params):
+    """DataFrames of about batch_rows rows each, for results too large to hold at once"""
+    for batch in arrow_batches(engine, sql, batch_rows=batch_rows, **params):
+        yield to_frame(pa.Table.from_batches([batch]))
@@ -0,0 +1,178 @@
+# nba_backtest.py
+# Backtest of the over/under calls of nba_predictions. The games are replayed a game day
+# at a time through RollingForm: each day's games are called from the windows as they
+# stood before that day, then added. The form behind every player-game is kept, so model
+# variants and line grids are scored afterwards as array operations over all of them,
+# sharded by stat and variant across a process pool:
+#
+#   games = replay(DATABASE_URL, start=date(2025, 11, 1))
+#   results = backtest(games)     # one row per stat, variant and line
+#   results = backtest(games, lines=LINE_OFFSETS, relative=True)
+#
+#   python nba_backtest.py [first date]
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+import pandas as pd
+from nba_arrow import read_frame
+from nba_predictions import (RollingForm, GAMES_SQL, STATS, WINDOW, LINES, BLEND, CONFIDENCE_PER_SD,
+                             predicted_values, confidence)
+
+# Lines scored for each stat, the same for every player
+LINE_GRID = {
+    'pts': np.arange(4.5, 35, 1.0),
+    'trb': np.arange(1.5, 14, 1.0),
+    'ast': np.arange(0.5, 12, 1.0),
+    'stl': np.arange(0.5, 3, 1.0),
+    'blk': np.arange(0.5, 3, 1.0),
+    'fg3': np.arange(0.5, 6, 1.0),
+    'tov': np.arange(0.5, 5, 1.0),
+}
+# Lines scored for each stat relative to each player's book line (see book_lines)
+LINE_OFFSETS = {stat: np.arange(-2, 3, 1.0) for stat in STATS}
+# Weights of the last 3 / last 5 / whole window averages tried
+BLENDS = {'board': BLEND, 'recent': (0.7, 0.3, 0.0), 'steady': (0.2, 0.3, 0.5)}
+# Only calls at least this confident are bet
+MIN_CONFIDENCE = (40, 60, 80)
+# Units won by a winning bet at standard -110 odds; a losing one costs 1
+WIN_UNITS = 100 / 110
+
+FORM = ('games_analyzed', 'avg_last_5', 'avg_last_10', 'last_3_avg', 'trend', 'consistency')
+
+
+def variant_grid(blends=BLENDS, min_confidence=MIN_CONFIDENCE, per_sd=(CONFIDENCE_PER_SD,)):
+    """Model variants: every combination of blend, confidence slope and confidence cut-off"""
+    return [{'name': f"{name}/{slope}/{cut}", 'blend': blends[name], 'per_sd': slope, 'min_confidence': cut}
+            for name, slope, cut in product(blends, per_sd, min_confidence)]
+
+
+def book_lines(average):
+    """Where a book would set a player's line: on the half point just above their average"""
+    return np.floor(average) + 0.5
+
+
+def replay(database_url, start=None, end=None, stats=STATS, window=WINDOW):
+    """
+    Form of each player-game from `start` to `end` as of the game day before, with what
+    the player actually put up: {'player', 'game_date': (games,) arrays, 'actual' and the
+    FORM names: (games, stats) arrays with a column per name in 'stats'}. Earlier games
+    only fill the windows.
+    """
+    form = RollingForm(database_url, stats=stats, window=window, load=False)
+    games = read_frame(form.engine, GAMES_SQL.format(stats=', '.join(stats)), since=None)
+    dates = pd.to_datetime(games['game_date']).to_numpy(dtype='datetime64[D]')
+    if end is not None:
+        games, dates = games[dates <= np.datetime64(end, 'D')], dates[dates <= np.datetime64(end, 'D')]
+    order = np.argsort(dates, kind='stable')
+    games, dates = games.iloc[order], dates[order]
+    days, starts = np.unique(dates, return_index=True)
+    first = np.datetime64(start, 'D') if start is not None else None
+
+    called = []
+    for day, begin, stop in zip(days, starts, list(starts[1:]) + [len(dates)]):
+        today = games.iloc[begin:stop]
+        if first is None or day >= first:
+            players = form.players.get_indexer(today['player'])
+            seen = players >= 0
+            day_form = form.rolling(players[seen])
+            called.append({
+                'player': today['player'].to_numpy(dtype=object)[seen],
+                'game_date': dates[begin:stop][seen],
+                'actual': today[list(stats)].to_numpy(dtype='float64', na_value=np.nan)[seen],
+                **{name: day_form[name] for name in FORM},
+            })
+        form.add_games(today)
+
+    if not called:
+        return {'stats': list(stats), 'player': np.empty(0, dtype=object),
+                'game_date': np.empty(0, dtype='datetime64[D]'),
+                **{name: np.empty((0, len(stats))) for name in ('actual',) + FORM}}
+    return {'stats': list(stats), **{name: np.concatenate([day[name] for day in called]) for name in called[0]}}
+
+
+def score_stat(form, actual, lines, variants, min_games, relative=False):
+    """
+    Bets, wins and pushes of each variant on each line of one stat, from its (games,)
+    form arrays and actual values. Relative lines are offsets from each game's book line.
+    """
+    valid = (form['games_analyzed'] >= min_games) & ~np.isnan(actual)
+    form = {name: values[valid] for name, values in form.items()}
+    actual = actual[valid][:, None]
+    grid = np.asarray(lines, dtype='float64')
+    lines = grid[None, :]
+    if relative:
+        lines = np.maximum(book_lines(form['avg_last_10'])[:, None] + lines, 0.5)
+    went_over = actual > lines
+    went_under = actual < lines
+
+    results = []
+    for variant in variants:
+        predicted = predicted_values(form['last_3_avg'], form['avg_last_5'], form['avg_last_10'], form['trend'],
+                                     variant['blend'])[:, None]
+        over = predicted > lines
+        bet = confidence(predicted, lines, form['consistency'][:, None], variant['per_sd']) >= variant['min_confidence']
+        results.append(pd.DataFrame({
+            'variant': variant['name'],
+            'line': grid,
+            'bets': bet.sum(axis=0),
+            'overs': (bet & over).sum(axis=0),
+            'wins': (bet & np.where(over, went_over, went_under)).sum(axis=0),
+            'pushes': (bet & ~went_over & ~went_under).sum(axis=0),
+        }))
+    return pd.concat(results, ignore_index=True)
+
+
+def backtest(games, variants=None, lines=LINE_GRID, relative=False, min_games=3, workers=None,
+             variants_per_task=3):
+    """
+    Score replayed games (see replay) for every variant and line: one row per stat,
+    variant and line with bets, wins, losses, pushes, hit rate and units / ROI at -110.
+    With relative=True `lines` are offsets from each player-game's book line.
+    Stats and chunks of variants are scored in parallel (workers=1 scores in process).
+    """
+    variants = variant_grid() if variants is None else variants
+    workers = workers or os.cpu_count() or 1
+    chunks = [variants[i:i + variants_per_task] for i in range(0, len(variants), variants_per_task)]
+    tasks = []
+    for column, stat in enumerate(games['stats']):
+        if stat not in lines:
+            continue
+        # Each task gets only its stat's columns
+        form = {name: games[name][:, column] for name in FORM}
+        tasks += [(stat, (form, games['actual'][:, column], lines[stat], chunk, min_games, relative)) for chunk in chunks]
+
+    if workers == 1:
+        scored = [score_stat(*args) for _, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(score_stat, *args) for _, args in tasks]
+            scored = [future.result() for future in futures]
+    if not scored:
+        return pd.DataFrame(columns=['stat', 'variant', 'line', 'bets', 'overs', 'wins', 'pushes', 'losses',
+                                     'hit_rate', 'units', 'roi'])
+
+    results = pd.concat([frame.assign(stat=stat) for (stat, _), frame in zip(tasks, scored)], ignore_index=True)
+    results['losses'] = results['bets'] - results['wins'] - results['pushes']
+    decided = results['wins'] + results['losses']
+    results['hit_rate'] = results['wins'] / decided.where(decided > 0)
+    results['units'] = results['wins'] * WIN_UNITS - results['losses']
+    results['roi'] = results['units'] / results['bets'].where(results['bets'] > 0)
+    return results[['stat', 'variant', 'line', 'bets', 'overs', 'wins', 'pushes', 'losses', 'hit_rate', 'units',
+                    'roi']]
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    games = replay(os.environ["DATABASE_URL"], start=sys.argv[1] if len(sys.argv) > 1 else None)
+    replayed = time.perf_counter()
+    results = backtest(games)
+    book = backtest(games, lines=LINE_OFFSETS, relative=True)
+    print(f"⏱ Replayed {len(games['player'])} player-games in {replayed - started:.1f}s, "
+          f"scored {len(results) + len(book)} stat / variant / line results in {time.perf_counter() - replayed:.1f}s")
+
+    # The board's fixed lines, then lines set at each player's book line
+    print(results[results['line'] == results['stat'].map(LINES)].sort_values(['stat', 'variant']).to_string(index=False))
+    print(book[book['line'] == 0].sort_values(['stat', 'variant']).to_string(index=False))
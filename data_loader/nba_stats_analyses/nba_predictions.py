@@ -0,0 +1,232 @@
+# nba_predictions.py
+# Rolling form of every player behind the over/under prop board
+# (nba_stat_over_under_predictions.csv). Each player's last WINDOW games are held as one
+# row of a (players, WINDOW, stats) array, so window averages, trends and spreads are
+# NumPy reductions over every player and stat at once, and a new game day only shifts
+# the games of those who played into their rows instead of re-reading the season:
+#
+#   form = RollingForm(DATABASE_URL)     # reads the last WINDOW games of every player
+#   board = form.prop_board()            # one row per active player and stat with a line
+#   form.update()                        # after the loader adds a game day
+#
+#   python nba_predictions.py [output.csv]
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, Engine
+from nba_arrow import read_frame
+
+STATS = ('pts', 'trb', 'ast', 'stl', 'blk', 'fg3', 'tov')
+WINDOW = 10
+
+# Default line of each stat, for players without a book line of their own
+LINES = {'pts': 25.5, 'trb': 8.5, 'ast': 6.5, 'stl': 1.5, 'blk': 1.5, 'fg3': 2.5, 'tov': 2.5}
+
+# predicted_value = weighted last 3 / last 5 / whole window averages + one more game of trend
+BLEND = (0.5, 0.3, 0.2)
+# Hot / Cold when the last 3 games average this many standard deviations off the last 10
+FORM_SPREAD = 0.5
+# Confidence grows from the floor by CONFIDENCE_PER_SD per standard deviation between
+# the prediction and the line, up to the cap
+CONFIDENCE_RANGE = (40, 95)
+CONFIDENCE_PER_SD = 30
+# Players on the board need a game within this many days of the latest one held
+ACTIVE_DAYS = 14
+
+# Games played ('game' period rows with minutes)
+GAMES_SQL = """
+SELECT player, team, game_date, {stats}
+FROM nba_game_basic
+WHERE period = 'game' AND mp_seconds IS NOT NULL AND (:since IS NULL OR game_date >= :since)
+"""
+LAST_GAMES_SQL = """
+SELECT player, team, game_date, {stats} FROM (
+    SELECT player, team, game_date, {stats},
+           ROW_NUMBER() OVER (PARTITION BY player ORDER BY game_date DESC) AS back
+    FROM nba_game_basic
+    WHERE period = 'game' AND mp_seconds IS NOT NULL AND (:since IS NULL OR game_date >= :since)
+) AS games
+WHERE back <= :window
+"""
+
+
+def predicted_values(last_3, avg_5, avg_10, trend, blend=BLEND):
+    """Next game of a stat from its rolling averages and trend (arrays or Series)"""
+    return np.maximum(blend[0] * last_3 + blend[1] * avg_5 + blend[2] * avg_10 + trend, 0)
+
+
+def confidence(predicted, line, consistency, per_sd=CONFIDENCE_PER_SD):
+    """Confidence (CONFIDENCE_RANGE) in the call on a line, as an int array broadcast over the inputs"""
+    predicted, line, consistency = (np.asarray(values, dtype='float64') for values in (predicted, line, consistency))
+    distance = np.abs(predicted - line)
+    # No spread: every recent game was on the predicted side
+    sds = np.divide(distance, consistency, out=np.where(distance > 0, np.inf, 0.0),
+                    where=consistency > 0)
+    low, high = CONFIDENCE_RANGE
+    return np.clip(low + per_sd * sds, low, high).round().astype('int64')
+
+
+class RollingForm:
+    """
+    Last `window` games of each player: values[player, slot, stat] with the latest game in
+    the last slot and NaN before a player's first game, dates[player, slot] alike.
+    """
+
+    def __init__(self, database_url, stats=STATS, window=WINDOW, since=None, load=True):
+        # An Engine instead of a URL shares its connection pool
+        self.engine = database_url if isinstance(database_url, Engine) else create_engine(database_url)
+        self.stats = list(stats)
+        self.window = window
+        self.clear()
+        if load:
+            self.load(since)
+
+    def clear(self):
+        self.players = pd.Index([], dtype=object)
+        self.teams = np.empty(0, dtype=object)
+        self.values = np.full((0, self.window, len(self.stats)), np.nan)
+        self.dates = np.full((0, self.window), np.datetime64('NaT'), dtype='datetime64[D]')
+
+    def load(self, since=None):
+        """Read the last `window` games of every player (who played since `since` if given)"""
+        self.clear()
+        sql = LAST_GAMES_SQL.format(stats=', '.join(self.stats))
+        self.add_games(read_frame(self.engine, sql, since=since, window=self.window))
+
+    def latest(self):
+        """Latest game date held, or None"""
+        latest = self.dates[:, -1].max() if len(self.players) else np.datetime64('NaT')
+        return None if np.isnat(latest) else latest.astype(object)
+
+    def update(self):
+        """
+        Add the games loaded since the last update. That game day is read again for games
+        loaded late; games of earlier days reloaded since take a load() to pick up.
+        """
+        since = self.latest()
+        if since is None:
+            return self.load()
+        self.add_games(read_frame(self.engine, GAMES_SQL.format(stats=', '.join(self.stats)), since=since))
+
+    def add_games(self, games):
+        """Shift a frame of games (player, team, game_date and the stats) into the windows"""
+        dates = pd.to_datetime(games['game_date']).to_numpy(dtype='datetime64[D]')
+        new_players = pd.Index(games['player'].unique()).difference(self.players)
+        if len(new_players):
+            self.players = self.players.append(new_players)
+            self.teams = np.concatenate([self.teams, np.full(len(new_players), None, dtype=object)])
+            self.values = np.concatenate([self.values, np.full((len(new_players),) + self.values.shape[1:], np.nan)])
+            self.dates = np.concatenate([self.dates, np.full((len(new_players), self.window), np.datetime64('NaT'),
+                                                             dtype='datetime64[D]')])
+
+        # A player plays once a day, so only games after their latest one are new
+        player = self.players.get_indexer(games['player'])
+        last = self.dates[player, -1]
+        new = np.isnat(last) | (dates > last)
+        player, dates = player[new], dates[new]
+        values = games.loc[new, self.stats].to_numpy(dtype='float64', na_value=np.nan)
+        teams = games.loc[new, 'team'].to_numpy(dtype=object)
+        if not len(player):
+            return
+
+        # Games back from each player's latest: 0 is the newest
+        order = np.lexsort((dates, player))
+        player, dates, values, teams = player[order], dates[order], values[order], teams[order]
+        counts = np.bincount(player, minlength=len(self.players))
+        back = np.repeat(np.cumsum(counts), counts) - 1 - np.arange(len(player))
+
+        # Move each player's held games left by their number of new ones, then put those in
+        rows = np.arange(len(self.players))[:, None]
+        source = np.arange(self.window)[None, :] + np.minimum(counts, self.window)[:, None]
+        held = source < self.window
+        source = np.minimum(source, self.window - 1)
+        self.values = np.where(held[..., None], self.values[rows, source], np.nan)
+        self.dates = np.where(held, self.dates[rows, source], np.datetime64('NaT'))
+
+        kept = back < self.window
+        slot = self.window - 1 - back[kept]
+        self.values[player[kept], slot] = values[kept]
+        self.dates[player[kept], slot] = dates[kept]
+        newest = back == 0
+        self.teams[player[newest]] = teams[newest]
+
+    def rolling(self, players=None):
+        """
+        Window averages, trend, spread and form of `players` (positions, all by default):
+        {name: (players, stats) array}
+        """
+        held = self.values if players is None else self.values[players]
+        played = ~np.isnan(held)
+        values = np.where(played, held, 0)
+        n = played.sum(axis=1)
+        total = values.sum(axis=1)
+
+        def mean(games):
+            count = played[:, -games:].sum(axis=1)
+            return np.divide(values[:, -games:].sum(axis=1), count, out=np.full(total.shape, np.nan), where=count > 0)
+
+        # Least squares slope over game order: change per game
+        x = np.arange(self.window, dtype='float64')[None, :, None]
+        sum_x = (played * x).sum(axis=1)
+        denominator = n * (played * x * x).sum(axis=1) - sum_x ** 2
+        trend = np.divide(n * (values * x).sum(axis=1) - sum_x * total, denominator,
+                          out=np.zeros(total.shape), where=denominator > 0)
+
+        squares = np.maximum((values ** 2).sum(axis=1) - total ** 2 / np.maximum(n, 1), 0)
+        consistency = np.sqrt(np.divide(squares, n - 1, out=np.zeros(total.shape), where=n > 1))
+
+        last_3, avg_5, avg_10 = mean(3), mean(5), mean(self.window)
+        spread = last_3 - avg_10
+        recent_form = np.where(spread > FORM_SPREAD * consistency, 'Hot',
+                               np.where(spread < -FORM_SPREAD * consistency, 'Cold', 'Stable'))
+        recent_form[consistency == 0] = 'Stable'
+        return {'games_analyzed': n, 'avg_last_5': avg_5, 'avg_last_10': avg_10, 'last_3_avg': last_3,
+                'trend': trend, 'consistency': consistency, 'recent_form': recent_form}
+
+    def form(self, min_games=3):
+        """One row per player and stat with their rolling averages, trend, spread and form"""
+        rolling = self.rolling()
+        stats = len(self.stats)
+        form = pd.DataFrame({
+            'player': np.repeat(self.players.to_numpy(dtype=object), stats),
+            'team': np.repeat(self.teams, stats),
+            'stat': np.tile(self.stats, len(self.players)),
+            'last_game': np.repeat(self.dates[:, -1], stats),
+            **{name: values.ravel() for name, values in rolling.items()},
+        })
+        return form[form['games_analyzed'] >= min_games].reset_index(drop=True)
+
+    def prop_board(self, lines=None, min_games=3, active_days=ACTIVE_DAYS):
+        """
+        Over/under call per active player and stat. `lines` is {stat: line} for every
+        player (LINES by default) or a frame of player / stat / line book lines.
+        """
+        form = self.form(min_games)
+        latest = self.latest()
+        if active_days is not None and latest is not None:
+            form = form[form['last_game'] >= np.datetime64(latest) - np.timedelta64(active_days, 'D')]
+        lines = LINES if lines is None else lines
+        if isinstance(lines, pd.DataFrame):
+            board = form.merge(lines[['player', 'stat', 'line']], on=['player', 'stat'])
+        else:
+            board = form[form['stat'].isin(list(lines))].copy()
+            board['line'] = board['stat'].map(lines).astype('float64')
+
+        board['predicted_value'] = predicted_values(board['last_3_avg'], board['avg_last_5'],
+                                                    board['avg_last_10'], board['trend'])
+        board['prediction'] = np.where(board['predicted_value'] > board['line'], 'OVER', 'UNDER')
+        board['confidence'] = confidence(board['predicted_value'], board['line'], board['consistency'])
+
+        board = board.round({'predicted_value': 1, 'avg_last_5': 1, 'avg_last_10': 1, 'last_3_avg': 1,
+                              'consistency': 1, 'trend': 2})
+        return board[['player', 'team', 'stat', 'line', 'predicted_value', 'prediction', 'confidence', 'trend',
+                      'avg_last_5', 'avg_last_10', 'recent_form', 'games_analyzed', 'consistency',
+                      'last_3_avg']].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "nba_stat_over_under_predictions.csv"
+    board = RollingForm(os.environ["DATABASE_URL"]).prop_board()
+    board.to_csv(path, index=False)
+    print(f"🔮 Wrote {len(board)} props of {board['player'].nunique()} players to {path}")
@@ -0,0 +1,72 @@
+# nba_queries.py
+# Reads of the aggregate tables the loader maintains (see nba_aggregates), shared by
+# NBAAnalyzer and the API (my_api) without the analyzer's plotting dependencies. Each takes
+# the engine and an optional query(sql, **params) function returning a DataFrame
+# (read_frame on the engine by default), so callers can put their cache in front of it.
+from functools import partial
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect
+from nba_arrow import read_frame
+
+_columns = {}  # (engine url, table) -> column names
+
+
+def checked_columns(engine, table, names):
+    """Check that `names` are columns of `table` - they are put into SQL as identifiers"""
+    key = (str(engine.url), table)
+    if key not in _columns:
+        _columns[key] = {column['name'] for column in inspect(engine).get_columns(table)}
+    unknown = [name for name in names if name not in _columns[key]]
+    if unknown:
+        raise ValueError(f"Unknown {table} columns: {', '.join(unknown)}")
+    return list(names)
+
+
+def aggregated(engine, table, stats):
+    """Check that `stats` have running sums in the aggregate `table`"""
+    checked_columns(engine, table, [])
+    missing = [stat for stat in stats if f"{stat}_sum" not in _columns[(str(engine.url), table)]]
+    if missing:
+        raise ValueError(f"No {table} sums of: {', '.join(missing)}")
+    return list(stats)
+
+
+def player_comparison(engine, players, stat='pts', season=None, query=None):
+    """
+    Compare players on a stat: games, count (games with a value), mean, std and total,
+    over every season or one (2026 is 2025-26). Rows are in `players` order; players
+    without games are left out. Unlike describe() there are no min, max or quartiles:
+    those don't merge from running sums.
+    """
+    stat, = aggregated(engine, 'nba_player_aggregate', [stat])
+    query = query or partial(read_frame, engine)
+    sums = query(
+        f"SELECT player, SUM(games) AS games, SUM({stat}_n) AS count, SUM({stat}_sum) AS total, "
+        f"SUM({stat}_sq) AS total_sq FROM nba_player_aggregate "
+        f"WHERE player IN :players AND period = 'game' AND (:season IS NULL OR season = :season) "
+        f"GROUP BY player",
+        players=list(players), season=season,
+    ).set_index('player').astype('float64')
+
+    count = sums['count']
+    comparison = pd.DataFrame({'count': count, 'mean': sums['total'] / count.where(count > 0)}, index=sums.index)
+    # Sample std from the running sums, as describe() gives it; no spread from one game
+    variance = (sums['total_sq'] - sums['total'] * comparison['mean']) / (count - 1).where(count > 1)
+    comparison['std'] = np.sqrt(variance.clip(lower=0))
+    comparison['total'] = sums['total']
+    comparison['games'] = sums['games'].astype('int64')
+    return comparison.loc[[player for player in players if player in comparison.index]]
+
+
+def team_ratings(engine, season=None, query=None):
+    """Offensive, defensive and net rating per team (every season or one), best net rating first"""
+    query = query or partial(read_frame, engine)
+    ratings = query(
+        "SELECT team, SUM(off_rtg_sum) / NULLIF(SUM(off_rtg_n), 0) AS off_rtg, "
+        "SUM(def_rtg_sum) / NULLIF(SUM(def_rtg_n), 0) AS def_rtg FROM nba_team_aggregate "
+        "WHERE :season IS NULL OR season = :season GROUP BY team",
+        season=season,
+    ).set_index('team').sort_index().astype('float64').round(1)
+    ratings['net_rtg'] = ratings['off_rtg'] - ratings['def_rtg']
+    return ratings.sort_values('net_rtg', ascending=False, kind='stable')
@@ -1,56 +1,92 @@
 # nba_utils.py
 
-import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sqlalchemy import create_engine, text
+from collections import OrderedDict
+from sqlalchemy import create_engine
+from nba_arrow import read_frame
+from nba_queries import aggregated, player_comparison, team_ratings
 
 class NBAAnalyzer:
-    def __init__(self, database_url):
+    """
+    Queries go to the database as they are asked: player / period filters and aggregates
+    run in SQL and only the needed columns and rows come back. Averages and spreads come
+    from the aggregate tables the loader maintains (nba_player_aggregate, nba_team_aggregate),
+    so they read a few rows per player or team however many games are stored. Results of
+    the last `cache_size` distinct queries are kept (cache_size=0 turns that off).
+    """
+    
+    def __init__(self, database_url, cache_size=32):
         self.engine = create_engine(database_url)
-        self.game_basic = None
-        self.game_advanced = None
-        self.load_data()
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self._game_basic = None
+        self._game_advanced = None
+    
+    @property
+    def game_basic(self):
+        """Whole nba_game_basic table, read on first use (prefer the query methods)"""
+        if self._game_basic is None:
+            self._game_basic = read_frame(self.engine, "SELECT * FROM nba_game_basic")
+        return self._game_basic
+    
+    @property
+    def game_advanced(self):
+        """Whole nba_game_advanced table, read on first use (prefer the query methods)"""
+        if self._game_advanced is None:
+            self._game_advanced = read_frame(self.engine, "SELECT * FROM nba_game_advanced")
+        return self._game_advanced
     
     def load_data(self):
-        """Load data from database"""
-        self.game_basic = pd.read_sql("SELECT * FROM nba_game_basic", self.engine)
-        self.game_advanced = pd.read_sql("SELECT * FROM nba_game_advanced", self.engine)
+        """Load both tables into memory up front"""
+        self._game_basic = read_frame(self.engine, "SELECT * FROM nba_game_basic")
+        self._game_advanced = read_frame(self.engine, "SELECT * FROM nba_game_advanced")
         print("Data loaded successfully!")
     
-    def get_player_comparison(self, players, stat='pts'):
-        """Compare multiple players on a specific stat"""
-        comparison_data = []
+    def query(self, sql, **params):
+        """DataFrame of a SQL query; list parameters expand to IN lists"""
+        key = (sql, tuple(sorted((name, tuple(value) if isinstance(value, (list, tuple)) else value)
+                                 for name, value in params.items())))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key].copy()
         
-        for player in players:
-            player_data = self.game_basic[
-                (self.game_basic['player'] == player) & 
-                (self.game_basic['period'] == 'game')
-            ]
-            
-            if len(player_data) > 0:
-                stats = player_data[stat].describe()
-                stats['player'] = player
-                stats['games'] = len(player_data)
-                comparison_data.append(stats)
+        result = read_frame(self.engine, sql, **params)
         
-        return pd.DataFrame(comparison_data).set_index('player')
+        if self.cache_size:
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            result = result.copy()
+        return result
+    
+    def clear_cache(self):
+        self.cache.clear()
+    
+    def get_player_comparison(self, players, stat='pts', season=None):
+        """
+        Compare multiple players on a specific stat: games, count (games with a value),
+        mean, std and total, over every season or one (2026 is 2025-26)
+        """
+        return player_comparison(self.engine, players, stat, season, query=self.query)
+    
+    def player_averages(self, players, stats, season=None):
+        """Per-game averages of `stats` for each player (rows in `players` order, 0 without games)"""
+        stats = aggregated(self.engine, 'nba_player_aggregate', stats)
+        averages = self.query(
+            f"SELECT player, {', '.join(f'SUM({stat}_sum) / NULLIF(SUM({stat}_n), 0) AS {stat}' for stat in stats)} "
+            f"FROM nba_player_aggregate WHERE player IN :players AND period = 'game' "
+            f"AND (:season IS NULL OR season = :season) GROUP BY player",
+            players=list(players), season=season,
+        )
+        return averages.set_index('player').reindex(list(players)).fillna(0)
     
     def plot_player_comparison(self, players, stats=['pts', 'trb', 'ast']):
         """Plot comparison of multiple players across multiple stats"""
+        averages = self.player_averages(players, stats)
         fig, axes = plt.subplots(1, len(stats), figsize=(15, 5))
         
         for i, stat in enumerate(stats):
-            stat_data = []
-            for player in players:
-                player_games = self.game_basic[
-                    (self.game_basic['player'] == player) & 
-                    (self.game_basic['period'] == 'game')
-                ]
-                if len(player_games) > 0:
-                    stat_data.append(player_games[stat].mean())
-                else:
-                    stat_data.append(0)
+            stat_data = averages[stat].tolist()
             
             axes[i].bar(players, stat_data)
             axes[i].set_title(f'Average {stat.upper()}')
@@ -59,15 +95,9 @@ class NBAAnalyzer:
         plt.tight_layout()
         plt.show()
     
-    def get_team_offense_defense(self):
-        """Get team offensive and defensive ratings"""
-        team_ratings = self.game_advanced.groupby('team').agg({
-            'off_rtg': 'mean',
-            'def_rtg': 'mean'
-        }).round(1)
-        
-        team_ratings['net_rtg'] = team_ratings['off_rtg'] - team_ratings['def_rtg']
-        return team_ratings.sort_values('net_rtg', ascending=False)
+    def get_team_offense_defense(self, season=None):
+        """Get team offensive and defensive ratings (every season or one)"""
+        return team_ratings(self.engine, season, query=self.query)
     
     def plot_team_ratings(self):
         """Plot team offensive vs defensive ratings"""
@@ -1,4 +1,5 @@
 from table_scrapper import get_table
+from table_scrapper.crawler import Crawler
 
 # --- Define one object (page_map) mapping each page to its tables ---
 page_map = {
@@ -349,19 +350,12 @@ page_map = {
     }
 }
 
-# --- Scrape and write all tables ---
-for page_url, tables in page_map.items():
-    print(f"\nFetching page: {page_url}")
-    page_html = get_table.get_html_page(page_url)
+# --- Fetch pages concurrently (rate limited per host) and write their tables ---
+crawler = Crawler(get_table.fetcher.fetch_source, max_workers=4, requests_per_minute=10,
+                  is_cached=get_table.fetcher.is_cached)
+succeeded, failed = crawler.crawl(page_map, get_table.save_page_tables)
+print(f"\n✅ {len(succeeded)} pages scraped, ❌ {len(failed)} failed")
 
-    for table_id, table_name in tables.items():
-        print(f"  → Extracting table: {table_name}")
-        html = get_table.get_table_by_id(table_id)
-        df = get_table.html_table_to_df(html, table_name)
-        print(f"  ✅ Saved {table_name} ({len(df)} rows)")
-
-    print(f"✅ Finished scraping all tables from {page_url}")
-
-# --- Close Selenium driver at the end ---
-get_table.driver.quit()
-print("\n✅ All pages processed and driver closed.")
+# --- Close HTTP session (and browser, if one was started) at the end ---
+get_table.close()
+print("\n✅ All pages processed and fetcher closed.")
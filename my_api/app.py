@@ -1,5 +1,13 @@
-from flask import Flask, render_template # type: ignore
+import os
+from datetime import date
+from flask import Flask, Response, jsonify, render_template, request # type: ignore
+from werkzeug.exceptions import BadRequest, HTTPException # type: ignore
+import stats
+from response_cache import ResponseCache
 
+# Responses are cached by endpoint and normalized query parameters for API_CACHE_TTL
+# seconds, and carry an ETag: clients sending it back in If-None-Match get a 304
+cache = ResponseCache(size=int(os.environ.get("API_CACHE_SIZE", 256)), ttl=float(os.environ.get("API_CACHE_TTL", 60)))
 
 app = Flask(__name__)
 
@@ -7,5 +15,87 @@ app = Flask(__name__)
 def home():
     return render_template("home.html")
 
+
+def listed(name):
+    """Values of a repeated and/or comma separated parameter, in order without repeats"""
+    values = (value.strip() for raw in request.args.getlist(name) for value in raw.split(','))
+    return tuple(dict.fromkeys(value for value in values if value))
+
+
+def number(name, kind=int):
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be a number, not {value!r}")
+
+
+def day(name):
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be a YYYY-MM-DD date, not {value!r}")
+
+
+def cached_json(endpoint, build, **params):
+    """JSON records of the frame build(**params) returns, from the cache when it's there"""
+    key = (endpoint,) + tuple(sorted(params.items()))
+    cached = cache.get(key)
+    if cached is None:
+        try:
+            frame = build(**params)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        cached = cache.put(key, frame.to_json(orient='records', date_format='iso').encode())
+
+    body, etag = cached
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # revalidate with the ETag
+    return response.make_conditional(request)
+
+
+@app.route('/api/players/<player>/games')
+def player_games(player):
+    return cached_json('player_games', stats.player_games, player=player.strip(),
+                       period=request.args.get('period', 'game').strip().lower(),
+                       since=day('since'), until=day('until'),
+                       limit=number('limit'))
+
+
+@app.route('/api/players/compare')
+def player_comparison():
+    players = listed('players')
+    if not players:
+        raise BadRequest("players is required")
+    return cached_json('player_comparison', stats.player_comparison, players=players,
+                       stat=request.args.get('stat', 'pts').strip().lower(), season=number('season'))
+
+
+@app.route('/api/teams/ratings')
+def team_ratings():
+    return cached_json('team_ratings', stats.team_ratings, season=number('season'))
+
+
+@app.route('/api/predictions')
+def predictions():
+    # Filters don't depend on their order
+    return cached_json('predictions', stats.predictions, players=tuple(sorted(listed('player'))),
+                       teams=tuple(sorted(team.upper() for team in listed('team'))),
+                       stats=tuple(sorted(stat.lower() for stat in listed('stat'))),
+                       min_confidence=number('min_confidence', float))
+
+
+@app.errorhandler(HTTPException)
+def json_error(e):
+    if not request.path.startswith('/api/'):
+        return e
+    return jsonify(error=e.description), e.code
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8000, debug=True) 
\ No newline at end of file
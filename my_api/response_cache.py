@@ -0,0 +1,43 @@
+# response_cache.py
+# In-process cache of rendered JSON responses: least recently used entries are dropped
+# past `size`, and entries expire `ttl` seconds after they were stored. Each entry keeps
+# its body and ETag, so a hit is served without querying or serializing again.
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    def __init__(self, size=256, ttl=60):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires, body, etag)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """(body, etag) of an unexpired entry, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key, body):
+        """Store a body and return its (body, etag)"""
+        etag = hashlib.sha1(body).hexdigest()
+        if self.size:
+            with self.lock:
+                self.entries[key] = (time.monotonic() + self.ttl, body, etag)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+        return body, etag
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
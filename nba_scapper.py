@@ -1,58 +1,52 @@
 import time
 import os
-import re
-import pandas as pd
-from io import StringIO
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from table_scrapper.table_parser import parse_table
+from table_scrapper.fetcher import get_fetcher, find_links
+from table_scrapper.crawl_manifest import CrawlManifest, content_hash, DONE, FAILED, MISSING
+from table_scrapper.table_store import WRITE_CSV, get_store, nba_partition
 
-# Setup Chrome driver
-def get_driver() -> webdriver:
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+# Plain HTTP fetcher; Chrome is only started if a page can't be served over HTTP
+fetcher = get_fetcher()
 
-    service = Service(executable_path="chromedriver.exe")
-    return webdriver.Chrome(service=service, options=chrome_options)
-
-driver = get_driver()
+# Parquet dataset writer when OUTPUT_FORMAT is parquet/both, else None
+store = get_store()
 
 def safe_get(url):
     try:
-        driver.get(url)
-        time.sleep(6)
+        return fetcher.fetch(url)
     except Exception as e:
         print(f"⚠ Retry due to: {e}")
         time.sleep(6)
-        driver.get(url)
+        return fetcher.fetch(url)
+
+# Manifest kind of this scraper's games: every box- table of the page. all_nba_scrapper
+# shares the manifest file and records its own kinds ("box", "pbp", "shots")
+KIND = "box_tables"
 
 # Get all box-score links from schedule
 def get_box_score_links(url: str):
-    safe_get(url)
-    links = driver.find_elements(By.PARTIAL_LINK_TEXT, "Box Score")
-    return [link.get_attribute("href") for link in links]
+    page_source = safe_get(url)
+    return find_links(page_source, url, "Box Score")
 
 # Extract all tables from page
 def extract_all_tables():
-    return re.findall(
-        r"(<table[^>]*?id=\"([^\"]+)\"[\s\S]*?</table>)",
-        driver.page_source
-    )
+    return [(html, table_id) for table_id, html in fetcher.index.items()]
 
-# HTML table → CSV
-def html_table_to_df(html, table_name):
-    df = pd.read_html(StringIO(html))[0]
+# HTML table → CSV and/or Parquet dataset
+def html_table_to_df(html, game_id, table_id):
+    df = parse_table(html)
 
-    os.makedirs("./nba_data", exist_ok=True)
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    filepath = f"./nba_data/{table_name}_{current_date}.csv"
+    if WRITE_CSV:
+        os.makedirs("./nba_data", exist_ok=True)
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        filepath = f"./nba_data/{game_id}_{table_id}_{current_date}.csv"
 
-    df.to_csv(filepath, index=False)
-    print(f"🏀 Saved: {filepath}")
+        df.to_csv(filepath, index=False)
+        print(f"🏀 Saved: {filepath}")
+
+    if store is not None:
+        store.write(df, **nba_partition(game_id, table_id))
 
 # All schedule pages
 urls = [
@@ -67,24 +61,41 @@ all_box_scores = []
 for u in urls:
     all_box_scores.extend(get_box_score_links(u))
 
-print(f"🔗 Found {len(all_box_scores)} box score links\n")
+# Skip games a previous run already completed
+os.makedirs("./nba_data", exist_ok=True)
+manifest = CrawlManifest("./nba_data/crawl_manifest.sqlite")
+game_links = {link.split("/")[-1].replace(".html", ""): link for link in all_box_scores}
+todo = list(manifest.pending(game_links, [KIND]))
 
-# Scrape every game
-for i, link in enumerate(all_box_scores):
-    print(f"Scraping ({i+1}/{len(all_box_scores)}): {link}")
-    safe_get(link)
+print(f"🔗 Found {len(all_box_scores)} box score links, {len(todo)} still to scrape\n")
 
-    game_id = link.split("/")[-1].replace(".html", "")
+# Scrape every remaining game
+for i, game_id in enumerate(todo):
+    link = game_links[game_id]
+    print(f"Scraping ({i+1}/{len(todo)}): {link}")
 
-    tables = extract_all_tables()
-    if not tables:
-        print("⚠ No tables found\n")
+    try:
+        safe_get(link)
+    except Exception as e:
+        print(f"❌ Failed: {e}\n")
+        manifest.record(game_id, KIND, FAILED, error=str(e))
+        continue
+
+    # Done only once a box score was saved - otherwise a later run tries the game again
+    box_tables = [(html, table_id) for html, table_id in extract_all_tables() if table_id.startswith("box-")]
+    if not box_tables:
+        print("⚠ No box score tables found\n")
+        manifest.record(game_id, KIND, MISSING, content_hash(fetcher.page_source))
         continue
 
-    for html, table_id in tables:
-        if table_id.startswith("box-"):
-            html_table_to_df(html, f"{game_id}_{table_id}")
+    for html, table_id in box_tables:
+        html_table_to_df(html, game_id, table_id)
+
+    manifest.record(game_id, KIND, DONE, content_hash(fetcher.page_source))
 
 print("\n✅ Done scraping!")
-input("Press ENTER to close browser...")
-driver.quit()
+print(f"📋 Manifest: {manifest.summary()}")
+manifest.close()
+if store is not None:
+    store.close()
+fetcher.close()
@@ -0,0 +1,73 @@
+# bench_table_parser.py
+# Benchmark table_parser.parse_table against pd.read_html on the saved tables.
+# The tables are stored as CSV, so each one is first rendered back into the
+# fbref / basketball-reference HTML layout (over_header row, data-stat cells).
+#
+#   python -m table_scrapper.bench_table_parser [max_files]
+import re
+import sys
+import glob
+import time
+import html as html_escape
+import pandas as pd
+from io import StringIO
+from table_scrapper.table_parser import parse_table
+
+CSV_DIRS = ["./data", "./data_loader/nba_data"]
+
+
+def data_stat(column):
+    name = column.lower().replace("%", "_pct").replace("+/-", "plus_minus")
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_") or "col"
+
+
+def csv_to_table_html(path):
+    """Render a saved CSV as a sports-reference style table"""
+    with open(path, encoding="utf-8") as f:
+        two_level = f.readline().startswith("Unnamed")
+    df = pd.read_csv(path, header=[0, 1] if two_level else 0, dtype=str).fillna("")
+
+    columns = [col[1] for col in df.columns] if two_level else list(df.columns)
+    stats = [data_stat(col) for col in columns]
+    esc = html_escape.escape
+
+    parts = ['<table class="stats_table" id="bench"><thead>']
+    if two_level:
+        groups = "".join(f"<th>{esc('' if 'Unnamed' in col[0] else col[0])}</th>" for col in df.columns)
+        parts.append(f'<tr class="over_header">{groups}</tr>')
+    parts.append("<tr>" + "".join(f'<th data-stat="{s}">{esc(c)}</th>' for s, c in zip(stats, columns)) + "</tr>")
+    parts.append("</thead><tbody>")
+    for row in df.itertuples(index=False):
+        cells = [f'<th data-stat="{stats[0]}">{esc(row[0])}</th>']
+        cells += [f'<td data-stat="{s}">{esc(v)}</td>' for s, v in zip(stats[1:], row[1:])]
+        parts.append("<tr>" + "".join(cells) + "</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def time_parser(name, parse, tables):
+    start = time.perf_counter()
+    for table in tables:
+        parse(table)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {elapsed:8.2f}s  {elapsed / len(tables) * 1000:7.2f} ms/table")
+    return elapsed
+
+
+def main():
+    max_files = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    paths = []
+    for folder in CSV_DIRS:
+        paths += sorted(p for p in glob.glob(f"{folder}/*.csv") if "_pbp_" not in p and "_combined_" not in p)
+    paths = paths[:max_files]
+
+    print(f"Rendering {len(paths)} saved tables to HTML...")
+    tables = [csv_to_table_html(p) for p in paths]
+
+    read_html = time_parser("pd.read_html", lambda h: pd.read_html(StringIO(h))[0], tables)
+    parser = time_parser("parse_table", parse_table, tables)
+    print(f"Speed-up: {read_html / parser:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
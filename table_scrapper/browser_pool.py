@@ -0,0 +1,155 @@
+# browser_pool.py
+import os
+import queue
+import multiprocessing as mp
+from table_scrapper.fetcher import SeleniumFetcher
+
+
+def browser_worker(worker_id, tasks, results, executable_path, max_pages, wait):
+    """
+    Worker process: one headless Chrome, fed from the shared task queue.
+    The browser is recycled every `max_pages` pages to keep its memory in check.
+    """
+    fetcher = SeleniumFetcher(executable_path=executable_path, wait=wait)
+    pages = 0
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            results.put(("started", worker_id, task, None, None))
+            try:
+                page_source = fetcher.fetch(task[-1])
+                results.put(("done", worker_id, task, page_source, None))
+            except Exception as e:
+                # A broken session is not worth keeping - start a fresh browser next time
+                fetcher.close()
+                results.put(("done", worker_id, task, None, str(e)))
+
+            pages += 1
+            if pages >= max_pages:
+                fetcher.close()
+                pages = 0
+    finally:
+        fetcher.close()
+
+
+class BrowserPool:
+    """
+    N headless Chrome workers, each in its own process, pulling (…, url) tasks from a
+    shared queue. Crashed workers are replaced and their in-flight task is retried.
+    """
+
+    def __init__(self, workers=None, max_pages=50, executable_path="chromedriver.exe",
+                 wait=3, max_retries=2):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pages = max_pages
+        self.executable_path = executable_path
+        self.wait = wait
+        self.max_retries = max_retries
+        self.manager = None
+        self.tasks = None
+        self.results = None
+        self.processes = {}
+        self.in_flight = {}
+        self.dead = set()
+        self.next_worker_id = 0
+
+    def start_worker(self):
+        # Every process gets a new id, so late messages from a dead one can be recognised
+        worker_id = self.next_worker_id
+        self.next_worker_id += 1
+        process = mp.Process(
+            target=browser_worker,
+            args=(worker_id, self.tasks, self.results, self.executable_path, self.max_pages, self.wait),
+            daemon=True,
+        )
+        process.start()
+        self.processes[worker_id] = process
+
+    def retry(self, task, retries):
+        """Re-queue a task lost to a crash; returns False once it has run out of retries"""
+        retries[task] = retries.get(task, 0) + 1
+        if retries[task] > self.max_retries:
+            return False
+        self.tasks.put(task)
+        return True
+
+    def replace_dead_workers(self, retries):
+        """Restart crashed workers; yields the in-flight tasks that can't be retried"""
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            del self.processes[worker_id]
+            self.dead.add(worker_id)
+            print(f"⚠ Browser worker {worker_id} died (exit code {process.exitcode}), restarting")
+
+            task = self.in_flight.pop(worker_id, None)
+            if task is not None and not self.retry(task, retries):
+                yield task, None, "worker crashed"
+            self.start_worker()
+
+    def map_pages(self, tasks):
+        """
+        Load every task's url (last tuple element) in the pool.
+        Yields (task, page_source, error) as pages finish, in completion order.
+        """
+        tasks = list(dict.fromkeys(tasks))
+        if not tasks:
+            return
+
+        # Manager queues live in their own process, so a worker dying mid-put can't
+        # leave a queue lock held and stall the rest of the pool
+        self.manager = mp.Manager()
+        self.tasks = self.manager.Queue()
+        self.results = self.manager.Queue()
+        for task in tasks:
+            self.tasks.put(task)
+        for _ in range(min(self.workers, len(tasks))):
+            self.start_worker()
+
+        finished = set()
+        retries = {}
+        try:
+            while len(finished) < len(tasks):
+                for failed in self.replace_dead_workers(retries):
+                    finished.add(failed[0])
+                    yield failed
+
+                try:
+                    event, worker_id, task, page_source, error = self.results.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                if event == "started":
+                    if worker_id in self.dead:
+                        # Picked up a task and died before we saw it start
+                        if task not in finished and not self.retry(task, retries):
+                            finished.add(task)
+                            yield task, None, "worker crashed"
+                    else:
+                        self.in_flight[worker_id] = task
+                    continue
+
+                self.in_flight.pop(worker_id, None)
+                if task in finished:
+                    continue  # a retried copy of a task that had already finished
+                finished.add(task)
+                yield task, page_source, error
+        finally:
+            self.close()
+
+    def close(self):
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self.processes = {}
+        self.in_flight = {}
+        self.dead = set()
+        if self.manager is not None:
+            self.manager.shutdown()
+            self.manager = None
@@ -0,0 +1,91 @@
+# crawl_manifest.py
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+DONE = "done"
+FAILED = "failed"
+MISSING = "missing"  # page fetched but the table wasn't on it
+
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+class CrawlManifest:
+    """
+    Persistent record of what has been scraped, one row per (game_id, kind).
+    Every update is committed straight away, so a crashed crawl resumes from the
+    last completed item.
+    """
+
+    def __init__(self, path="./nba_data/crawl_manifest.sqlite", max_attempts=3):
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_manifest (
+                game_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                content_hash TEXT,
+                fetched_at TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                PRIMARY KEY (game_id, kind)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def record(self, game_id, kind, status, content_hash=None, error=None):
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO crawl_manifest (game_id, kind, status, content_hash, fetched_at, attempts, error)
+                VALUES (?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT (game_id, kind) DO UPDATE SET
+                    status = excluded.status,
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at,
+                    attempts = crawl_manifest.attempts + 1,
+                    error = excluded.error
+                """,
+                (game_id, kind, status, content_hash, datetime.now().isoformat(timespec="seconds"), error),
+            )
+            self.conn.commit()
+
+    def status(self, game_id, kind):
+        row = self.conn.execute(
+            "SELECT status, attempts FROM crawl_manifest WHERE game_id = ? AND kind = ?",
+            (game_id, kind),
+        ).fetchone()
+        return row
+
+    def needs_fetch(self, game_id, kind):
+        """Not seen yet, or failed fewer than max_attempts times"""
+        row = self.status(game_id, kind)
+        if row is None:
+            return True
+        status, attempts = row
+        return status != DONE and attempts < self.max_attempts
+
+    def pending(self, game_ids, kinds):
+        """{game_id: [kinds still to fetch]} for games with anything left to do, in order"""
+        todo = {}
+        for game_id in game_ids:
+            missing = [kind for kind in kinds if self.needs_fetch(game_id, kind)]
+            if missing:
+                todo[game_id] = missing
+        return todo
+
+    def summary(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM crawl_manifest GROUP BY status"))
+
+    def close(self):
+        self.conn.close()
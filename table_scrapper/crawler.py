@@ -0,0 +1,124 @@
+# crawler.py
+import time
+import random
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from table_scrapper.fetcher import is_throttled
+
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, with bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use"""
+
+    def __init__(self, requests_per_minute=10, burst=1):
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            bucket = self.buckets[host]
+        bucket.acquire()
+
+
+class Crawler:
+    """
+    Fetch many pages concurrently while respecting per-host limits.
+
+    `fetch(url)` returns page source. `handle_page(url, page_source, job)` runs on a
+    separate pool so table extraction and CSV writing overlap with network I/O.
+    `is_cached(url)`, if given, lets cached pages skip the rate limiter.
+    """
+
+    def __init__(self, fetch, max_workers=4, requests_per_minute=10, burst=1,
+                 max_retries=4, backoff=5, process_workers=2, is_cached=None):
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.max_workers = max_workers
+        self.limiter = HostRateLimiter(requests_per_minute, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.process_workers = process_workers
+
+    def fetch_with_backoff(self, url):
+        # Pages served from the local cache don't cost the host anything
+        if self.is_cached is not None and self.is_cached(url):
+            return self.fetch(url)
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(url)
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                if not is_throttled(e) or attempt == self.max_retries:
+                    raise
+
+                # Honour Retry-After when given, otherwise exponential backoff with jitter
+                retry_after = e.response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+                else:
+                    delay = self.backoff * 2 ** attempt + random.uniform(0, 1)
+                print(f"⏳ {e.response.status_code} from {url}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+
+    def crawl(self, jobs, handle_page):
+        """
+        Run every job in `jobs` ({url: job}) and return (succeeded, failed) url lists.
+        """
+        succeeded, failed = [], []
+
+        with ThreadPoolExecutor(max_workers=self.process_workers) as processors, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as fetchers:
+            fetches = {fetchers.submit(self.fetch_with_backoff, url): url for url in jobs}
+            processing = {}
+
+            for future in as_completed(fetches):
+                url = fetches[future]
+                try:
+                    page_source = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to fetch {url}: {e}")
+                    failed.append(url)
+                    continue
+                processing[processors.submit(handle_page, url, page_source, jobs[url])] = url
+
+            for future in as_completed(processing):
+                url = processing[future]
+                try:
+                    future.result()
+                    succeeded.append(url)
+                except Exception as e:
+                    print(f"❌ Failed to process {url}: {e}")
+                    failed.append(url)
+
+        return succeeded, failed
@@ -0,0 +1,184 @@
+# fetcher.py
+import re
+import time
+import threading
+import requests
+from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from table_scrapper.page_index import PageIndex
+from table_scrapper.page_cache import DEFAULT_CACHE_DIR, CachingFetcher, PageCache
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpFetcher:
+    """Fetch server-rendered pages with plain HTTP over a keep-alive connection pool"""
+
+    def __init__(self, pool_size=10, timeout=30, headers=None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, headers=None):
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def fetch(self, url):
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher:
+    """Load pages through a Chrome session - only started when first needed"""
+
+    def __init__(self, executable_path="chromedriver.exe", wait=3, headless=True):
+        self.executable_path = executable_path
+        self.wait = wait
+        self.headless = headless
+        self.driver = None
+        self.lock = threading.Lock()
+
+    def get_driver(self):
+        if self.driver is None:
+            # Imported here so HTTP-only runs never need selenium installed
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+
+            options = webdriver.ChromeOptions()
+            if self.headless:
+                options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-blink-features=AutomationControlled")
+            service = Service(executable_path=self.executable_path)
+            self.driver = webdriver.Chrome(service=service, options=options)
+        return self.driver
+
+    def fetch(self, url):
+        # One browser session, so concurrent callers take turns
+        with self.lock:
+            driver = self.get_driver()
+            driver.get(url)
+            time.sleep(self.wait)
+            return driver.page_source
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+class PageFetcher:
+    """HTTP first, browser only as a fallback; remembers the last page it loaded"""
+
+    def __init__(self, backend=None, fallback=None):
+        self.backend = backend if backend is not None else HttpFetcher()
+        self.fallback = fallback
+        self.url = None
+        self.page_source = None
+        self._index = None
+
+    def fetch_source(self, url):
+        """Page source for `url` without touching the remembered page (thread safe)"""
+        try:
+            return self.backend.fetch(url)
+        except requests.RequestException as e:
+            if self.fallback is None or is_throttled(e):
+                raise
+            print(f"⚠ HTTP fetch failed ({e}), falling back to browser: {url}")
+            return self.fallback.fetch(url)
+
+    def is_cached(self, url):
+        """True when the backend can answer `url` from its page cache"""
+        is_fresh = getattr(self.backend, "is_fresh", None)
+        return is_fresh is not None and is_fresh(url)
+
+    def fetch(self, url):
+        page_source = self.fetch_source(url)
+        self.url = url
+        self.page_source = page_source
+        self._index = None
+        return page_source
+
+    @property
+    def index(self):
+        """Table index of the remembered page, built once per page"""
+        if self._index is None and self.page_source is not None:
+            self._index = PageIndex(self.page_source)
+        return self._index
+
+    def get_table(self, url, table_id):
+        """Return the HTML of table `table_id` on page `url` (or None)"""
+        if url != self.url:
+            self.fetch(url)
+        html = self.index.get(table_id)
+
+        # Table only appears after JavaScript runs - retry once in the browser
+        if html is None and self.fallback is not None:
+            print(f"⚠ Table {table_id} not in served HTML, retrying in browser: {url}")
+            self.page_source = self.fallback.fetch(url)
+            self._index = None
+            html = self.index.get(table_id)
+        return html
+
+    def get_tables(self, url, page_source, table_ids):
+        """
+        {table_id: HTML or None} of the tables in an already-fetched `page_source` of `url`.
+        Like get_table, tables missing from the served HTML are looked for once more in the
+        browser - one load for all of them. Doesn't touch the remembered page (thread safe).
+        """
+        index = PageIndex(page_source)
+        tables = {table_id: index.get(table_id) for table_id in table_ids}
+        missing = [table_id for table_id, html in tables.items() if html is None]
+        if missing and self.fallback is not None:
+            print(f"⚠ Tables {', '.join(missing)} not in served HTML, retrying in browser: {url}")
+            index = PageIndex(self.fallback.fetch(url))
+            tables.update((table_id, index.get(table_id)) for table_id in missing)
+        return tables
+
+    def close(self):
+        self.backend.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+def get_fetcher(use_browser_fallback=True, executable_path="chromedriver.exe",
+                cache_dir=DEFAULT_CACHE_DIR):
+    """Default fetcher used by the scrapers - pass cache_dir=None to skip the page cache"""
+    backend = HttpFetcher()
+    if cache_dir is not None:
+        backend = CachingFetcher(backend, PageCache(cache_dir))
+    fallback = SeleniumFetcher(executable_path=executable_path) if use_browser_fallback else None
+    return PageFetcher(backend, fallback)
+
+
+def is_throttled(error):
+    """True for 429/503 responses - the server wants us to back off, not switch to a browser"""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in (429, 503)
+
+
+def find_table(page_source, table_id):
+    """Find a single table by id in page source, including tables hidden in HTML comments"""
+    return PageIndex(page_source).get(table_id)
+
+
+def find_links(page_source, base_url, link_text):
+    """Absolute hrefs of every <a> whose text contains `link_text`"""
+    links = re.findall(r"<a[^>]*href=\"([^\"]+)\"[^>]*>([^<]*)</a>", page_source)
+    return [urljoin(base_url, href) for href, text in links if link_text in text]
@@ -0,0 +1,147 @@
+# game_bundle.py
+# One file per game holding each of its tables (box scores, pbp, shots) as a typed Arrow
+# IPC member, instead of the mostly-empty <game>_combined_<date>.csv. The file is read
+# through a memory map, so opening one member doesn't read or parse the others:
+#
+#   with GameBundle("nba_data/202510210LAL_bundle_2025-11-28.arrow") as bundle:
+#       q4 = bundle.to_pandas("box-GSW-q4-basic")
+#
+#   python -m table_scrapper.game_bundle [folder]     bundle the CSVs already in a folder
+#
+# Layout: member IPC files (64-byte aligned) | JSON index | index length (8 bytes LE) | MAGIC
+import os
+import re
+import sys
+import json
+import glob
+import struct
+from datetime import datetime
+from table_scrapper.table_store import arrow_schema, flat_column_name
+
+MAGIC = b"NBABUNDLE1"
+ALIGNMENT = 64
+FOOTER = struct.Struct("<Q")
+
+# <game_id>_<table>_<scrape date>.csv
+CSV_NAME = re.compile(r"^(?P<game_id>\d{8}0[A-Z]+)_(?P<table>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+
+
+def bundle_path(folder, game_id, date=None):
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    return os.path.join(folder, f"{game_id}_bundle_{date}.arrow")
+
+
+def arrow_table(df):
+    import pyarrow as pa
+
+    df = df.copy()
+    df.columns = [flat_column_name(col) for col in df.columns]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Box score members are ~15 rows, so per-member overhead matters: 32-bit string offsets
+    # and no pandas metadata (a JSON blob per column)
+    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_large_string(field.type) else field
+                        for field in arrow_schema(table.schema)])
+    return table.cast(schema).replace_schema_metadata(None)
+
+
+def write_bundle(path, tables, game_id=None):
+    """Write {table name: DataFrame} as one bundle file (replaced atomically)"""
+    import pyarrow as pa
+
+    members = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for name, df in tables.items():
+            table = arrow_table(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            data = sink.getvalue()
+            offset = f.tell()
+            f.write(data)
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            members[name] = {"offset": offset, "length": data.size, "rows": table.num_rows}
+
+        index = json.dumps({"game_id": game_id, "members": members}).encode()
+        f.write(index)
+        f.write(FOOTER.pack(len(index)))
+        f.write(MAGIC)
+    os.replace(tmp_path, path)
+    return path
+
+
+class GameBundle:
+    """Memory-mapped reader of a bundle file; members are zero-copy slices of the map"""
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.path = path
+        self.source = pa.memory_map(path, "r")
+        self.buffer = self.source.read_buffer()
+
+        tail = len(MAGIC) + FOOTER.size
+        if self.buffer.size < tail or self.buffer.slice(self.buffer.size - len(MAGIC)).to_pybytes() != MAGIC:
+            self.close()
+            raise ValueError(f"Not a game bundle: {path}")
+        (index_length,) = FOOTER.unpack(self.buffer.slice(self.buffer.size - tail, FOOTER.size).to_pybytes())
+        index = json.loads(self.buffer.slice(self.buffer.size - tail - index_length, index_length).to_pybytes())
+        self.game_id = index["game_id"]
+        self.members = index["members"]
+
+    def names(self):
+        return list(self.members)
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def table(self, name, columns=None):
+        """Member `name` as a pyarrow Table backed by the memory map (only `columns` if given)"""
+        import pyarrow as pa
+
+        member = self.members[name]
+        reader = pa.ipc.open_file(self.buffer.slice(member["offset"], member["length"]))
+        table = reader.read_all()
+        return table.select(columns) if columns is not None else table
+
+    def to_pandas(self, name, columns=None):
+        return self.table(name, columns).to_pandas()
+
+    def close(self):
+        self.buffer = None
+        self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def bundle_folder(folder):
+    """
+    Bundle every game's table CSVs already in `folder` (latest scrape of each table),
+    one bundle per game dated by its newest scrape. Returns the bundle paths.
+    """
+    import pandas as pd
+
+    games = {}
+    for path in glob.glob(os.path.join(folder, "*.csv")):
+        match = CSV_NAME.match(os.path.basename(path))
+        if not match or match["table"] == "combined":
+            continue
+        tables = games.setdefault(match["game_id"], {})
+        if match["table"] not in tables or tables[match["table"]][0] < match["date"]:
+            tables[match["table"]] = (match["date"], path)
+
+    paths = []
+    for game_id, tables in sorted(games.items()):
+        frames = {table: pd.read_csv(path) for table, (_, path) in sorted(tables.items())}
+        date = max(date for date, _ in tables.values())
+        paths.append(write_bundle(bundle_path(folder, game_id, date), frames, game_id))
+        print(f"📦 Bundled {len(frames)} tables of {game_id}")
+    return paths
+
+
+if __name__ == "__main__":
+    bundle_folder(sys.argv[1] if len(sys.argv) > 1 else "./nba_data")
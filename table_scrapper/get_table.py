@@ -1,61 +1,63 @@
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-import pandas as pd
-from io import StringIO
-import re
 from datetime import datetime
+from table_scrapper.table_parser import parse_table
+from table_scrapper.fetcher import get_fetcher
+from table_scrapper.table_store import WRITE_CSV, get_store, fbref_partition
+from table_scrapper.snapshot_store import get_snapshot_store
 
-# Set up Chrome driver
+# Plain HTTP fetcher; Chrome is only started if a page can't be served over HTTP
+fetcher = get_fetcher()
 
+# Parquet dataset writer when OUTPUT_FORMAT is parquet/both, else None
+store = get_store()
 
+# Deduplicated daily snapshots when OUTPUT_FORMAT includes snapshot, else None
+snapshots = get_snapshot_store()
 
-def get_driver() -> webdriver:
-    service = Service(executable_path="chromedriver.exe")
-    return webdriver.Chrome(service=service)
-
-
-driver = get_driver()
-
-# get page from url given 
+# get page from url given
 def get_html_page(url : str):
-    page = driver.get(url)
-    time.sleep(10)
-    return page
+    return fetcher.fetch(url)
 
 def get_table_by_id(element_id: str):
-    el = driver.find_element(By.ID, element_id )
-
-    # Get HTML content of the element
-    html = el.get_attribute("outerHTML")
-
-    # Handle FBref’s commented table case
-    if "<table" not in html:
-        print("Table might be inside an HTML comment, extracting from page source...")
-        page_source = driver.page_source
-
-        match = re.search(
-            r"<!--([\s\S]*?<table[^>]*id=\"results2025-202691_overall\"[\s\S]*?</table>)-->",
-            page_source
-        )
-        if match:
-            html = match.group(1)
-        else:
-            print("Could not find table inside HTML comments.")
-            driver.quit()
-            exit()
+    # Tables FBref hides inside HTML comments are matched too
+    html = fetcher.get_table(fetcher.url, element_id)
+    if html is None:
+        print(f"Could not find table '{element_id}' on {fetcher.url}")
     return html
 
-def html_table_to_df(html, table_name):
-    # Parse table HTML into a DataFrame (using StringIO to avoid warnings)
-    df = pd.read_html(StringIO(html))[0]
+def html_table_to_df(html, table_name, partition=None):
+    # Parse table HTML into flat, typed columns keyed by data-stat
+    df = parse_table(html)
     current_date = datetime.now().strftime("%Y-%m-%d")
     filename = f"{table_name}_{current_date}.csv"
-    # Check and save DataFrame to CSV
+    # Check and save DataFrame to CSV and/or the Parquet dataset
     if not df.empty:
-        df.to_csv(f'./data/{filename}', index=False)
-        print(f"Table successfully written to '{filename}'")
+        if WRITE_CSV:
+            df.to_csv(f'./data/{filename}', index=False)
+            print(f"Table successfully written to '{filename}'")
+        if store is not None and partition is not None:
+            store.write(df, **partition)
+        if snapshots is not None:
+            status = snapshots.save(table_name, df, current_date)
+            print(f"Snapshot of '{table_name}' for {current_date}: {status}")
     else:
         print("DataFrame is empty — no data extracted.")
-    return df
\ No newline at end of file
+    return df
+
+def save_page_tables(page_url, page_source, tables):
+    # Write every table ({table_id: table_name}) found in one already-fetched page, or in
+    # the browser's render of it for tables the served HTML lacks
+    found = fetcher.get_tables(page_url, page_source, tables)
+    for table_id, table_name in tables.items():
+        html = found[table_id]
+        if html is None:
+            print(f"Could not find table '{table_id}' on {page_url}")
+            continue
+        df = html_table_to_df(html, table_name, fbref_partition(page_url, table_id, table_name))
+        print(f"  ✅ Saved {table_name} ({len(df)} rows)")
+    print(f"✅ Finished scraping all tables from {page_url}")
+
+def close():
+    # Flush buffered Parquet partitions and close the HTTP session / browser
+    if store is not None:
+        store.close()
+    fetcher.close()
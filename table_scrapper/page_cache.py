@@ -0,0 +1,142 @@
+# page_cache.py
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import threading
+
+DEFAULT_CACHE_DIR = "./.page_cache"
+
+# (url pattern, seconds before revalidation) - first match wins, None = never expires
+DEFAULT_TTL_RULES = [
+    # Box score / play-by-play / shot chart pages only exist once a game is finished
+    (r"basketball-reference\.com/boxscores/(pbp/|shot-chart/)?\d{9}[A-Z]{3}\.html", None),
+    (r"basketball-reference\.com/leagues/NBA_\d+_games", 60 * 60),
+    (r"fbref\.com/en/squads/", 6 * 60 * 60),
+    (r"fbref\.com/en/comps/", 6 * 60 * 60),
+    (r".*", 60 * 60),
+]
+
+
+def url_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    On-disk page cache. Bodies are stored gzip-compressed under their content hash
+    (identical pages share one file); a small JSON entry per URL points at the body
+    and keeps the ETag / Last-Modified headers for conditional revalidation.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_rules=None):
+        self.cache_dir = cache_dir
+        self.ttl_rules = [(re.compile(p), ttl) for p, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        os.makedirs(os.path.join(cache_dir, "entries"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "bodies"), exist_ok=True)
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def entry_path(self, url):
+        return os.path.join(self.cache_dir, "entries", f"{url_key(url)}.json")
+
+    def body_path(self, body_hash):
+        return os.path.join(self.cache_dir, "bodies", f"{body_hash}.html.gz")
+
+    def get_entry(self, url):
+        try:
+            with open(self.entry_path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, url, entry):
+        ttl = self.ttl_for(url)
+        return ttl is None or time.time() - entry["checked_at"] < ttl
+
+    def read_body(self, entry):
+        try:
+            with gzip.open(self.body_path(entry["body_hash"]), "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, url, body, etag=None, last_modified=None):
+        body_hash = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        body_path = self.body_path(body_hash)
+        if not os.path.exists(body_path):
+            self.write_atomic(body_path, gzip.compress(body.encode("utf-8")))
+
+        now = time.time()
+        entry = {
+            "url": url,
+            "body_hash": body_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "checked_at": now,
+        }
+        self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+        return entry
+
+    def touch(self, url, entry):
+        """Mark an entry as just revalidated (server answered 304)"""
+        entry["checked_at"] = time.time()
+        self.write_atomic(self.entry_path(url), json.dumps(entry).encode("utf-8"))
+
+
+class CachingFetcher:
+    """Wrap an HttpFetcher: serve fresh pages from disk, revalidate stale ones with conditional GETs"""
+
+    def __init__(self, backend, cache=None):
+        self.backend = backend
+        self.cache = cache if cache is not None else PageCache()
+
+    def is_fresh(self, url):
+        """True when `url` can be served from disk without any request"""
+        entry = self.cache.get_entry(url)
+        return (entry is not None and self.cache.is_fresh(url, entry)
+                and os.path.exists(self.cache.body_path(entry["body_hash"])))
+
+    def fetch(self, url):
+        entry = self.cache.get_entry(url)
+        body = self.cache.read_body(entry) if entry else None
+
+        if body is not None and self.cache.is_fresh(url, entry):
+            return body
+
+        headers = {}
+        if body is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.backend.get(url, headers=headers)
+        if response.status_code == 304 and body is not None:
+            self.cache.touch(url, entry)
+            return body
+
+        response.raise_for_status()
+        self.cache.store(
+            url,
+            response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response.text
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,54 @@
+# page_index.py
+import re
+
+# Opening / closing table tags. Comment markers are deliberately not tokens: FBref and
+# basketball-reference wrap whole <div>s in <!-- -->, so ignoring them "uncomments" those tables.
+TABLE_TAG = re.compile(r"<table\b[^>]*>|</table\s*>", re.IGNORECASE)
+TABLE_ID = re.compile(r"""\bid\s*=\s*["']([^"']+)["']""")
+
+
+def index_tables(page_source):
+    """
+    Tokenize `page_source` once and return {table_id: table_html} for every table with
+    an id, including tables hidden inside HTML comments. First occurrence of an id wins.
+    """
+    tables = {}
+    depth = 0
+    start = None
+    table_id = None
+
+    for tag in TABLE_TAG.finditer(page_source):
+        if tag.group(0)[1] != "/":
+            if depth == 0:
+                start = tag.start()
+                m = TABLE_ID.search(tag.group(0))
+                table_id = m.group(1) if m else None
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0 and table_id and table_id not in tables:
+                tables[table_id] = page_source[start:tag.end()]
+
+    return tables
+
+
+class PageIndex:
+    """id → table-fragment index over one page, built in a single pass"""
+
+    def __init__(self, page_source):
+        self.tables = index_tables(page_source)
+
+    def get(self, table_id):
+        return self.tables.get(table_id)
+
+    def ids(self):
+        return list(self.tables)
+
+    def items(self):
+        return self.tables.items()
+
+    def __contains__(self, table_id):
+        return table_id in self.tables
+
+    def __len__(self):
+        return len(self.tables)
@@ -0,0 +1,60 @@
+# shot_chart.py
+# basketball-reference shot charts aren't <table>s: every shot is a positioned tooltip <div>
+# inside a "shots-<TEAM>" area, e.g.
+#   <div style="top:262px;left:55px;" tip="1st Qtr, 11:39.0 remaining<br>Stephen Curry missed
+#    3-pointer from 25 ft<br>GSW trails 0-2" class="tooltip miss pq-1 p-curryst01">
+import re
+from html import unescape
+import pandas as pd
+
+# Shot areas and shot markers in document order, so each shot belongs to the last area seen
+# (tooltips hold a literal "<br>", so attribute values are skipped as whole quoted strings)
+ATTRS = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+SHOT_TAG = re.compile(
+    rf"""<div\b[^>]*\bid=["']shots-(?P<team>[A-Z]+)["'][^>]*>"""
+    rf"""|<div\b(?P<attrs>{ATTRS}\bclass=["']tooltip (?:make|miss)\b[^"'>]*["']{ATTRS})>"""
+)
+ATTR = re.compile(r"""\b(style|tip|class)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+POSITION = re.compile(r"(top|left)\s*:\s*(-?\d+)px")
+TIP = re.compile(
+    r"^(?P<number>\d)(?:st|nd|rd|th) (?P<kind>Qtr|OT), (?P<clock>[\d:.]+) remaining<br>\s*"
+    r"(?P<player>.+?) (?P<result>made|missed) (?P<value>[23])-pointer from (?P<distance>\d+) ft"
+)
+
+
+def parse_shot(team, attrs):
+    """One shot row from a marker's attributes, or None if its tooltip isn't a shot"""
+    values = {name: unescape(double or single) for name, double, single in ATTR.findall(attrs)}
+    tip = TIP.match(values.get("tip", ""))
+    if not tip:
+        return None
+    position = dict((side, int(px)) for side, px in POSITION.findall(values.get("style", "")))
+    player_id = next((c[2:] for c in values.get("class", "").split() if c.startswith("p-")), None)
+    number = int(tip["number"])
+    return {
+        "team": team,
+        "player": tip["player"],
+        "player_id": player_id,
+        "period": f"q{number}" if tip["kind"] == "Qtr" else f"ot{number}",
+        "clock": tip["clock"],
+        "made": tip["result"] == "made",
+        "shot_value": int(tip["value"]),
+        "distance": int(tip["distance"]),
+        "x": position.get("left"),
+        "y": position.get("top"),
+    }
+
+
+def parse_shot_chart(page_source):
+    """DataFrame with one row per shot on a shot chart page, or None if it has no shots"""
+    # Like the table index, read through HTML comments - the chart may be wrapped in one
+    shots = []
+    team = None
+    for tag in SHOT_TAG.finditer(page_source):
+        if tag.group("team"):
+            team = tag.group("team")
+            continue
+        shot = parse_shot(team, tag.group("attrs"))
+        if shot is not None:
+            shots.append(shot)
+    return pd.DataFrame(shots) if shots else None
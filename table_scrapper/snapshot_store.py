@@ -0,0 +1,191 @@
+# snapshot_store.py
+import os
+import csv
+import gzip
+import json
+import hashlib
+import threading
+import pandas as pd
+from io import StringIO
+from table_scrapper.table_store import OUTPUT_FORMATS
+
+DEFAULT_ROOT = "./data/snapshots"
+
+
+def normalize_rows(df):
+    """Table content as a list of string rows, independent of dtype quirks (1 vs 1.0, NaN vs '')"""
+    rows = []
+    for row in df.astype(object).itertuples(index=False):
+        values = []
+        for value in row:
+            if value is None or (isinstance(value, float) and value != value):
+                values.append("")
+            elif isinstance(value, float) and value.is_integer():
+                values.append(str(int(value)))
+            else:
+                values.append(str(value).strip())
+        rows.append(values)
+    return rows
+
+
+def row_hash(values):
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()[:16]
+
+
+def table_hash(columns, rows):
+    h = hashlib.sha256("\x1f".join(columns).encode("utf-8"))
+    for values in rows:
+        h.update(b"\x1e")
+        h.update("\x1f".join(values).encode("utf-8"))
+    return h.hexdigest()
+
+
+class SnapshotStore:
+    """
+    Versioned daily snapshots of scraped tables. A new version is written only when a
+    table's normalized content changes; unchanged days are recorded as references.
+    Versions are stored as a full base every `base_every` versions and as row-level
+    deltas (new row order + rows that weren't in the previous version) in between.
+
+    root/<table_name>/manifest.json
+    root/<table_name>/v0001.csv.gz          full version
+    root/<table_name>/v0002.delta.json.gz   delta against v0001
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, base_every=10):
+        self.root = root
+        self.base_every = base_every
+        self.lock = threading.Lock()
+
+    def table_dir(self, table_name):
+        return os.path.join(self.root, table_name)
+
+    def load_manifest(self, table_name):
+        path = os.path.join(self.table_dir(table_name), "manifest.json")
+        if not os.path.exists(path):
+            return {"versions": [], "snapshots": []}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_manifest(self, table_name, manifest):
+        path = os.path.join(self.table_dir(table_name), "manifest.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def save(self, table_name, df, date):
+        """Record `df` as the snapshot of `table_name` for `date`; returns "new" or "unchanged" """
+        columns = [str(col) for col in df.columns]
+        rows = normalize_rows(df)
+        content = table_hash(columns, rows)
+
+        with self.lock:
+            os.makedirs(self.table_dir(table_name), exist_ok=True)
+            manifest = self.load_manifest(table_name)
+            versions = manifest["versions"]
+            snapshots = [s for s in manifest["snapshots"] if s["date"] != str(date)]
+
+            if versions and versions[-1]["hash"] == content:
+                snapshots.append({"date": str(date), "version": versions[-1]["version"]})
+                manifest["snapshots"] = sorted(snapshots, key=lambda s: s["date"])
+                self.save_manifest(table_name, manifest)
+                return "unchanged"
+
+            number = len(versions) + 1
+            previous = self.rebuild(table_name, versions, versions[-1]["version"]) if versions else None
+            since_base = next((i for i, v in enumerate(reversed(versions)) if v["kind"] == "base"), None)
+            use_delta = (previous is not None and previous[0] == columns
+                         and since_base is not None and since_base + 1 < self.base_every)
+
+            if use_delta:
+                filename = f"v{number:04d}.delta.json.gz"
+                self.write_delta(table_name, filename, previous[1], rows)
+            else:
+                filename = f"v{number:04d}.csv.gz"
+                self.write_base(table_name, filename, columns, rows)
+
+            versions.append({
+                "version": number,
+                "hash": content,
+                "kind": "delta" if use_delta else "base",
+                "file": filename,
+                "date": str(date),
+                "rows": len(rows),
+            })
+            snapshots.append({"date": str(date), "version": number})
+            manifest["snapshots"] = sorted(snapshots, key=lambda s: s["date"])
+            self.save_manifest(table_name, manifest)
+            return "new"
+
+    def write_base(self, table_name, filename, columns, rows):
+        with gzip.open(os.path.join(self.table_dir(table_name), filename), "wt", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    def write_delta(self, table_name, filename, previous_rows, rows):
+        known = {row_hash(values) for values in previous_rows}
+        order = [row_hash(values) for values in rows]
+        added = {h: values for h, values in zip(order, rows) if h not in known}
+        with gzip.open(os.path.join(self.table_dir(table_name), filename), "wt", encoding="utf-8") as f:
+            json.dump({"order": order, "added": added}, f)
+
+    def rebuild(self, table_name, versions, version):
+        """(columns, rows) of `version`, replaying deltas from the last full base before it"""
+        chain = []
+        for v in versions[:version][::-1]:
+            chain.append(v)
+            if v["kind"] == "base":
+                break
+
+        columns, rows = None, None
+        for v in reversed(chain):
+            path = os.path.join(self.table_dir(table_name), v["file"])
+            if v["kind"] == "base":
+                with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+                    reader = csv.reader(f)
+                    columns = next(reader)
+                    rows = list(reader)
+            else:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    delta = json.load(f)
+                by_hash = {row_hash(values): values for values in rows}
+                by_hash.update(delta["added"])
+                rows = [by_hash[h] for h in delta["order"]]
+        return columns, rows
+
+    def version_as_of(self, table_name, date):
+        snapshots = [s for s in self.load_manifest(table_name)["snapshots"] if s["date"] <= str(date)]
+        return snapshots[-1]["version"] if snapshots else None
+
+    def read_as_of(self, table_name, date):
+        """The table as it was scraped on or before `date` (None if there is no snapshot yet)"""
+        version = self.version_as_of(table_name, date)
+        if version is None:
+            return None
+        columns, rows = self.rebuild(table_name, self.load_manifest(table_name)["versions"], version)
+
+        # Round-trip through CSV so columns get their types back
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        buffer.seek(0)
+        return pd.read_csv(buffer)
+
+    def changed_tables(self, since):
+        """Tables with a new version after `since` - the only ones downstream needs to reload"""
+        if not os.path.isdir(self.root):
+            return []
+        changed = []
+        for table_name in sorted(os.listdir(self.root)):
+            versions = self.load_manifest(table_name)["versions"]
+            if versions and versions[-1]["date"] > str(since):
+                changed.append(table_name)
+        return changed
+
+
+def get_snapshot_store(root=DEFAULT_ROOT):
+    """SnapshotStore when OUTPUT_FORMAT includes snapshot, else None"""
+    return SnapshotStore(root) if "snapshot" in OUTPUT_FORMATS else None
@@ -0,0 +1,97 @@
+# table_parser.py
+import re
+import numpy as np
+import pandas as pd
+from io import StringIO
+from lxml import etree
+
+# Rows that are layout, not data: repeated headers ("Reserves"), spacers, grouped headers
+SKIP_ROW_CLASSES = {"thead", "spacer", "over_header"}
+
+HTML_PARSER = etree.HTMLParser(remove_comments=True)
+
+CLOCK = re.compile(r"^-?\d+:\d{2}$")
+INT = re.compile(r"^[+-]?\d{1,3}(,?\d{3})*$")
+FLOAT = re.compile(r"^[+-]?(\d{1,3}(,?\d{3})*(\.\d*)?|\.\d+)$")
+
+
+def clock_to_seconds(value):
+    """'34:44' -> 2084"""
+    minutes, seconds = value.split(":")
+    sign = -1 if minutes.startswith("-") else 1
+    return sign * (abs(int(minutes)) * 60 + int(seconds))
+
+
+def read_table_columns(html, include_footer=False):
+    """
+    Read an fbref / basketball-reference table into {data-stat: [raw text, ...]}.
+    Cells are keyed by their `data-stat` attribute, so the result is always flat.
+    Player links carry an id in `data-append-csv`, kept as `<stat>_id`.
+    """
+    table = etree.fromstring(html, HTML_PARSER).find(".//table")
+    sections = table.findall("tbody") or [table]
+    if include_footer:
+        sections += table.findall("tfoot")
+
+    columns = {}
+    n_rows = 0
+
+    for section in sections:
+        for row in section.iterfind("tr"):
+            if SKIP_ROW_CLASSES.intersection((row.get("class") or "").split()):
+                continue
+
+            cells = {}
+            for cell in row:
+                stat = cell.get("data-stat")
+                if stat is None:
+                    continue
+                cells[stat] = "".join(cell.itertext()).strip()
+                ref = cell.get("data-append-csv")
+                if ref:
+                    cells[f"{stat}_id"] = ref
+            if not cells:
+                continue
+
+            for stat, value in cells.items():
+                if stat not in columns:
+                    columns[stat] = [None] * n_rows
+                columns[stat].append(value or None)
+            n_rows += 1
+
+            # Cells missing from this row (e.g. colspan "Did Not Play")
+            for values in columns.values():
+                if len(values) < n_rows:
+                    values.append(None)
+
+    return columns
+
+
+def nullable_ints(values, convert):
+    mask = np.array([v is None for v in values])
+    data = np.array([0 if v is None else convert(v) for v in values], dtype="int64")
+    return pd.arrays.IntegerArray(data, mask)
+
+
+def type_column(values):
+    """Pick one type for a whole column: clock -> int seconds, int, float, else text"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return np.array(values, dtype=object)
+
+    if all(CLOCK.match(v) for v in present):
+        return nullable_ints(values, clock_to_seconds)
+    if all(INT.match(v) for v in present):
+        return nullable_ints(values, lambda v: int(v.replace(",", "")))
+    if all(FLOAT.match(v) for v in present):
+        return np.array([np.nan if v is None else float(v.replace(",", "")) for v in values])
+    return np.array(values, dtype=object)
+
+
+def parse_table(html, include_footer=False):
+    """HTML table -> DataFrame with flat, typed columns named after `data-stat`"""
+    columns = read_table_columns(html, include_footer)
+    if not columns:
+        # Not a data-stat table (e.g. play-by-play) - fall back to the generic parser
+        return pd.read_html(StringIO(html))[0]
+    return pd.DataFrame({stat: type_column(values) for stat, values in columns.items()})
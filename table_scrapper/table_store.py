@@ -0,0 +1,152 @@
+# table_store.py
+import os
+import re
+import uuid
+import threading
+from datetime import datetime
+
+# Comma-separated: csv (default), parquet, snapshot; "both" = csv,parquet
+OUTPUT_FORMAT = os.environ.get("OUTPUT_FORMAT", "csv").lower()
+OUTPUT_FORMATS = set(OUTPUT_FORMAT.replace("both", "csv,parquet").replace(" ", "").split(","))
+WRITE_CSV = "csv" in OUTPUT_FORMATS
+
+DEFAULT_ROOT = "./warehouse"
+PARTITION_KEYS = ["sport", "competition", "table_kind", "date"]
+
+FBREF_COMPETITIONS = {"9": "premier_league", "8": "champions_league", "19": "europa_league"}
+
+
+class ParquetStore:
+    """
+    Parquet datasets partitioned as sport=/competition=/table_kind=/date=.
+    Tables are buffered per partition and written as one compressed part file per
+    partition on flush(), instead of one small file per table.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, compression="zstd", max_buffered_rows=500_000):
+        self.root = root
+        self.compression = compression
+        self.max_buffered_rows = max_buffered_rows
+        self.buffers = {}
+        self.buffered_rows = 0
+        self.lock = threading.Lock()
+
+    def write(self, df, sport, competition, table_kind, date, labels=None):
+        """Queue `df` for its partition; `labels` become constant columns (game_id, team, ...)"""
+        df = df.copy()
+        df.columns = [flat_column_name(col) for col in df.columns]
+        for name, value in (labels or {}).items():
+            df[name] = value
+
+        key = (sport, competition, table_kind, str(date))
+        with self.lock:
+            self.buffers.setdefault(key, []).append(df)
+            self.buffered_rows += len(df)
+            if self.buffered_rows >= self.max_buffered_rows:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for key, frames in self.buffers.items():
+            table = pa.Table.from_pandas(pd.concat(frames, ignore_index=True), preserve_index=False)
+            table = table.cast(arrow_schema(table.schema))
+
+            folder = os.path.join(self.root, *(f"{k}={v}" for k, v in zip(PARTITION_KEYS, key)))
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"part-{uuid.uuid4().hex}.parquet")
+            pq.write_table(table, path, compression=self.compression)
+            print(f"🗄 Wrote {table.num_rows} rows to {path}")
+
+        self.buffers = {}
+        self.buffered_rows = 0
+
+    def close(self):
+        self.flush()
+
+
+def arrow_schema(schema):
+    """Pin a stable schema: untyped / all-null columns become strings"""
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        if pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def flat_column_name(column):
+    # read_html fallback tables can still carry two-level headers
+    if isinstance(column, tuple):
+        parts = [str(c) for c in column if not str(c).startswith("Unnamed")]
+        return "_".join(parts) or "col"
+    return str(column)
+
+
+def get_store(root=DEFAULT_ROOT):
+    """ParquetStore when OUTPUT_FORMAT asks for parquet, else None"""
+    return ParquetStore(root) if "parquet" in OUTPUT_FORMATS else None
+
+
+def fbref_partition(page_url, table_id, table_name):
+    """Partition + labels for an fbref table, partitioned by scrape date"""
+    comp = re.search(r"/comps/(\d+)/", page_url) or re.search(r"_(\d+)$", table_id)
+    competition = FBREF_COMPETITIONS.get(comp.group(1), comp.group(1)) if comp else "all"
+    squad = re.search(r"/squads/[^/]+/(.+?)-Stats", page_url)
+
+    labels = {"source_table": table_name, "table_id": table_id}
+    if squad:
+        labels["squad"] = squad.group(1).replace("-", " ")
+    return {
+        "sport": "football",
+        "competition": competition,
+        "table_kind": re.sub(r"_\d+$", "", table_id),
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "labels": labels,
+    }
+
+
+def nba_partition(game_id, table_id):
+    """Partition + labels for a basketball-reference game table, partitioned by game date"""
+    labels = {"game_id": game_id}
+    box = re.match(r"box-(\w+)-(\w+)-(\w+)$", table_id)
+    if box:
+        table_kind = f"box_{box.group(3)}"
+        labels.update(team=box.group(1), period=box.group(2))
+    else:
+        table_kind = table_id
+    return {
+        "sport": "nba",
+        "competition": "nba",
+        "table_kind": table_kind,
+        "date": datetime.strptime(game_id[:8], "%Y%m%d").strftime("%Y-%m-%d"),
+        "labels": labels,
+    }
+
+
+def read_tables(root=DEFAULT_ROOT, columns=None, filter=None):
+    """
+    Read a partitioned dataset back as a DataFrame. Partition filters prune folders,
+    `columns` limits what is read from each file, e.g.
+
+        read_tables(columns=["player", "pts"],
+                    filter=(ds.field("table_kind") == "box_basic") & (ds.field("date") >= "2025-11-01"))
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    # Files written on different days may differ slightly (e.g. a "reason" column)
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments(filter=filter)]
+    if schemas:
+        schema = pa.unify_schemas(schemas + [dataset.partitioning.schema], promote_options="permissive")
+        dataset = ds.dataset(root, format="parquet", partitioning="hive", schema=schema)
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
@@ -0,0 +1,15 @@
+# conftest.py
+# Tests run from the repository root: `python -m pytest tests`. The loader, analysis and
+# API modules import each other as top-level modules, as when run from their own folders.
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "data_loader"))
+sys.path.insert(0, os.path.join(ROOT, "data_loader", "nba_stats_analyses"))
+sys.path.insert(0, os.path.join(ROOT, "my_api"))
+
+# nba_database binds its engine on import: never to a real database from the tests
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'nba_test.db')}"
@@ -0,0 +1,76 @@
+# test_api.py
+# The JSON endpoints on an empty (or nearly empty) database: ETag revalidation and the
+# 400 answers to bad parameters
+from datetime import date
+import pandas as pd
+import pytest
+from nba_database import Base, NBAGameBasic, engine
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    import app as api
+    api.cache.clear()
+    return api.app.test_client()
+
+
+def box_rows(game_date, team, opponent, home_away, players):
+    """Basic game rows of one team's box score"""
+    return [{'player': player, 'period': 'game', 'game_date': game_date, 'team': team, 'opponent': opponent,
+             'home_away': home_away, 'mp_seconds': 1800, 'pts': pts}
+            for player, pts in players.items()]
+
+
+def test_conditional_requests(client):
+    response = client.get('/api/teams/ratings')
+    assert response.status_code == 200
+    assert response.get_json() == []
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    etag = response.headers['ETag']
+    revalidated = client.get('/api/teams/ratings', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert client.get('/api/teams/ratings', headers={'If-None-Match': '"stale"'}).status_code == 200
+
+
+@pytest.mark.parametrize('url, error', [
+    ('/api/players/compare', "players is required"),
+    ('/api/players/compare?players=A&stat=bogus', "No nba_player_aggregate sums of: bogus"),
+    ('/api/players/compare?players=A&season=2026-27', "season must be a number, not '2026-27'"),
+    ('/api/teams/ratings?season=x', "season must be a number, not 'x'"),
+    ('/api/players/A/games?period=q9', "Unknown period: q9"),
+    ('/api/players/A/games?since=11/01', "since must be a YYYY-MM-DD date, not '11/01'"),
+    ('/api/players/A/games?limit=0', "limit must be at least 1, not 0"),
+    ('/api/players/A/games?limit=-3', "limit must be at least 1, not -3"),
+    ('/api/players/A/games?limit=ten', "limit must be a number, not 'ten'"),
+    ('/api/predictions?min_confidence=high', "min_confidence must be a number, not 'high'"),
+])
+def test_bad_parameters(client, url, error):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+
+def test_unknown_paths_answer_json(client):
+    response = client.get('/api/nope')
+    assert response.status_code == 404
+    assert 'error' in response.get_json()
+
+
+def test_game_log_teams(client):
+    rows = box_rows(date(2025, 10, 21), 'GSW', 'LAL', 'AWAY', {'Curry': 30}) + \
+        box_rows(date(2025, 10, 21), 'LAL', 'GSW', 'HOME', {'James': 25}) + \
+        box_rows(date(2025, 10, 23), 'GSW', 'DEN', 'HOME', {'Curry': 35}) + \
+        box_rows(date(2025, 10, 23), 'DEN', 'GSW', 'AWAY', {'Jokic': 28})
+    pd.DataFrame(rows).to_sql(NBAGameBasic.__tablename__, engine, if_exists='append', index=False)
+
+    games = client.get('/api/players/Curry/games').get_json()
+    assert [(game['game_date'], game['team'], game['opponent'], game['home_away'], game['pts']) for game in games] == [
+        ('2025-10-23', 'GSW', 'DEN', 'HOME', 35),
+        ('2025-10-21', 'GSW', 'LAL', 'AWAY', 30),
+    ]
+    james, = client.get('/api/players/James/games?limit=1').get_json()
+    assert (james['team'], james['opponent']) == ('LAL', 'GSW')
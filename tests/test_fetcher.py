@@ -0,0 +1,125 @@
+# test_fetcher.py
+# PageFetcher over plain HTTP against a local http.server, with a recording stand-in for
+# the Selenium fallback
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from table_scrapper.fetcher import HttpFetcher, PageFetcher
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Serves server.pages {path: (status, body)} over HTTP/1.1 and logs (path, client port)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1]))
+        status, body = self.server.pages.get(self.path, (404, "missing"))
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BrowserStub:
+    """Stands in for SeleniumFetcher: returns `page_source` and logs the urls it loads"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        self.urls = []
+
+    def fetch(self, url):
+        self.urls.append(url)
+        return self.page_source
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.pages = {
+        "/one.html": (200, "<table id='one'></table>"),
+        "/two.html": (200, "<!-- <table id='two'></table> -->"),
+        "/busy.html": (429, "slow down"),
+    }
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def browser():
+    return BrowserStub("<table id='one'></table><table id='rendered'></table>")
+
+
+def test_one_session_across_fetches(server, browser):
+    fetcher = PageFetcher(HttpFetcher(pool_size=1, timeout=5), browser)
+    session = fetcher.backend.session
+    try:
+        assert fetcher.fetch(server.url + "/one.html") == "<table id='one'></table>"
+        assert fetcher.get_table(server.url + "/two.html", "two") == "<table id='two'></table>"
+        assert fetcher.fetch_source(server.url + "/one.html") == "<table id='one'></table>"
+    finally:
+        fetcher.close()
+
+    # Every request went over the same kept-alive connection of the same session
+    assert fetcher.backend.session is session
+    assert [path for path, _ in server.requests] == ["/one.html", "/two.html", "/one.html"]
+    assert len({port for _, port in server.requests}) == 1
+    assert browser.urls == []
+
+
+def test_browser_only_as_fallback(server, browser):
+    fetcher = PageFetcher(HttpFetcher(pool_size=1, timeout=5), browser)
+    try:
+        # Served over HTTP: the browser isn't touched
+        assert fetcher.get_table(server.url + "/one.html", "one") == "<table id='one'></table>"
+        assert browser.urls == []
+
+        # Not in the served HTML: the page is loaded once more, in the browser
+        assert fetcher.get_table(server.url + "/one.html", "rendered") == "<table id='rendered'></table>"
+        assert browser.urls == [server.url + "/one.html"]
+
+        # HTTP errors fall back, but throttling is left to the caller to back off from
+        assert fetcher.fetch(server.url + "/gone.html") == browser.page_source
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(server.url + "/busy.html")
+        assert browser.urls == [server.url + "/one.html", server.url + "/gone.html"]
+    finally:
+        fetcher.close()
+
+
+def test_tables_of_a_fetched_page(browser):
+    fetcher = PageFetcher(HttpFetcher(), browser)
+    page_source = "<!-- <table id='two'></table> -->"
+    assert fetcher.get_tables("http://x/page", page_source, ["two"]) == {"two": "<table id='two'></table>"}
+    assert browser.urls == []
+
+    # Every table the served HTML lacks is looked for in one browser load
+    tables = fetcher.get_tables("http://x/page", page_source, ["two", "rendered", "never"])
+    assert tables == {"two": "<table id='two'></table>", "rendered": "<table id='rendered'></table>", "never": None}
+    assert browser.urls == ["http://x/page"]
+    assert fetcher.url is None
+    fetcher.close()
+
+
+def test_no_fallback_raises(server):
+    fetcher = PageFetcher(HttpFetcher(pool_size=1, timeout=5))
+    try:
+        assert fetcher.get_table(server.url + "/one.html", "rendered") is None
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(server.url + "/gone.html")
+    finally:
+        fetcher.close()
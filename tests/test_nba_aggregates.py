@@ -0,0 +1,89 @@
+# test_nba_aggregates.py
+# Aggregates kept by write_frames' deltas match a rebuild from the box score tables after
+# files are added, reloaded with changes and re-scraped under a new name
+from datetime import date, datetime
+import pandas as pd
+import pytest
+from nba_aggregates import rebuild_aggregates
+from nba_data_loader import NBADataLoader
+from nba_database import Base, NBAGameAdvanced, NBAGameBasic, NBAPlayerAggregate, NBATeamAggregate, engine
+
+BASIC = NBAGameBasic.__tablename__
+ADVANCED = NBAGameAdvanced.__tablename__
+
+
+@pytest.fixture
+def loader(tmp_path):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    loader = NBADataLoader(str(tmp_path))
+    yield loader
+    loader.close()
+
+
+def box_file(source_file, game_date, team, opponent, home_away, players):
+    """Basic and advanced rows of one box score file: players is {name: (pts, trb, off_rtg)}"""
+    meta = {'game_date': game_date, 'team': team, 'opponent': opponent, 'home_away': home_away,
+            'source_file': source_file, 'created_at': datetime.now()}
+    # The other stats are missing, as in an older layout
+    basic = pd.DataFrame([{'player': player, 'period': 'game', **dict.fromkeys(NBAPlayerAggregate.stats),
+                           'mp_seconds': 1800 if pts is not None else None, 'pts': pts, 'trb': trb, **meta}
+                          for player, (pts, trb, _) in players.items()])
+    advanced = pd.DataFrame([{'player': player, 'off_rtg': off_rtg, 'def_rtg': 110.0, **meta}
+                             for player, (_, _, off_rtg) in players.items()])
+    return {BASIC: basic, ADVANCED: advanced}
+
+
+def aggregates():
+    with engine.connect() as connection:
+        return {model: pd.read_sql(f"SELECT * FROM {model.__tablename__}", connection)
+                .sort_values(list(model.natural_key)).reset_index(drop=True)
+                for model in (NBAPlayerAggregate, NBATeamAggregate)}
+
+
+def assert_matches_rebuild():
+    maintained = aggregates()
+    with engine.begin() as connection:
+        rebuild_aggregates(connection)
+    for model, frame in aggregates().items():
+        pd.testing.assert_frame_equal(maintained[model], frame, check_dtype=False)
+    return maintained
+
+
+def test_deltas_match_a_rebuild(loader):
+    opening = date(2025, 10, 21)
+    loader.write_frames(box_file('g1_box-GSW-game-basic_2025-10-22.csv', opening, 'GSW', 'LAL', 'AWAY',
+                                 {'Curry': (30, 5, 120.0), 'Green': (8, 9, 105.0), 'Podziemski': (None, 0, None)}))
+    loader.write_frames(box_file('g1_box-LAL-game-basic_2025-10-22.csv', opening, 'LAL', 'GSW', 'HOME',
+                                 {'James': (25, 8, 115.0), 'Reaves': (20, 3, 111.0)}))
+    # A game of the season before
+    loader.write_frames(box_file('g0_box-GSW-game-basic_2025-04-10.csv', date(2025, 4, 10), 'GSW', 'HOU', 'HOME',
+                                 {'Curry': (40, 4, 130.0)}))
+    maintained = assert_matches_rebuild()
+
+    players = maintained[NBAPlayerAggregate].set_index(['player', 'season'])
+    assert players.loc[('Curry', 2026), 'pts_sum'] == 30
+    assert players.loc[('Curry', 2025), 'pts_sum'] == 40
+    assert players.loc[('Podziemski', 2026), ['games', 'pts_n']].tolist() == [1, 0]
+    teams = maintained[NBATeamAggregate].set_index(['team', 'season'])
+    assert teams.loc[('GSW', 2026), 'off_rtg_n'] == 2
+    assert teams.loc[('LAL', 2026), 'off_rtg_sum'] == 226.0
+
+    # The same file reloaded with a corrected line and without a player
+    loader.write_frames(box_file('g1_box-GSW-game-basic_2025-10-22.csv', opening, 'GSW', 'LAL', 'AWAY',
+                                 {'Curry': (31, 5, 121.0), 'Green': (8, 10, 105.0)}))
+    maintained = assert_matches_rebuild()
+    assert 'Podziemski' not in maintained[NBAPlayerAggregate]['player'].tolist()
+
+    # A later scrape of the other box score under a new file name replaces the earlier rows
+    loader.write_frames(box_file('g1_box-LAL-game-basic_2025-10-23.csv', opening, 'LAL', 'GSW', 'HOME',
+                                 {'James': (26, 8, 116.0), 'Reaves': (20, 3, 111.0)}))
+    maintained = assert_matches_rebuild()
+    players = maintained[NBAPlayerAggregate].set_index(['player', 'season'])
+    assert players.loc[('James', 2026), ['games', 'pts_sum']].tolist() == [1, 26]
+
+    # Reloading an unchanged file changes nothing
+    loader.write_frames(box_file('g1_box-LAL-game-basic_2025-10-23.csv', opening, 'LAL', 'GSW', 'HOME',
+                                 {'James': (26, 8, 116.0), 'Reaves': (20, 3, 111.0)}))
+    for model, frame in aggregates().items():
+        pd.testing.assert_frame_equal(maintained[model], frame, check_dtype=False)
@@ -0,0 +1,50 @@
+# test_nba_arrow.py
+# The SQLite (pd.read_sql) path of nba_arrow: one schema across chunks and for empty results
+import datetime
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine, text
+from nba_arrow import arrow_batches, iter_frames, read_arrow, read_frame
+
+SCHEMA = pa.schema([('id', pa.int64()), ('dnp_reason', pa.string()), ('fg_pct', pa.float64()),
+                    ('game_date', pa.date32()), ('is_starter', pa.bool_())])
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'arrow.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE box (id INTEGER, dnp_reason VARCHAR(40), fg_pct FLOAT, "
+                                "game_date DATE, is_starter BOOLEAN)"))
+        # The first rows have no dnp_reason and whole-number percentages
+        connection.execute(text("INSERT INTO box VALUES (:id, :dnp_reason, :fg_pct, :game_date, :is_starter)"), [
+            {'id': i, 'dnp_reason': 'Rest' if i >= 10 else None, 'fg_pct': 1 if i < 10 else i / 20,
+             'game_date': datetime.date(2025, 11, 1 + i), 'is_starter': i % 2 == 0}
+            for i in range(20)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def test_chunks_share_one_schema(engine):
+    batches = list(arrow_batches(engine, "SELECT * FROM box ORDER BY id", batch_rows=4))
+    assert len(batches) == 5
+    assert all(batch.schema == SCHEMA for batch in batches)
+
+    table = read_arrow(engine, "SELECT * FROM box ORDER BY id")
+    assert table.schema == SCHEMA
+    assert table.column('dnp_reason').null_count == 10
+    assert table.column('game_date')[0].as_py() == datetime.date(2025, 11, 1)
+    assert sum(len(frame) for frame in iter_frames(engine, "SELECT * FROM box", batch_rows=7)) == 20
+
+
+def test_empty_result_is_typed(engine):
+    batches = list(arrow_batches(engine, "SELECT * FROM box WHERE id < :id", id=0))
+    assert len(batches) == 1
+    assert batches[0].num_rows == 0
+    assert batches[0].schema == SCHEMA
+
+    frame = read_frame(engine, "SELECT id, SUM(fg_pct) AS fg_pct FROM box WHERE id IN :ids GROUP BY id", ids=[-1])
+    assert list(frame.columns) == ['id', 'fg_pct']
+    assert len(frame) == 0
+    assert frame['fg_pct'].dtype.pyarrow_dtype == pa.float64()
@@ -0,0 +1,56 @@
+# test_nba_backtest.py
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from nba_backtest import LINE_OFFSETS, backtest, replay, variant_grid
+from nba_predictions import STATS
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'games.db'}"
+    engine = create_engine(url)
+    rng = np.random.default_rng(11)
+    rows = [{'player': player, 'period': 'game', 'game_date': datetime.date(2025, 11, 1) + datetime.timedelta(days=day),
+             'team': team, 'opponent': 'NYK' if team == 'BOS' else 'BOS', 'mp_seconds': 1800,
+             **{stat: int(rng.poisson(mean)) for stat, mean in zip(STATS, (18, 6, 4, 1, 1, 2, 2))}}
+            for day in range(20) for player, team in (('Ann', 'BOS'), ('Bea', 'BOS'), ('Cal', 'NYK'))]
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE TABLE nba_game_basic (player VARCHAR(100), period VARCHAR(10), "
+                                f"game_date DATE, team VARCHAR(10), opponent VARCHAR(10), mp_seconds INTEGER, "
+                                f"{', '.join(f'{stat} INTEGER' for stat in STATS)})"))
+    pd.DataFrame(rows).to_sql('nba_game_basic', engine, if_exists='append', index=False)
+    engine.dispose()
+    return url
+
+
+def test_pool_matches_in_process(database_url):
+    games = replay(database_url, start=datetime.date(2025, 11, 5))
+    assert games['stats'] == list(STATS)
+    assert len(games['player']) == 3 * 16
+    variants = variant_grid()
+    in_process = backtest(games, variants, workers=1)
+    pd.testing.assert_frame_equal(backtest(games, variants, workers=2, variants_per_task=2), in_process)
+    assert in_process['bets'].sum() > 0
+    pd.testing.assert_frame_equal(backtest(games, variants, lines=LINE_OFFSETS, relative=True, workers=2),
+                                  backtest(games, variants, lines=LINE_OFFSETS, relative=True, workers=1))
+
+
+def test_replayed_stats_are_scored(database_url):
+    start = datetime.date(2025, 11, 5)
+    full = backtest(replay(database_url, start=start), workers=1)
+    games = replay(database_url, start=start, stats=('ast', 'pts'))
+    assert games['actual'].shape == (3 * 16, 2)
+    some = backtest(games, workers=1)
+    assert sorted(some['stat'].unique()) == ['ast', 'pts']
+    for stat in ('ast', 'pts'):
+        pd.testing.assert_frame_equal(some[some['stat'] == stat].reset_index(drop=True),
+                                      full[full['stat'] == stat].reset_index(drop=True))
+
+
+def test_nothing_to_replay(database_url):
+    games = replay(database_url, start=datetime.date(2026, 1, 1))
+    assert len(games['player']) == 0
+    assert backtest(games, workers=1)['bets'].sum() == 0
@@ -0,0 +1,112 @@
+# test_nba_box_schema.py
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from nba_box_schema import ADVANCED_LAYOUT, BASIC_LAYOUT, coerce_frame, output_columns
+from nba_database import (Base, NBAGameBasic, NBAPlayerAggregate, create_legacy_views, drop_legacy_views, engine,
+                          ensure_partitions, migrate_dnp_stats)
+
+BOX = pd.DataFrame({
+    'player': ['Curry', 'Green', 'Kuminga', 'Payton', 'Post'],
+    'mp': ['34:44', '5:07', 'Did Not Play', 'Not With Team', 1800],
+    'fg_pct': ['.500', ',', 'Did Not Play', 'Not With Team', None],
+    'pts': ['30', '+2', 'Did Not Play', 'Not With Team', '4'],
+    'plus_minus': ['+12', '-3', 'Did Not Play', 'Not With Team', ''],
+}, index=[3, 4, 7, 8, 9])
+
+
+def test_minutes_become_seconds():
+    coerced, problems = coerce_frame(BOX, BASIC_LAYOUT)
+    assert list(coerced.columns) == output_columns(BASIC_LAYOUT)
+    assert coerced.index.tolist() == [3, 4, 7, 8, 9]
+    # table_parser files already hold seconds
+    assert coerced['mp_seconds'].tolist()[:2] + coerced['mp_seconds'].tolist()[4:] == [2084, 307, 1800]
+    assert problems == {}
+
+
+def test_players_who_did_not_play_have_no_stats():
+    coerced, _ = coerce_frame(BOX, BASIC_LAYOUT)
+    assert coerced['dnp_reason'].isna().tolist() == [True, True, False, False, True]
+    assert coerced['dnp_reason'][[7, 8]].tolist() == ['Did Not Play', 'Not With Team']
+    dnp = coerced.loc[[7, 8]]
+    assert dnp.drop(columns='dnp_reason').isna().all().all()
+    # Ints stay ints, nullable where a row has none
+    assert coerced['pts'].dtype == 'Int64' and coerced['pts'].tolist()[:2] == [30, 2]
+
+
+def test_blank_cells_take_the_default():
+    coerced, _ = coerce_frame(BOX, BASIC_LAYOUT)
+    played = coerced.loc[[3, 4, 9]]
+    assert played['fg_pct'].tolist() == [0.5, 0.0, 0.0]
+    assert played['plus_minus'].tolist() == [12, -3, 0]
+    # Columns the file doesn't have
+    assert played['fg3'].tolist() == [0, 0, 0] and played['gm_sc'].tolist() == [0.0, 0.0, 0.0]
+
+    coerced, _ = coerce_frame(BOX[['player', 'pts']], BASIC_LAYOUT)
+    assert coerced['mp_seconds'].isna().all() and coerced['dnp_reason'].isna().all()
+    assert coerced['pts'].dtype == 'int64'
+
+
+def test_unreadable_cells_are_reported():
+    df = pd.DataFrame({'mp': ['12:00', '?', '30:15'], 'ts_pct': ['.612', 'n/a', '.5.5'], 'off_rtg': ['110', '98', 'x']})
+    coerced, problems = coerce_frame(df, ADVANCED_LAYOUT)
+    assert {column: cells.to_dict() for column, cells in problems.items()} == {
+        'mp': {1: '?'}, 'ts_pct': {1: 'n/a', 2: '.5.5'}, 'off_rtg': {2: 'x'}}
+    assert coerced['mp_seconds'].isna().tolist() == [False, True, False]
+    assert coerced['ts_pct'].tolist() == [0.612, 0.0, 0.0]
+    assert coerced['dnp_reason'].isna().all()
+
+
+def test_empty_frame():
+    coerced, problems = coerce_frame(BOX.iloc[:0], BASIC_LAYOUT)
+    assert coerced.empty and list(coerced.columns) == output_columns(BASIC_LAYOUT) and problems == {}
+
+
+@pytest.fixture
+def database():
+    drop_legacy_views()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield
+    drop_legacy_views()
+
+
+def add_rows(rows):
+    """Game rows of one box score: rows is {player: {column: value}}, other stats are NULL"""
+    game_date = date(2025, 10, 21)
+    ensure_partitions(NBAGameBasic.__tablename__, [game_date])
+    with engine.begin() as connection:
+        connection.execute(NBAGameBasic.__table__.insert(), [
+            {'player': player, 'period': 'game', 'game_date': game_date, 'team': 'GSW', 'opponent': 'LAL',
+             'home_away': 'AWAY', 'source_file': 'g1.csv', 'created_at': datetime.now(),
+             **dict.fromkeys(NBAPlayerAggregate.stats), 'dnp_reason': None, **row}
+            for player, row in rows.items()])
+
+
+def test_legacy_view_rebuilds_the_text_minutes(database):
+    add_rows({'Curry': {'mp_seconds': 2084, 'pts': 30}, 'Green': {'mp_seconds': 307, 'pts': 2},
+              'Kuminga': {'dnp_reason': 'Did Not Play'}, 'Payton': {'dnp_reason': 'Not With Team'},
+              'Post': {}})
+    create_legacy_views()
+    with engine.connect() as connection:
+        legacy = pd.read_sql("SELECT * FROM nba_game_basic_legacy ORDER BY player", connection)
+    assert 'mp_seconds' not in legacy and 'dnp_reason' not in legacy
+    assert set(legacy.columns) == {column.name for column in NBAGameBasic.__table__.columns} - \
+        {'mp_seconds', 'dnp_reason'} | {'mp'}
+    assert legacy['mp'].tolist()[:4] == ['34:44', '05:07', 'DNP', 'Not With T']
+    assert pd.isna(legacy['mp'].tolist()[4])
+
+
+def test_zero_stats_of_players_who_did_not_play_are_cleared(database):
+    zeros = dict.fromkeys(NBAPlayerAggregate.stats[1:], 0)
+    zeros.update(fg_pct=0.0, fg3_pct=0.0, ft_pct=0.0, gm_sc=0.0)
+    add_rows({'Curry': {'mp_seconds': 2084, **zeros, 'pts': 30}, 'Kuminga': {'dnp_reason': 'Did Not Play', **zeros},
+              'Payton': {'dnp_reason': 'Not With Team', **zeros, 'pts': 2}})
+    migrate_dnp_stats()
+    with engine.connect() as connection:
+        rows = pd.read_sql("SELECT player, pts, fg_pct FROM nba_game_basic ORDER BY player", connection)
+        assert connection.execute(text("SELECT COUNT(*) FROM nba_player_aggregate")).scalar() == 0
+    # Only rows with every stat 0 are the loader's old defaults
+    assert rows['pts'].tolist()[0] == 30 and np.isnan(rows['pts'][1]) and rows['pts'][2] == 2
@@ -0,0 +1,110 @@
+# test_nba_data_loader.py
+# Box score files load with their own team as `team`, and tables loaded before that are
+# migrated to it
+from datetime import date, datetime
+import pandas as pd
+import pytest
+from nba_aggregates import rebuild_aggregates
+from nba_data_loader import NBADataLoader
+from nba_database import (Base, NBAGameAdvanced, NBAGameBasic, NBALoadLedger, engine, ensure_partitions,
+                          migrate_teams)
+
+GSW_AT_LAL = "202510210LAL_box-GSW-game-basic_2025-10-22.csv"
+LAL_HOSTS_GSW = "202510210LAL_box-LAL-game-basic_2025-10-22.csv"
+BOS_HOSTS = "202510220BOS_box-BOS-game-basic_2025-10-23.csv"
+
+
+@pytest.fixture
+def folder(tmp_path):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    folder = tmp_path / "nba_data"
+    folder.mkdir()
+    return folder
+
+
+def write_box(folder, filename, players):
+    """A table_parser box score CSV: players is {name: (mp, pts)}"""
+    pd.DataFrame([{'player': player, 'mp': mp, 'pts': pts} for player, (mp, pts) in players.items()]) \
+        .to_csv(folder / filename, index=False)
+
+
+def load(folder):
+    loader = NBADataLoader(str(folder))
+    try:
+        loader.load_all_data(bulk=True)
+    finally:
+        loader.close()
+    with engine.connect() as connection:
+        rows = pd.read_sql("SELECT player, team, opponent, home_away, mp_seconds, pts FROM nba_game_basic "
+                           "ORDER BY player", connection)
+        ledgered = pd.read_sql("SELECT source_file FROM nba_load_ledger", connection)['source_file']
+    return rows, sorted(ledgered)
+
+
+def test_rows_take_the_box_score_team(folder):
+    write_box(folder, GSW_AT_LAL, {'Curry': ('34:10', 30)})
+    write_box(folder, LAL_HOSTS_GSW, {'James': ('36:00', 25)})
+    # No away box score of this game yet: its opponent isn't known
+    write_box(folder, BOS_HOSTS, {'Tatum': ('38:00', 31)})
+
+    loader = NBADataLoader(str(folder))
+    loader.box_score_files()
+    assert {key: loader.parse_filename(GSW_AT_LAL)[key] for key in ('team', 'opponent', 'home_away')} == \
+        {'team': 'GSW', 'opponent': 'LAL', 'home_away': 'AWAY'}
+    assert {key: loader.parse_filename(LAL_HOSTS_GSW)[key] for key in ('team', 'opponent', 'home_away')} == \
+        {'team': 'LAL', 'opponent': 'GSW', 'home_away': 'HOME'}
+    assert loader.parse_filename(BOS_HOSTS)['opponent'] is None
+    loader.close()
+
+    rows, ledgered = load(folder)
+    assert rows.values.tolist() == [['Curry', 'GSW', 'LAL', 'AWAY', 2050, 30], ['James', 'LAL', 'GSW', 'HOME', 2160, 25]]
+    # The skipped file isn't ledgered, so it loads once its game's away box score is there
+    assert ledgered == [GSW_AT_LAL, LAL_HOSTS_GSW]
+
+    write_box(folder, "202510220BOS_box-NYK-game-basic_2025-10-23.csv", {'Brunson': ('35:00', 27)})
+    rows, ledgered = load(folder)
+    assert rows[rows['player'] == 'Tatum'].values.tolist() == [['Tatum', 'BOS', 'NYK', 'HOME', 2280, 31]]
+    assert len(ledgered) == 4
+
+
+def old_rows(model, game_date, game_team, box_team, players, source_file):
+    """Rows as loaded before: the game id's team as `team`, the box score's as `opponent`"""
+    rows = [{'player': player, 'game_date': game_date, 'team': game_team, 'opponent': box_team,
+             'home_away': 'HOME' if box_team == game_team else 'AWAY', 'source_file': source_file,
+             'created_at': datetime.now(), **({'period': 'game', 'pts': 20} if model is NBAGameBasic else {})}
+            for player in players]
+    ensure_partitions(model.__tablename__, [game_date])
+    with engine.begin() as connection:
+        connection.execute(model.__table__.insert(), rows)
+
+
+def test_migrate_teams(folder):
+    for model in (NBAGameBasic, NBAGameAdvanced):
+        old_rows(model, date(2025, 10, 21), 'LAL', 'GSW', ['Curry', 'Green'], GSW_AT_LAL)
+        old_rows(model, date(2025, 10, 21), 'LAL', 'LAL', ['James'], LAL_HOSTS_GSW)
+        old_rows(model, date(2025, 10, 22), 'BOS', 'BOS', ['Tatum'], BOS_HOSTS)
+    with engine.begin() as connection:
+        connection.execute(NBALoadLedger.__table__.insert(), [
+            {'source_file': source_file, 'file_size': 1, 'file_mtime': 0.0, 'content_hash': '', 'row_count': 1}
+            for source_file in (GSW_AT_LAL, LAL_HOSTS_GSW, BOS_HOSTS)])
+        rebuild_aggregates(connection)
+
+    migrate_teams()
+    with engine.connect() as connection:
+        for model in (NBAGameBasic, NBAGameAdvanced):
+            rows = pd.read_sql(f"SELECT player, team, opponent, home_away FROM {model.__tablename__} ORDER BY player",
+                               connection)
+            assert rows.values.tolist() == [['Curry', 'GSW', 'LAL', 'AWAY'], ['Green', 'GSW', 'LAL', 'AWAY'],
+                                            ['James', 'LAL', 'GSW', 'HOME']]
+        # Tatum's opponent can't be told: the file is loaded again and the aggregates rebuilt
+        assert pd.read_sql("SELECT source_file FROM nba_load_ledger ORDER BY source_file", connection)[
+            'source_file'].tolist() == [GSW_AT_LAL, LAL_HOSTS_GSW]
+        assert pd.read_sql("SELECT * FROM nba_player_aggregate", connection).empty
+        assert pd.read_sql("SELECT * FROM nba_team_aggregate", connection).empty
+
+    # Migrated tables are left alone
+    migrate_teams()
+    with engine.connect() as connection:
+        assert pd.read_sql("SELECT team FROM nba_game_basic ORDER BY player", connection)['team'].tolist() == \
+            ['GSW', 'GSW', 'LAL']
@@ -0,0 +1,87 @@
+# test_nba_file_catalog.py
+import os
+from datetime import date
+import pytest
+from nba_file_catalog import FileCatalog, parse_filename
+
+
+def test_parse_filename():
+    assert parse_filename("202510210LAL_box-GSW-q1-basic_2025-11-28.csv") == {
+        "filename": "202510210LAL_box-GSW-q1-basic_2025-11-28.csv",
+        "game_id": "202510210LAL",
+        "game_date": date(2025, 10, 21),
+        "home_team": "LAL",
+        "table_name": "box-GSW-q1-basic",
+        "kind": "box",
+        "box_team": "GSW",
+        "period": "q1",
+        "stat_type": "basic",
+        "scrape_date": date(2025, 11, 28),
+    }
+    pbp = parse_filename("202510210LAL_pbp_2025-11-28.csv")
+    assert (pbp["kind"], pbp["box_team"], pbp["period"]) == ("pbp", None, None)
+    assert parse_filename("202511100MIA_box-CLE-ot1-advanced_2025-11-28.csv")["period"] == "ot1"
+
+    assert parse_filename("notes.csv") is None
+    assert parse_filename("202510210LAL_box-GSW-q1-basic_2025-11-28.txt") is None
+    assert parse_filename("202513400LAL_box-GSW-q1-basic_2025-11-28.csv") is None  # no such date
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "nba_data"
+    folder.mkdir()
+    return folder
+
+
+def write(folder, filename, text="player,pts\n"):
+    (folder / filename).write_text(text)
+
+
+def test_refresh_tracks_the_folder(folder):
+    write(folder, "202510210LAL_box-LAL-game-basic_2025-11-28.csv")
+    write(folder, "202510210LAL_pbp_2025-11-28.csv")
+    write(folder, "readme.txt")
+    catalog = FileCatalog(str(folder))
+    try:
+        assert catalog.refresh() == (2, 0, 0)
+        # Nothing listed again while the folder is unchanged
+        assert catalog.refresh() == (0, 0, 0)
+        # Only the other box score names the away team
+        assert catalog.find(kind="box")[0]["away_team"] is None
+
+        write(folder, "202510210LAL_box-GSW-game-basic_2025-11-28.csv")
+        assert catalog.refresh() == (1, 0, 0)
+        assert {row["away_team"] for row in catalog.find(game_id="202510210LAL")} == {"GSW"}
+        assert catalog.away_teams() == {"202510210LAL": "GSW"}
+        assert [row["filename"] for row in catalog.find(team="GSW")] == ["202510210LAL_box-GSW-game-basic_2025-11-28.csv"]
+
+        # Rewritten in place: only a full refresh sees it
+        write(folder, "202510210LAL_pbp_2025-11-28.csv", "player,pts\nJames,25\n")
+        assert catalog.refresh(full=True) == (0, 1, 0)
+        assert catalog.find(kind="pbp")[0]["file_size"] == len("player,pts\nJames,25\n")
+
+        os.remove(folder / "202510210LAL_box-GSW-game-basic_2025-11-28.csv")
+        assert catalog.refresh() == (0, 0, 1)
+        assert catalog.away_teams() == {}
+        assert catalog.summary() == {"box": 1, "pbp": 1}
+    finally:
+        catalog.close()
+
+
+def test_find_filters(folder):
+    for filename in ("202510210LAL_box-GSW-q4-basic_2025-11-28.csv", "202511020BOS_box-GSW-q4-basic_2025-11-28.csv",
+                     "202511020BOS_box-GSW-q4-basic_2025-12-01.csv", "202511020BOS_box-GSW-game-basic_2025-11-28.csv"):
+        write(folder, filename)
+    catalog = FileCatalog(str(folder))
+    try:
+        catalog.refresh()
+        assert [row["filename"] for row in catalog.find(team="GSW", period="q4", month="2025-11")] == [
+            "202511020BOS_box-GSW-q4-basic_2025-11-28.csv", "202511020BOS_box-GSW-q4-basic_2025-12-01.csv"]
+        assert [row["filename"] for row in catalog.find(period="q4", start="2025-11-01", latest=True)] == [
+            "202511020BOS_box-GSW-q4-basic_2025-12-01.csv"]
+        assert len(catalog.find(end=date(2025, 10, 31))) == 1
+        with pytest.raises(ValueError):
+            catalog.find(season=2026)
+    finally:
+        catalog.close()
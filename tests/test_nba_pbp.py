@@ -0,0 +1,73 @@
+# test_nba_pbp.py
+from datetime import date
+import pandas as pd
+from nba_pbp import clock_tenths, events_frame, parse_pbp
+
+# A first quarter and an overtime of a play-by-play file, banners and headers included
+PBP = """1st Q,1st Q.1,1st Q.2,1st Q.3,1st Q.4,1st Q.5
+Time,Golden State,,Score,,LA Lakers
+12:00.0,Jump ball: D. Green vs. D. Ayton (G. Vincent gains possession),Jump ball: D. Green vs. D. Ayton (G. Vincent gains possession),Jump ball: D. Green vs. D. Ayton (G. Vincent gains possession),Jump ball: D. Green vs. D. Ayton (G. Vincent gains possession),Jump ball: D. Green vs. D. Ayton (G. Vincent gains possession)
+11:39.0,,,0-2,+2,L. Dončić makes 2-pt jump shot from 14 ft
+11:27.0,D. Green misses 3-pt jump shot from 27 ft,,0-2,,
+11:24.0,,,0-2,,Defensive rebound by A. Reaves
+11:08.0,,,0-2,,Turnover by L. Dončić (lost ball; steal by D. Green)
+11:00.0,B. Podziemski makes 2-pt jump shot from 3 ft (assist by J. Kuminga),+2,2-2,,
+9:24.0,Shooting foul by A. Reaves (drawn by J. Butler),,2-2,,
+9:24.0,J. Butler makes free throw 1 of 2,+1,3-2,,
+9:24.0,J. Butler misses free throw 2 of 2,,3-2,,
+9:22.0,,,3-2,,Defensive rebound by Team
+6:42.0,,,3-2,,LA Lakers full timeout
+6:42.0,S. Curry enters the game for J. Kuminga,,3-2,,
+0:00.0,End of 1st quarter,End of 1st quarter,End of 1st quarter,End of 1st quarter,End of 1st quarter
+1st OT,1st OT,1st OT,1st OT,1st OT,1st OT
+Time,Golden State,,Score,,LA Lakers
+5:00.0,Start of 1st overtime,Start of 1st overtime,Start of 1st overtime,Start of 1st overtime,Start of 1st overtime
+4:31.5,,,3-5,+3,A. Reaves makes 3-pt jump shot from 25 ft (assist by L. Dončić)
+0:01.2,S. Curry makes 2-pt layup at rim,+2,5-5,,
+"""
+
+
+def parse(tmp_path):
+    path = tmp_path / "202510210LAL_pbp_2025-11-28.csv"
+    path.write_text(PBP, encoding='utf-8')
+    return events_frame(parse_pbp(str(path), "202510210LAL", date(2025, 10, 21), "LAL", "GSW"))
+
+
+def test_events_are_typed(tmp_path):
+    events = parse(tmp_path)
+    assert events['event_type'].tolist() == [
+        'jump_ball', 'shot', 'shot', 'rebound', 'turnover', 'shot', 'foul', 'free_throw', 'free_throw', 'rebound',
+        'timeout', 'substitution', 'period_end', 'period_start', 'shot', 'shot']
+    assert events['event_no'].tolist() == list(range(1, 17))
+    assert events['period'].tolist() == ['q1'] * 13 + ['ot1'] * 3
+    # Plays copied into every cell belong to neither side
+    assert events['side'].isna().tolist() == [True] + [False] * 11 + [True, True, False, False]
+    assert events['side'].tolist()[1:3] == ['HOME', 'AWAY'] and events['team'].tolist()[1:3] == ['LAL', 'GSW']
+
+    made = events.iloc[5]
+    assert (made['player'], made['other_player'], made['made'], made['shot_value'], made['shot_distance']) == \
+        ('B. Podziemski', 'J. Kuminga', True, 2, 3)
+    assert events.iloc[4][['player', 'other_player', 'detail']].tolist() == ['L. Dončić', 'D. Green', 'lost ball']
+    assert events.iloc[8][['made', 'shot_value']].tolist() == [False, 1]
+    # "Team" rebounds have no player
+    assert pd.isna(events.iloc[9]['player'])
+    assert events.iloc[15]['shot_distance'] == 0
+    assert str(events['shot_value'].dtype) == 'Int64' and str(events['made'].dtype) == 'boolean'
+
+
+def test_running_score(tmp_path):
+    events = parse(tmp_path)
+    assert list(zip(events['away_score'], events['home_score'])) == \
+        [(0, 0)] + [(0, 2)] * 4 + [(2, 2)] * 2 + [(3, 2)] * 7 + [(3, 5), (5, 5)]
+    assert events['clock_tenths'].tolist()[-2:] == [2715, 12]
+
+    # The points of each side add up to the final score
+    final = events.iloc[-1]
+    points = events.groupby('side')['points'].sum()
+    assert (points['AWAY'], points['HOME']) == (final['away_score'], final['home_score']) == (5, 5)
+
+
+def test_clock_tenths():
+    assert clock_tenths("11:39.0") == 6990
+    assert clock_tenths("0:01") == 10
+    assert clock_tenths("Time") is None
@@ -0,0 +1,96 @@
+# test_nba_predictions.py
+# RollingForm brought up to date a game day at a time matches a full load and the games themselves
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from nba_predictions import STATS, RollingForm
+
+WINDOW = 4
+DAYS = 12
+
+
+def box_scores():
+    """Box score rows of BOS hosting NYK every day"""
+    rng = np.random.default_rng(7)
+    rows = []
+    for day in range(DAYS):
+        for player, team, opponent in (('Ann', 'BOS', 'NYK'), ('Bea', 'BOS', 'NYK'), ('Cal', 'NYK', 'BOS'),
+                                       ('Dee', 'NYK', 'BOS')):
+            if player == 'Dee' and day < 5:
+                continue  # joins late
+            # Bea sits out every third game
+            played = not (player == 'Bea' and day % 3 == 2)
+            rows.append({'player': player, 'period': 'game', 'game_date': datetime.date(2025, 11, 1 + day),
+                         'team': team, 'opponent': opponent, 'mp_seconds': 1800 if played else None,
+                         **{stat: int(rng.integers(0, 30)) if played else 0 for stat in STATS}})
+            # Quarters are left out of the form
+            rows.append({**rows[-1], 'period': 'q1', **{stat: 99 for stat in STATS}})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def games():
+    return box_scores()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'games.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE TABLE nba_game_basic (player VARCHAR(100), period VARCHAR(10), "
+                                f"game_date DATE, team VARCHAR(10), opponent VARCHAR(10), mp_seconds INTEGER, "
+                                f"{', '.join(f'{stat} INTEGER' for stat in STATS)})"))
+    yield engine
+    engine.dispose()
+
+
+def insert(engine, rows):
+    rows.to_sql('nba_game_basic', engine, if_exists='append', index=False)
+
+
+def held(form):
+    """Players, teams, windows and dates of a form in player order"""
+    order = np.argsort(form.players.to_numpy(dtype=object))
+    return form.players[order].tolist(), form.teams[order].tolist(), form.values[order], form.dates[order]
+
+
+def assert_same_form(form, expected):
+    players, teams, values, dates = held(form)
+    expected_players, expected_teams, expected_values, expected_dates = held(expected)
+    assert players == expected_players
+    assert teams == expected_teams
+    np.testing.assert_array_equal(values, expected_values)
+    np.testing.assert_array_equal(dates, expected_dates)
+
+
+def test_update_matches_load(engine, games):
+    form = RollingForm(str(engine.url), window=WINDOW)
+    assert form.latest() is None
+    for day, day_games in games.groupby('game_date'):
+        # Half of the day's games are loaded, then the rest after an update
+        first = day_games['player'] < 'C'
+        insert(engine, day_games[first])
+        form.update()
+        insert(engine, day_games[~first])
+        form.update()
+        assert form.latest() == day
+        assert_same_form(form, RollingForm(str(engine.url), window=WINDOW))
+
+
+def test_windows_hold_the_latest_games(engine, games):
+    insert(engine, games)
+    form = RollingForm(str(engine.url), window=WINDOW)
+    played = games[(games['period'] == 'game') & games['mp_seconds'].notna()]
+    for player, player_games in played.groupby('player'):
+        last = player_games.sort_values('game_date').tail(WINDOW)
+        row = form.players.get_loc(player)
+        np.testing.assert_array_equal(form.values[row, -len(last):], last[list(STATS)].to_numpy(dtype='float64'))
+        assert np.isnan(form.values[row, :WINDOW - len(last)]).all()
+        assert form.teams[row] == last['team'].iloc[-1]
+
+    # Adding the same games again changes nothing
+    again = RollingForm(str(engine.url), window=WINDOW)
+    again.add_games(played)
+    assert_same_form(again, form)
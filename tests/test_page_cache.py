@@ -0,0 +1,102 @@
+# test_page_cache.py
+# HttpFetcher / CachingFetcher against a local http.server that answers conditional GETs
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from table_scrapper.fetcher import HttpFetcher
+from table_scrapper.page_cache import CachingFetcher, PageCache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves server.pages {path: (body, etag)} and logs (path, If-None-Match) per request"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path not in self.server.pages:
+            self.send_error(404)
+            return
+        body, etag = self.server.pages[self.path]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.pages = {"/page.html": ("<table id='stats'></table>", '"v1"')}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def caching_fetcher(tmp_path, ttl):
+    return CachingFetcher(HttpFetcher(pool_size=1, timeout=5), PageCache(str(tmp_path), ttl_rules=[(r".*", ttl)]))
+
+
+def test_http_fetcher(server):
+    fetcher = HttpFetcher(pool_size=1, timeout=5)
+    try:
+        assert fetcher.fetch(server.url + "/page.html") == "<table id='stats'></table>"
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch(server.url + "/missing.html")
+    finally:
+        fetcher.close()
+
+
+def test_fresh_pages_are_served_without_a_request(server, tmp_path):
+    fetcher = caching_fetcher(tmp_path, ttl=None)
+    url = server.url + "/page.html"
+    assert fetcher.fetch(url) == "<table id='stats'></table>"
+    assert fetcher.is_fresh(url)
+    assert fetcher.fetch(url) == "<table id='stats'></table>"
+    assert server.requests == [("/page.html", None)]
+    fetcher.close()
+
+
+def test_stale_pages_are_revalidated(server, tmp_path):
+    fetcher = caching_fetcher(tmp_path, ttl=0)
+    url = server.url + "/page.html"
+    assert fetcher.fetch(url) == "<table id='stats'></table>"
+    checked_at = fetcher.cache.get_entry(url)["checked_at"]
+
+    # Unchanged: a 304, served from disk and marked as checked
+    assert fetcher.fetch(url) == "<table id='stats'></table>"
+    assert server.requests[-1] == ("/page.html", '"v1"')
+    assert fetcher.cache.get_entry(url)["checked_at"] >= checked_at
+
+    # Changed: the new body and ETag replace the cached ones
+    server.pages["/page.html"] = ("<table id='stats'><tr></tr></table>", '"v2"')
+    assert fetcher.fetch(url) == "<table id='stats'><tr></tr></table>"
+    assert server.requests[-1] == ("/page.html", '"v1"')
+    assert fetcher.cache.get_entry(url)["etag"] == '"v2"'
+    assert fetcher.fetch(url) == "<table id='stats'><tr></tr></table>"
+    assert server.requests[-1] == ("/page.html", '"v2"')
+    assert len(server.requests) == 4
+    fetcher.close()
+
+
+def test_errors_are_not_cached(server, tmp_path):
+    fetcher = caching_fetcher(tmp_path, ttl=None)
+    url = server.url + "/missing.html"
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch(url)
+    assert fetcher.cache.get_entry(url) is None
+    fetcher.close()
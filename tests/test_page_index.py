@@ -0,0 +1,36 @@
+# test_page_index.py
+from table_scrapper.page_index import PageIndex, index_tables
+
+PAGE = """
+<html><body>
+<table id="visible"><tr><td>1</td></tr></table>
+<div class="placeholder"></div>
+<!--
+   <div class="table_container">
+   <TABLE class="stats_table" id='hidden'>
+     <tr><td><table id="nested"><tr><td>x</td></tr></table></td></tr>
+   </table>
+   </div>
+-->
+<table><tr><td>no id</td></tr></table>
+<!-- <table id="visible"><tr><td>2</td></tr></table> -->
+</body></html>
+"""
+
+
+def test_tables_inside_comments_are_indexed():
+    index = PageIndex(PAGE)
+    assert index.ids() == ["visible", "hidden"]
+    assert "hidden" in index and len(index) == 2
+    assert index.get("visible") == '<table id="visible"><tr><td>1</td></tr></table>'
+
+    # The whole outer table, nested tables included, up to its own closing tag
+    hidden = index.get("hidden")
+    assert hidden.startswith("<TABLE class=\"stats_table\" id='hidden'>")
+    assert hidden.endswith("</table>") and '<table id="nested">' in hidden
+    assert "-->" not in hidden and index.get("nested") is None
+
+
+def test_unclosed_and_stray_tags():
+    assert index_tables("</table><table id='a'></table>") == {"a": "<table id='a'></table>"}
+    assert index_tables("<table id='open'><tr><td>cut off") == {}
@@ -0,0 +1,34 @@
+# test_response_cache.py
+import response_cache
+from response_cache import ResponseCache
+
+
+def test_least_recently_used_entries_go_first():
+    cache = ResponseCache(size=2, ttl=60)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    assert cache.get('a') is not None  # now the most recently used
+    cache.put('c', b'3')
+    assert cache.get('b') is None
+    assert cache.get('a')[0] == b'1'
+    assert cache.get('c')[0] == b'3'
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, 'monotonic', lambda: now[0])
+    cache = ResponseCache(size=4, ttl=60)
+    cache.put('a', b'1')
+    now[0] += 59
+    assert cache.get('a') is not None
+    now[0] += 2
+    assert cache.get('a') is None
+    assert 'a' not in cache.entries
+
+
+def test_etag_follows_the_body():
+    cache = ResponseCache(size=0, ttl=60)  # size=0 stores nothing
+    body, etag = cache.put('a', b'[1]')
+    assert cache.put('b', b'[1]')[1] == etag
+    assert cache.put('a', b'[2]')[1] != etag
+    assert cache.get('a') is None
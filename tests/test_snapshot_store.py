@@ -0,0 +1,55 @@
+# test_snapshot_store.py
+import pandas as pd
+from table_scrapper.snapshot_store import SnapshotStore
+
+
+def frame(rows, columns=("player", "pts", "fg_pct")):
+    return pd.DataFrame(rows, columns=list(columns))
+
+
+DAYS = [
+    ("2025-11-01", frame([["Tatum", 30, 0.5], ["Brown", 22, 0.45]])),
+    # The same content with other dtypes is no new version
+    ("2025-11-02", frame([["Tatum", 30.0, 0.5], ["Brown", 22.0, 0.45]])),
+    # A changed row, a new one and a new order: deltas
+    ("2025-11-03", frame([["Brown", 22, 0.45], ["Tatum", 41, 0.55], ["White", 9, None]])),
+    ("2025-11-04", frame([["White", 9, None], ["Brown", 22, 0.45], ["Brown", 22, 0.45]])),
+    # The next version is a base again (base_every=3)
+    ("2025-11-05", frame([["Tatum", 12, 0.3]])),
+    # New columns can't be a delta
+    ("2025-11-06", frame([["Tatum", 12, 0.3, 5]], columns=("player", "pts", "fg_pct", "ast"))),
+]
+
+
+def test_versions_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path), base_every=3)
+    statuses = [store.save("box", df, date) for date, df in DAYS]
+    assert statuses == ["new", "unchanged", "new", "new", "new", "new"]
+
+    manifest = store.load_manifest("box")
+    assert [v["kind"] for v in manifest["versions"]] == ["base", "delta", "delta", "base", "base"]
+    assert [s["version"] for s in manifest["snapshots"]] == [1, 1, 2, 3, 4, 5]
+
+    assert store.read_as_of("box", "2025-10-31") is None
+    for date, df in DAYS:
+        pd.testing.assert_frame_equal(store.read_as_of("box", date), df, check_dtype=False)
+    # Between scrapes the last version before the date is read
+    pd.testing.assert_frame_equal(store.read_as_of("box", "2025-12-01"), DAYS[-1][1], check_dtype=False)
+
+
+def test_resaving_a_day_replaces_its_snapshot(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("box", DAYS[0][1], "2025-11-01")
+    store.save("box", DAYS[2][1], "2025-11-01")
+    assert store.load_manifest("box")["snapshots"] == [{"date": "2025-11-01", "version": 2}]
+    pd.testing.assert_frame_equal(store.read_as_of("box", "2025-11-01"), DAYS[2][1], check_dtype=False)
+
+
+def test_changed_tables(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    assert store.changed_tables("2025-11-01") == []
+    store.save("box", DAYS[0][1], "2025-11-01")
+    store.save("pbp", DAYS[0][1], "2025-11-01")
+    store.save("pbp", DAYS[2][1], "2025-11-03")
+    store.save("box", DAYS[1][1], "2025-11-03")
+    assert store.changed_tables("2025-11-02") == ["pbp"]
@@ -0,0 +1,49 @@
+# test_table_parser.py
+import numpy as np
+import pandas as pd
+from table_scrapper.table_parser import parse_table, read_table_columns
+
+BOX = """
+<table id="box-BOS-game-basic">
+<thead><tr><th data-stat="player">Starters</th><th data-stat="mp">MP</th><th data-stat="pts">PTS</th></tr></thead>
+<tbody>
+<tr><th data-stat="player" data-append-csv="tatumja01"><a href="/players/t/tatumja01.html">Jayson Tatum</a></th>
+    <td data-stat="mp">34:44</td><td data-stat="fg_pct">.500</td><td data-stat="pts">1,021</td></tr>
+<tr class="thead"><th data-stat="player">Reserves</th><td data-stat="mp">MP</td></tr>
+<tr><th data-stat="player" data-append-csv="brownja02">Jaylen Brown</th>
+    <td data-stat="mp">5:07</td><td data-stat="fg_pct"></td><td data-stat="pts">7</td></tr>
+<tr><th data-stat="player" data-append-csv="holidjr01">Jrue Holiday</th>
+    <td data-stat="reason" colspan="2">Did Not Play</td></tr>
+<tr class="spacer"><td colspan="3"></td></tr>
+</tbody>
+<tfoot><tr><th data-stat="player">Team Totals</th><td data-stat="mp">240:00</td><td data-stat="pts">1,028</td></tr></tfoot>
+</table>
+"""
+
+
+def test_cells_are_keyed_by_data_stat():
+    columns = read_table_columns(BOX)
+    assert columns == {
+        "player": ["Jayson Tatum", "Jaylen Brown", "Jrue Holiday"],
+        "player_id": ["tatumja01", "brownja02", "holidjr01"],
+        "mp": ["34:44", "5:07", None],
+        "fg_pct": [".500", None, None],
+        "pts": ["1,021", "7", None],
+        "reason": [None, None, "Did Not Play"],
+    }
+    assert read_table_columns(BOX, include_footer=True)["player"][-1] == "Team Totals"
+
+
+def test_columns_are_typed():
+    df = parse_table(BOX)
+    assert list(df.columns) == ["player", "player_id", "mp", "fg_pct", "pts", "reason"]
+    # Clocks become seconds and integers stay integers, with missing cells as NA
+    assert df["mp"].dtype == "Int64" and df["mp"].tolist()[:2] == [2084, 307] and df["mp"].isna()[2]
+    assert df["pts"].dtype == "Int64" and df["pts"].tolist()[:2] == [1021, 7]
+    assert df["fg_pct"].dtype == "float64" and df["fg_pct"][0] == 0.5 and np.isnan(df["fg_pct"][1])
+    assert df["reason"].isna().tolist() == [True, True, False] and df["reason"][2] == "Did Not Play"
+
+
+def test_tables_without_data_stat_use_read_html():
+    df = parse_table("<table><tr><th>Time</th><th>Event</th></tr><tr><td>12:00.0</td><td>Jump ball</td></tr></table>")
+    pd.testing.assert_frame_equal(df, pd.DataFrame({"Time": ["12:00.0"], "Event": ["Jump ball"]}))